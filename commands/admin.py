@@ -8,6 +8,7 @@ from discord import app_commands
 import state
 from config import Config
 from database import delete_request
+from services.audit_outbox import init_audit_outbox
 from services.diag_report import build_diag_embed
 from services.health_report import cleanup_orphan_records
 from utils.slash_helpers import NO_ROLE_ABOVE_BOT, slash_require_role_above_bot
@@ -59,20 +60,8 @@ def register_admin_commands(bot: discord.ext.commands.Bot) -> None:
         try:
             await interaction.response.defer(ephemeral=True)
             cutoff_date = datetime.now() - timedelta(days=days)
-            to_delete = []
-            for msg_id, request in (getattr(state, "active_firing_requests", {}) or {}).items():
-                created_at = request.get("created_at")
-                if not created_at:
-                    to_delete.append(msg_id)
-                    continue
-                try:
-                    if datetime.fromisoformat(created_at) < cutoff_date:
-                        to_delete.append(msg_id)
-                except Exception:
-                    to_delete.append(msg_id)
             deleted_count = 0
-            for msg_id in to_delete:
-                state.active_firing_requests.pop(msg_id, None)
+            for msg_id in state.active_firing_requests.pop_expired(cutoff_date):
                 await delete_request("firing_requests", int(msg_id))
                 deleted_count += 1
             await interaction.followup.send(
@@ -83,3 +72,22 @@ def register_admin_commands(bot: discord.ext.commands.Bot) -> None:
         except Exception as e:
             logger.error("Ошибка /clear_firing: %s", e, exc_info=True)
             await interaction.followup.send("❌ Ошибка при очистке.", ephemeral=True)
+
+    @bot.tree.command(name="audit_replay", description="-")
+    async def audit_replay_slash(interaction: discord.Interaction):
+        if not slash_require_role_above_bot(interaction):
+            await interaction.response.send_message(NO_ROLE_ABOVE_BOT, ephemeral=True)
+            return
+        try:
+            await interaction.response.defer(ephemeral=True)
+            outbox = init_audit_outbox()
+            replayed = await outbox.replay_failed()
+            counts = outbox.counts
+            await interaction.followup.send(
+                f"✅ Возвращено в очередь аудита: {replayed}. Ждут отправки: {counts['pending']}, не доставлено: {counts['failed']}",
+                ephemeral=True,
+            )
+            logger.info("Повтор отправки аудита /audit_replay: %s", replayed)
+        except Exception as e:
+            logger.error("Ошибка /audit_replay: %s", e, exc_info=True)
+            await interaction.followup.send("❌ Ошибка при повторе отправки аудита.", ephemeral=True)
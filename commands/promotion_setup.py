@@ -1,13 +1,13 @@
 # -*- coding: utf-8 -*-
-import asyncio
 import logging
-import time
 
 import discord
 from discord import app_commands
 
 import state
 from config import Config
+from services.channel_tail import get_tail_tracker
+from utils.rest_scheduler import Lane, in_lane
 from utils.slash_helpers import NO_ROLE_ABOVE_BOT, slash_require_role_above_bot
 from views.grom_promotion_apply_view import GromPromotionApplyView
 from views.orls_promotion_apply_view import OrlsPromotionApplyView
@@ -29,23 +29,15 @@ def get_promotion_view(dept: str) -> discord.ui.View:
     return OrlsPromotionApplyView()
 
 
-async def move_promotion_setup_to_bottom(bot: discord.Client, channel: discord.TextChannel) -> None:
+async def move_promotion_setup_to_bottom(bot: discord.Client, channel: discord.TextChannel) -> bool:
     if not isinstance(channel, discord.TextChannel):
-        return
+        return False
     if not isinstance(getattr(state, "promotion_setup_messages", None), dict):
         state.promotion_setup_messages = {}
-    if not isinstance(getattr(state, "promotion_setup_move_cooldown", None), dict):
-        state.promotion_setup_move_cooldown = {}
-    now = time.time()
-    cooldown_sec = 15
-    if channel.id in state.promotion_setup_move_cooldown:
-        if now - state.promotion_setup_move_cooldown[channel.id] < cooldown_sec:
-            return
-    state.promotion_setup_move_cooldown[channel.id] = now
 
     entries = state.promotion_setup_messages.get(channel.id, [])
     if not entries:
-        return
+        return False
     new_entries = []
     for item in entries:
         try:
@@ -58,44 +50,48 @@ async def move_promotion_setup_to_bottom(bot: discord.Client, channel: discord.T
         try:
             view = get_promotion_view(item["dept"])
             new_msg = await channel.send(content=item["content"], view=view)
+            get_tail_tracker().observe(channel.id, new_msg.id)
             new_entries.append({"message_id": new_msg.id, "dept": item["dept"], "content": item["content"]})
         except Exception as e:
             logger.debug("Перенос сообщения рапорта %s: %s", item.get("dept"), e)
     if new_entries:
         state.promotion_setup_messages[channel.id] = new_entries
+    return bool(new_entries)
 
 
-async def promotion_setup_position_check_loop(bot: discord.Client) -> None:
-    interval = getattr(Config, "PROMOTION_SETUP_CHECK_INTERVAL", 90) or 90
-    if interval <= 0:
-        return
-    await asyncio.sleep(interval)
-    while True:
-        try:
-            guild = bot.get_guild(Config.GUILD_ID) if Config.GUILD_ID else None
-            if not guild:
-                await asyncio.sleep(interval)
-                continue
-            for channel_id in list((getattr(state, "promotion_setup_messages", {}) or {}).keys()):
-                try:
-                    ch = guild.get_channel(channel_id)
-                    if not ch or not isinstance(ch, discord.TextChannel):
-                        continue
-                    last_msg = None
-                    async for m in ch.history(limit=1):
-                        last_msg = m
-                        break
-                    if not last_msg:
-                        continue
-                    setup_ids = {item["message_id"] for item in ((getattr(state, "promotion_setup_messages", None) or {}).get(channel_id) or [])}
-                    if last_msg.id in setup_ids:
-                        continue
-                    await move_promotion_setup_to_bottom(bot, ch)
-                except Exception as e:
-                    logger.debug("Проверка канала рапортов %s: %s", channel_id, e)
-        except Exception as e:
-            logger.warning("promotion_setup_position_check: %s", e, exc_info=True)
-        await asyncio.sleep(interval)
+def _setup_message_ids(channel_id: int) -> set:
+    return {item["message_id"] for item in ((getattr(state, "promotion_setup_messages", None) or {}).get(channel_id) or [])}
+
+
+def promotion_setup_in_place(channel_id: int) -> bool:
+    setup_ids = _setup_message_ids(channel_id)
+    if not setup_ids:
+        return True
+    return get_tail_tracker().last_id(channel_id) in setup_ids
+
+
+# Проверка одного канала для PositionSupervisor: (перенесено ли, примерное число запросов к API).
+@in_lane(Lane.BACKGROUND)
+async def check_promotion_setup_channel(bot: discord.Client, channel_id: int) -> tuple[bool, int]:
+    guild = bot.get_guild(Config.GUILD_ID) if Config.GUILD_ID else None
+    ch = guild.get_channel(channel_id) if guild else None
+    if not ch or not isinstance(ch, discord.TextChannel):
+        return False, 0
+    setup_ids = _setup_message_ids(channel_id)
+    if not setup_ids:
+        return False, 0
+    tracker = get_tail_tracker()
+    calls = 1 if tracker.last_id(channel_id) is None else 0
+    try:
+        last_id = await tracker.fetch_last_id(ch)
+    except (discord.Forbidden, discord.HTTPException) as e:
+        logger.debug("Проверка канала рапортов %s: %s", channel_id, e)
+        return False, calls
+    if not last_id or last_id in setup_ids:
+        return False, calls
+    moved = await move_promotion_setup_to_bottom(bot, ch)
+    # на каждое сообщение: fetch + delete + send
+    return moved, calls + (3 * len(setup_ids) if moved else 0)
 
 
 async def send_promotion_message_at_bottom(
@@ -105,15 +101,16 @@ async def send_promotion_message_at_bottom(
     view: discord.ui.View,
     dept: str | None = None,
 ) -> discord.Message | None:
+    tracker = get_tail_tracker()
+    tracker.watch(channel.id)
     msg = await channel.send(content=content, view=view)
+    tracker.observe(channel.id, msg.id)
     try:
-        last_in_channel = None
-        async for m in channel.history(limit=1):
-            last_in_channel = m
-            break
-        if last_in_channel and last_in_channel.id != msg.id:
+        last_id = await tracker.fetch_last_id(channel)
+        if last_id and last_id != msg.id:
             await msg.delete()
             msg = await channel.send(content=content, view=view)
+            tracker.observe(channel.id, msg.id)
     except Exception:
         pass
     if dept:
@@ -162,6 +159,7 @@ def promotion_setup_configs():
     ]
 
 
+@in_lane(Lane.BACKGROUND)
 async def ensure_promotion_messages_on_startup(bot: discord.Client, guild: discord.Guild) -> None:
     if not bot.user:
         return
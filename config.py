@@ -261,6 +261,9 @@ class Config:
 
     DB_PATH = os.getenv("DB_PATH", "").strip()
     DATABASE_URL = os.getenv("DATABASE_URL", "").strip()
+    DB_READ_POOL_SIZE = _env_int("DB_READ_POOL_SIZE", 2)
+    DB_FLUSH_INTERVAL_MS = _env_int("DB_FLUSH_INTERVAL_MS", 50)
+    DB_FLUSH_MAX_OPS = _env_int("DB_FLUSH_MAX_OPS", 100)
 
     STAFF_ROLE_ID = _env_int("STAFF_ROLE_ID", 0)
     TRANSFER_STAFF_ROLE_ID = _env_int("TRANSFER_STAFF_ROLE_ID", 0)
@@ -347,8 +350,21 @@ class Config:
     OSB_DRAFT_EXPIRY_DAYS = _env_int("OSB_DRAFT_EXPIRY_DAYS", 14)
     GROM_DRAFT_EXPIRY_DAYS = _env_int("GROM_DRAFT_EXPIRY_DAYS", 14)
     PPS_DRAFT_EXPIRY_DAYS = _env_int("PPS_DRAFT_EXPIRY_DAYS", 14)
+    PROMOTION_DRAFT_CACHE_MAX = _env_int("PROMOTION_DRAFT_CACHE_MAX", 200)
+    PROMOTION_DRAFT_CACHE_IDLE_MIN = _env_int("PROMOTION_DRAFT_CACHE_IDLE_MIN", 60)
     START_MESSAGE_CHECK_INTERVAL = _env_int("START_MESSAGE_CHECK_INTERVAL", 60)
     PROMOTION_SETUP_CHECK_INTERVAL = _env_int("PROMOTION_SETUP_CHECK_INTERVAL", 90)
+    POSITION_REST_BUDGET_PER_MINUTE = _env_int("POSITION_REST_BUDGET_PER_MINUTE", 30)
+    POSITION_CHECK_JITTER_PERCENT = _env_int("POSITION_CHECK_JITTER_PERCENT", 10)
+    POSITION_QUIET_PERIOD_SEC = _env_int("POSITION_QUIET_PERIOD_SEC", 10)
+    REST_MAX_CONCURRENCY = _env_int("REST_MAX_CONCURRENCY", 8)
+    REST_BACKGROUND_CONCURRENCY = _env_int("REST_BACKGROUND_CONCURRENCY", 2)
+    REST_BUCKET_CONCURRENCY = _env_int("REST_BUCKET_CONCURRENCY", 2)
+    MEMBER_CACHE_TTL_SEC = _env_int("MEMBER_CACHE_TTL_SEC", 5)
+    MEMBER_VERIFY_TIMEOUT_SEC = _env_int("MEMBER_VERIFY_TIMEOUT_SEC", 3)
+    MESSAGE_SCAN_MAX_PAGES = _env_int("MESSAGE_SCAN_MAX_PAGES", 20)
+    LAZY_REQUEST_HYDRATION = _env_bool("LAZY_REQUEST_HYDRATION", False)
+    REQUEST_HOT_CACHE_MAX = _env_int("REQUEST_HOT_CACHE_MAX", 500)
     WAREHOUSE_COOLDOWN_HOURS = _env_int("WAREHOUSE_COOLDOWN_HOURS", 6)
     EXAM_BUTTON_TIMEOUT = _env_int("EXAM_BUTTON_TIMEOUT", 120)
     WAREHOUSE_CART_TIMEOUT = _env_int("WAREHOUSE_CART_TIMEOUT", 300)
@@ -408,6 +424,12 @@ class Config:
     AUDIT_FIELD_RANK = os.getenv("AUDIT_FIELD_RANK", "").strip()
     AUDIT_FIELD_REASON_LINK = os.getenv("AUDIT_FIELD_REASON_LINK", "").strip()
 
+    AUDIT_TIMEOUT_SEC = _env_int("AUDIT_TIMEOUT_SEC", 20)
+    AUDIT_MAX_ATTEMPTS = _env_int("AUDIT_MAX_ATTEMPTS", 8)
+    AUDIT_RETRY_BASE_SEC = _env_int("AUDIT_RETRY_BASE_SEC", 30)
+    AUDIT_RETRY_MAX_SEC = _env_int("AUDIT_RETRY_MAX_SEC", 3600)
+    AUDIT_OUTBOX_KEEP_DAYS = _env_int("AUDIT_OUTBOX_KEEP_DAYS", 7)
+
     ACTION_ACCEPTED = _env_str("AUDIT_ACTION_ACCEPTED", "Принят")
     ACTION_FIRED = _env_str("AUDIT_ACTION_FIRED", "Уволен")
     ACTION_PROMOTED = _env_str("AUDIT_ACTION_PROMOTED", "Повышен")
@@ -427,6 +449,16 @@ class Config:
     WEBHOOK_ALLOWED_IDS = _parse_int_list(os.getenv("WEBHOOK_ALLOWED_IDS", ""))
     WEBHOOK_ALLOWED_CHANNEL_IDS = _parse_int_list(os.getenv("WEBHOOK_ALLOWED_CHANNEL_IDS", ""))
 
+    WEBHOOK_QUEUE_SIZE = _env_int("WEBHOOK_QUEUE_SIZE", 100)
+    WEBHOOK_CONSUMERS = _env_int("WEBHOOK_CONSUMERS", 2)
+    WEBHOOK_DEDUPE_KEEP = _env_int("WEBHOOK_DEDUPE_KEEP", 1000)
+
+    INGEST_ENABLED = _env_bool("INGEST_ENABLED", False)
+    INGEST_HOST = _env_str("INGEST_HOST", "127.0.0.1")
+    INGEST_PORT = _env_int("INGEST_PORT", 8080)
+    INGEST_SECRET = _env_str("INGEST_SECRET", "")
+    INGEST_MAX_SKEW_SEC = _env_int("INGEST_MAX_SKEW_SEC", 300)
+
     EXAM_HERB_URL = os.getenv("EXAM_HERB_URL", "").strip()
     EXAM_SEAL_URL = os.getenv("EXAM_SEAL_URL", "").strip()
 
@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import json
 import logging
 import os
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Tuple
 
 import aiosqlite
 
@@ -39,18 +40,159 @@ def _resolve_db_path() -> str:
 DB_PATH = _resolve_db_path()
 
 
-@asynccontextmanager
-async def _get_conn():
-    conn = await aiosqlite.connect(DB_PATH)
-    try:
-        await conn.execute("PRAGMA journal_mode=WAL;")
+# Один писатель под локом + несколько читателей; соединения живут всё время работы бота.
+class _ConnectionPool:
+    def __init__(self, path: str, read_size: int):
+        self.path = path
+        self.read_size = max(1, int(read_size))
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._writer: aiosqlite.Connection | None = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue | None = None
+        self._write_lock: asyncio.Lock | None = None
+        self._open_lock: asyncio.Lock | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    async def _connect(self, *, read_only: bool) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.path)
+        if not read_only:
+            await conn.execute("PRAGMA journal_mode=WAL;")
         await conn.execute("PRAGMA foreign_keys=ON;")
+        await conn.execute("PRAGMA synchronous=NORMAL;")
+        await conn.execute("PRAGMA busy_timeout=5000;")
+        if read_only:
+            await conn.execute("PRAGMA query_only=ON;")
+        return conn
+
+    async def open(self) -> None:
+        if self._open_lock is None:
+            self.loop = asyncio.get_running_loop()
+            self._open_lock = asyncio.Lock()
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+            writer = await self._connect(read_only=False)
+            readers = []
+            try:
+                for _ in range(self.read_size):
+                    readers.append(await self._connect(read_only=True))
+            except Exception:
+                for conn in readers:
+                    await conn.close()
+                await writer.close()
+                raise
+            self._write_lock = asyncio.Lock()
+            self._idle_readers = asyncio.Queue()
+            for conn in readers:
+                self._idle_readers.put_nowait(conn)
+            self._readers = readers
+            self._writer = writer
+            logger.info("SQLite: открыт пул соединений (%s, читателей: %s)", self.path, self.read_size)
+
+    async def close(self) -> None:
+        writer, readers = self._writer, self._readers
+        self._writer = None
+        self._readers = []
+        self._idle_readers = None
+        for conn in readers:
+            try:
+                await conn.close()
+            except Exception as e:
+                logger.warning("SQLite: ошибка закрытия читателя: %s", e)
+        if writer is not None:
+            try:
+                await writer.close()
+            except Exception as e:
+                logger.warning("SQLite: ошибка закрытия писателя: %s", e)
+            logger.info("SQLite: пул соединений закрыт (%s)", self.path)
+
+    @asynccontextmanager
+    async def writer(self):
+        if self._writer is None:
+            await self.open()
+        async with self._write_lock:
+            conn = self._writer
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    await conn.rollback()
+
+    @asynccontextmanager
+    async def reader(self):
+        if self._writer is None:
+            await self.open()
+        queue = self._idle_readers
+        conn = await queue.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                await conn.rollback()
+            queue.put_nowait(conn)
+
+
+_pool: _ConnectionPool | None = None
+_write_journal = None
+
+
+def attach_write_journal(journal) -> None:
+    global _write_journal
+    _write_journal = journal
+
+
+async def _flush_write_journal(tables: tuple = ()) -> None:
+    # read-your-writes только для нужных таблиц; без tables — ждём весь журнал
+    journal = _write_journal
+    if journal is not None:
+        await journal.barrier(tables)
+
+
+async def _get_pool() -> _ConnectionPool:
+    global _pool
+    loop = asyncio.get_running_loop()
+    if _pool is not None and (_pool.path != DB_PATH or (_pool.loop is not None and _pool.loop is not loop)):
+        old, _pool = _pool, None
+        await old.close()
+    if _pool is None:
+        _pool = _ConnectionPool(DB_PATH, getattr(Config, "DB_READ_POOL_SIZE", 2))
+    return _pool
+
+
+@asynccontextmanager
+async def _get_conn(*tables: str):
+    await _flush_write_journal(tables)
+    pool = await _get_pool()
+    async with pool.writer() as conn:
+        yield conn
+
+
+@asynccontextmanager
+async def _get_read_conn(*tables: str):
+    await _flush_write_journal(tables)
+    pool = await _get_pool()
+    async with pool.reader() as conn:
         yield conn
-    finally:
-        await conn.close()
+
+
+async def close_db() -> None:
+    global _pool
+    if _pool is None:
+        return
+    try:
+        await _flush_write_journal()
+    except Exception as e:
+        logger.error("SQLite: не удалось сбросить журнал записей перед закрытием: %s", e)
+    pool, _pool = _pool, None
+    await pool.close()
 
 
 async def init_db() -> None:
+    pool = await _get_pool()
+    await pool.open()
     async with _get_conn() as conn:
         await conn.execute("""
             CREATE TABLE IF NOT EXISTS requests (
@@ -99,33 +241,17 @@ async def init_db() -> None:
             )
         """)
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS orls_draft_reports (
-                user_id INTEGER PRIMARY KEY,
-                data TEXT NOT NULL,
-                updated_at TEXT
-            )
-        """)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS osb_draft_reports (
-                user_id INTEGER PRIMARY KEY,
+            CREATE TABLE IF NOT EXISTS promotion_drafts (
+                dept TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
                 data TEXT NOT NULL,
-                updated_at TEXT
-            )
-        """)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS grom_draft_reports (
-                user_id INTEGER PRIMARY KEY,
-                data TEXT NOT NULL,
-                updated_at TEXT
-            )
-        """)
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS pps_draft_reports (
-                user_id INTEGER PRIMARY KEY,
-                data TEXT NOT NULL,
-                updated_at TEXT
+                updated_at TEXT,
+                PRIMARY KEY (dept, user_id)
             )
         """)
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_promotion_drafts_updated_at ON promotion_drafts (updated_at)"
+        )
         await conn.execute("""
             CREATE TABLE IF NOT EXISTS warehouse_sessions (
                 session_key TEXT PRIMARY KEY,
@@ -139,226 +265,369 @@ async def init_db() -> None:
                 last_issue_at TEXT NOT NULL
             )
         """)
+        await _migrate_legacy_draft_tables(conn)
         await conn.commit()
+        await _apply_migrations(conn)
+
+
+async def _migration_1_lookup_indexes(conn: aiosqlite.Connection) -> None:
+    for table in ("requests", "firing_requests", "promotion_requests", "warehouse_requests", "department_transfer_requests"):
+        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_created_at ON {table} (created_at)")
+    for table in ("requests", "warehouse_requests", "department_transfer_requests"):
+        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_user_id ON {table} (user_id)")
+    for table in ("firing_requests", "promotion_requests"):
+        await conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_discord_id ON {table} (discord_id)")
+
+
+async def _migration_2_request_channel_id(conn: aiosqlite.Connection) -> None:
+    for table in sorted(_REQUEST_TABLES):
+        cursor = await conn.execute(f"PRAGMA table_info({table})")
+        columns = {row[1] for row in await cursor.fetchall()}
+        if "channel_id" not in columns:
+            await conn.execute(f"ALTER TABLE {table} ADD COLUMN channel_id INTEGER")
+
+
+async def _migration_3_audit_outbox(conn: aiosqlite.Connection) -> None:
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS audit_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at TEXT NOT NULL,
+            last_error TEXT,
+            created_at TEXT NOT NULL,
+            delivered_at TEXT
+        )
+    """)
+    await conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_audit_outbox_status_next ON audit_outbox (status, next_attempt_at)"
+    )
 
 
-async def save_request(table: str, message_id: int, data: Dict[str, Any]) -> None:
-    data_json = json.dumps(data, ensure_ascii=False, default=str)
-    created_at = data.get("created_at", datetime.now().isoformat())
+async def _migration_4_webhook_seen(conn: aiosqlite.Connection) -> None:
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS webhook_seen (
+            message_id INTEGER PRIMARY KEY,
+            seen_at TEXT NOT NULL
+        )
+    """)
 
-    async with _get_conn() as conn:
-        if table == "requests":
-            await conn.execute(
-                "INSERT OR REPLACE INTO requests VALUES (?,?,?,?,?)",
-                (message_id, data["user_id"], data_json, created_at, data.get("request_type", "")),
-            )
-        elif table == "firing_requests":
-            await conn.execute(
-                "INSERT OR REPLACE INTO firing_requests VALUES (?,?,?,?)",
-                (message_id, data["discord_id"], data_json, created_at),
-            )
-        elif table == "promotion_requests":
-            await conn.execute(
-                "INSERT OR REPLACE INTO promotion_requests VALUES (?,?,?,?)",
-                (message_id, data["discord_id"], data_json, created_at),
-            )
-        elif table == "warehouse_requests":
-            await conn.execute(
-                "INSERT OR REPLACE INTO warehouse_requests VALUES (?,?,?,?)",
-                (message_id, data["user_id"], data_json, created_at),
-            )
-        else:
-            raise ValueError(f"Unknown table: {table}")
-        await conn.commit()
 
+# (версия, функция). Версия схемы хранится в PRAGMA user_version; новые миграции — только в конец списка.
+_MIGRATIONS: list[tuple[int, Callable[[aiosqlite.Connection], Awaitable[None]]]] = [
+    (1, _migration_1_lookup_indexes),
+    (2, _migration_2_request_channel_id),
+    (3, _migration_3_audit_outbox),
+    (4, _migration_4_webhook_seen),
+]
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
 
-async def delete_request(table: str, message_id: int) -> None:
-    if table not in {"requests", "firing_requests", "promotion_requests", "warehouse_requests", "department_transfer_requests"}:
-        raise ValueError(f"Unknown table: {table}")
-    async with _get_conn() as conn:
-        await conn.execute(f"DELETE FROM {table} WHERE message_id = ?", (message_id,))
-        await conn.commit()
 
+async def _get_user_version(conn: aiosqlite.Connection) -> int:
+    cursor = await conn.execute("PRAGMA user_version")
+    row = await cursor.fetchone()
+    return int(row[0]) if row else 0
 
-async def _load_all(table: str) -> Dict[int, Dict]:
-    result = {}
-    async with _get_conn() as conn:
-        cursor = await conn.execute(f"SELECT message_id, data FROM {table}")
-        rows = await cursor.fetchall()
-    for mid, data in rows:
+
+async def _apply_migrations(conn: aiosqlite.Connection) -> int:
+    current = await _get_user_version(conn)
+    if current > SCHEMA_VERSION:
+        logger.warning("SQLite: версия схемы БД (%s) новее, чем знает бот (%s)", current, SCHEMA_VERSION)
+        return current
+    for version, migrate in _MIGRATIONS:
+        if version <= current:
+            continue
+        await conn.execute("BEGIN")
         try:
-            result[mid] = json.loads(data) if data else {}
-        except json.JSONDecodeError as e:
-            logger.warning("Пропуск битой записи в %s message_id=%s: %s", table, mid, e)
-    return result
+            await migrate(conn)
+            await conn.execute(f"PRAGMA user_version = {int(version)}")
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            logger.error("SQLite: миграция %s (%s) не применена", version, migrate.__name__, exc_info=True)
+            raise
+        logger.info("SQLite: применена миграция %s (%s)", version, migrate.__name__)
+        current = version
+    return current
+
+
+async def _migrate_legacy_draft_tables(conn: aiosqlite.Connection) -> None:
+    for dept in PROMOTION_DRAFT_DEPTS:
+        legacy = f"{dept}_draft_reports"
+        cursor = await conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name = ?", (legacy,)
+        )
+        if not await cursor.fetchone():
+            continue
+        cursor = await conn.execute(
+            f"""INSERT OR IGNORE INTO promotion_drafts (dept, user_id, data, updated_at)
+                SELECT ?, user_id, data, updated_at FROM {legacy} WHERE data IS NOT NULL""",
+            (dept,),
+        )
+        moved = cursor.rowcount
+        await conn.execute(f"DROP TABLE {legacy}")
+        logger.info("SQLite: черновики %s перенесены в promotion_drafts (%s шт.)", legacy, moved)
 
 
-async def load_all_requests() -> Dict[int, Dict]:
-    return await _load_all("requests")
+# Statement = (ключ строки, sql, параметры). Ключ нужен write-behind журналу для склейки записей.
+Statement = Tuple[Tuple[str, Any], str, tuple]
 
 
-async def load_all_firing_requests() -> Dict[int, Dict]:
-    return await _load_all("firing_requests")
+async def _execute_statement(stmt: Statement) -> None:
+    key, sql, params = stmt
+    async with _get_conn(key[0]) as conn:
+        await conn.execute(sql, params)
+        await conn.commit()
 
 
-async def load_all_promotion_requests() -> Dict[int, Dict]:
-    return await _load_all("promotion_requests")
+async def execute_batch(statements: Iterable[Statement]) -> int:
+    pool = await _get_pool()
+    count = 0
+    async with pool.writer() as conn:
+        for _, sql, params in statements:
+            await conn.execute(sql, params)
+            count += 1
+        await conn.commit()
+    return count
 
 
-async def load_all_warehouse_requests() -> Dict[int, Dict]:
-    return await _load_all("warehouse_requests")
+def _channel_id_or_none(value: Any) -> int | None:
+    try:
+        return int(value) or None
+    except (TypeError, ValueError):
+        return None
 
 
-async def save_orls_draft(user_id: int, draft: Dict[str, Any]) -> None:
-    storable = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-    data_json = json.dumps(storable, ensure_ascii=False, default=str)
-    updated_at = datetime.now().isoformat()
-    async with _get_conn() as conn:
-        await conn.execute(
-            "INSERT OR REPLACE INTO orls_draft_reports (user_id, data, updated_at) VALUES (?, ?, ?)",
-            (user_id, data_json, updated_at),
+def _save_request_stmt(table: str, message_id: int, data: Dict[str, Any]) -> Statement:
+    data_json = json.dumps(data, ensure_ascii=False, default=str)
+    created_at = data.get("created_at", datetime.now().isoformat())
+    channel_id = _channel_id_or_none(data.get("channel_id"))
+
+    if table == "requests":
+        sql = (
+            "INSERT OR REPLACE INTO requests (message_id, user_id, data, created_at, request_type, channel_id) "
+            "VALUES (?,?,?,?,?,?)"
         )
-        await conn.commit()
+        params = (message_id, data["user_id"], data_json, created_at, data.get("request_type", ""), channel_id)
+    elif table == "firing_requests":
+        sql = "INSERT OR REPLACE INTO firing_requests (message_id, discord_id, data, created_at, channel_id) VALUES (?,?,?,?,?)"
+        params = (message_id, data["discord_id"], data_json, created_at, channel_id)
+    elif table == "promotion_requests":
+        sql = "INSERT OR REPLACE INTO promotion_requests (message_id, discord_id, data, created_at, channel_id) VALUES (?,?,?,?,?)"
+        params = (message_id, data["discord_id"], data_json, created_at, channel_id)
+    elif table == "warehouse_requests":
+        sql = "INSERT OR REPLACE INTO warehouse_requests (message_id, user_id, data, created_at, channel_id) VALUES (?,?,?,?,?)"
+        params = (message_id, data["user_id"], data_json, created_at, channel_id)
+    else:
+        raise ValueError(f"Unknown table: {table}")
+    return (table, message_id), sql, params
 
 
-async def load_orls_draft(user_id: int) -> Dict[str, Any] | None:
-    async with _get_conn() as conn:
-        cursor = await conn.execute("SELECT data FROM orls_draft_reports WHERE user_id = ?", (user_id,))
+_REQUEST_TABLES = frozenset({
+    "requests",
+    "firing_requests",
+    "promotion_requests",
+    "warehouse_requests",
+    "department_transfer_requests",
+})
+
+
+def _check_request_table(table: str) -> str:
+    if table not in _REQUEST_TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    return table
+
+
+def _delete_request_stmt(table: str, message_id: int) -> Statement:
+    _check_request_table(table)
+    return (table, message_id), f"DELETE FROM {table} WHERE message_id = ?", (message_id,)
+
+
+async def save_request(table: str, message_id: int, data: Dict[str, Any]) -> None:
+    await _execute_statement(_save_request_stmt(table, message_id, data))
+
+
+async def delete_request(table: str, message_id: int) -> None:
+    await _execute_statement(_delete_request_stmt(table, message_id))
+
+
+async def count_requests(table: str) -> int:
+    _check_request_table(table)
+    async with _get_read_conn(table) as conn:
+        cursor = await conn.execute(f"SELECT COUNT(*) FROM {table}")
         row = await cursor.fetchone()
-    if not row or not row[0]:
-        return None
-    try:
-        data = json.loads(row[0])
-        data["_ephemeral_msg"] = None
-        data.setdefault("message_id", None)
-        return data
-    except json.JSONDecodeError as e:
-        logger.warning("Ошибка чтения orls_draft user_id=%s: %s", user_id, e)
-        return None
+    return int(row[0]) if row else 0
 
 
-async def delete_orls_draft(user_id: int) -> None:
-    async with _get_conn() as conn:
-        await conn.execute("DELETE FROM orls_draft_reports WHERE user_id = ?", (user_id,))
-        await conn.commit()
+async def request_exists(table: str, message_id: int) -> bool:
+    _check_request_table(table)
+    async with _get_read_conn(table) as conn:
+        cursor = await conn.execute(f"SELECT 1 FROM {table} WHERE message_id = ? LIMIT 1", (message_id,))
+        row = await cursor.fetchone()
+    return row is not None
 
 
-async def cleanup_old_orls_drafts(days: int = 14) -> int:
-    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-    async with _get_conn() as conn:
-        cursor = await conn.execute("SELECT user_id FROM orls_draft_reports WHERE updated_at < ?", (cutoff,))
-        to_delete = await cursor.fetchall()
-        for (uid,) in to_delete:
-            await conn.execute("DELETE FROM orls_draft_reports WHERE user_id = ?", (uid,))
-        await conn.commit()
-    return len(to_delete)
+async def list_message_ids(table: str) -> list[int]:
+    _check_request_table(table)
+    async with _get_read_conn(table) as conn:
+        cursor = await conn.execute(f"SELECT message_id FROM {table} ORDER BY message_id")
+        rows = await cursor.fetchall()
+    return [int(r[0]) for r in rows]
 
 
-async def save_osb_draft(user_id: int, draft: Dict[str, Any]) -> None:
-    storable = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-    data_json = json.dumps(storable, ensure_ascii=False, default=str)
-    updated_at = datetime.now().isoformat()
-    async with _get_conn() as conn:
-        await conn.execute(
-            "INSERT OR REPLACE INTO osb_draft_reports (user_id, data, updated_at) VALUES (?, ?, ?)",
-            (user_id, data_json, updated_at),
+async def list_message_channels(table: str) -> Dict[int, int]:
+    _check_request_table(table)
+    async with _get_read_conn(table) as conn:
+        cursor = await conn.execute(f"SELECT message_id, channel_id FROM {table} ORDER BY message_id")
+        rows = await cursor.fetchall()
+    return {int(mid): int(cid or 0) for mid, cid in rows}
+
+
+async def list_requests_without_channel(table: str) -> Dict[int, Dict]:
+    _check_request_table(table)
+    result = {}
+    async with _get_read_conn(table) as conn:
+        cursor = await conn.execute(f"SELECT message_id, data FROM {table} WHERE channel_id IS NULL")
+        rows = await cursor.fetchall()
+    for mid, data in rows:
+        try:
+            result[int(mid)] = json.loads(data) if data else {}
+        except json.JSONDecodeError:
+            result[int(mid)] = {}
+    return result
+
+
+async def set_request_channels(table: str, channels: Dict[int, int]) -> None:
+    _check_request_table(table)
+    if not channels:
+        return
+    async with _get_conn(table) as conn:
+        await conn.executemany(
+            f"UPDATE {table} SET channel_id = ? WHERE message_id = ?",
+            [(int(cid), int(mid)) for mid, cid in channels.items()],
         )
         await conn.commit()
 
 
-async def load_osb_draft(user_id: int) -> Dict[str, Any] | None:
-    async with _get_conn() as conn:
-        cursor = await conn.execute("SELECT data FROM osb_draft_reports WHERE user_id = ?", (user_id,))
-        row = await cursor.fetchone()
-    if not row or not row[0]:
-        return None
+def _request_row(table: str, mid: int, data: Any, channel_id: Any) -> Dict | None:
     try:
-        data = json.loads(row[0])
-        data["_ephemeral_msg"] = None
-        data.setdefault("message_id", None)
-        return data
+        item = json.loads(data) if data else {}
     except json.JSONDecodeError as e:
-        logger.warning("Ошибка чтения osb_draft user_id=%s: %s", user_id, e)
+        logger.warning("Пропуск битой записи в %s message_id=%s: %s", table, mid, e)
         return None
+    if channel_id and not item.get("channel_id"):
+        item["channel_id"] = channel_id
+    return item
 
 
-async def delete_osb_draft(user_id: int) -> None:
-    async with _get_conn() as conn:
-        await conn.execute("DELETE FROM osb_draft_reports WHERE user_id = ?", (user_id,))
-        await conn.commit()
+async def _load_all(table: str) -> Dict[int, Dict]:
+    result = {}
+    async with _get_read_conn(table) as conn:
+        cursor = await conn.execute(f"SELECT message_id, data, channel_id FROM {table}")
+        rows = await cursor.fetchall()
+    for mid, data, channel_id in rows:
+        item = _request_row(table, mid, data, channel_id)
+        if item is not None:
+            result[mid] = item
+    return result
 
 
-async def cleanup_old_osb_drafts(days: int = 14) -> int:
-    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-    async with _get_conn() as conn:
-        cursor = await conn.execute("SELECT user_id FROM osb_draft_reports WHERE updated_at < ?", (cutoff,))
-        to_delete = await cursor.fetchall()
-        for (uid,) in to_delete:
-            await conn.execute("DELETE FROM osb_draft_reports WHERE user_id = ?", (uid,))
-        await conn.commit()
-    return len(to_delete)
+# Колонки, которых хватает индексам RequestStore и проверке сообщений при запуске, без разбора JSON
+REQUEST_INDEX_COLUMNS = {
+    "requests": ("user_id", "request_type", "created_at", "channel_id"),
+    "firing_requests": ("discord_id", "created_at", "channel_id"),
+    "promotion_requests": ("discord_id", "created_at", "channel_id"),
+    "warehouse_requests": ("user_id", "created_at", "channel_id"),
+    "department_transfer_requests": (
+        "user_id", "target_dept", "source_dept", "from_academy",
+        "approved_source", "approved_target", "created_at", "channel_id",
+    ),
+}
 
 
-async def save_grom_draft(user_id: int, draft: Dict[str, Any]) -> None:
-    storable = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-    data_json = json.dumps(storable, ensure_ascii=False, default=str)
-    updated_at = datetime.now().isoformat()
-    async with _get_conn() as conn:
-        await conn.execute(
-            "INSERT OR REPLACE INTO grom_draft_reports (user_id, data, updated_at) VALUES (?, ?, ?)",
-            (user_id, data_json, updated_at),
-        )
-        await conn.commit()
+async def load_request_index(table: str) -> Dict[int, Dict[str, Any]]:
+    columns = REQUEST_INDEX_COLUMNS[_check_request_table(table)]
+    async with _get_read_conn(table) as conn:
+        cursor = await conn.execute(f"SELECT message_id, {', '.join(columns)} FROM {table}")
+        rows = await cursor.fetchall()
+    result = {}
+    for mid, *values in rows:
+        item = {col: value for col, value in zip(columns, values) if value is not None}
+        if table == "department_transfer_requests":
+            item["message_id"] = mid
+            item["from_academy"] = bool(item.get("from_academy"))
+        result[mid] = item
+    return result
 
 
-async def load_grom_draft(user_id: int) -> Dict[str, Any] | None:
-    async with _get_conn() as conn:
-        cursor = await conn.execute("SELECT data FROM grom_draft_reports WHERE user_id = ?", (user_id,))
+async def load_request(table: str, message_id: int) -> Dict | None:
+    if _check_request_table(table) == "department_transfer_requests":
+        return await load_department_transfer_request(message_id)
+    async with _get_read_conn(table) as conn:
+        cursor = await conn.execute(f"SELECT data, channel_id FROM {table} WHERE message_id = ?", (message_id,))
         row = await cursor.fetchone()
-    if not row or not row[0]:
-        return None
-    try:
-        data = json.loads(row[0])
-        data["_ephemeral_msg"] = None
-        data.setdefault("message_id", None)
-        return data
-    except json.JSONDecodeError as e:
-        logger.warning("Ошибка чтения grom_draft user_id=%s: %s", user_id, e)
-        return None
+    return _request_row(table, message_id, row[0], row[1]) if row else None
 
 
-async def delete_grom_draft(user_id: int) -> None:
-    async with _get_conn() as conn:
-        await conn.execute("DELETE FROM grom_draft_reports WHERE user_id = ?", (user_id,))
-        await conn.commit()
+async def load_all_requests() -> Dict[int, Dict]:
+    return await _load_all("requests")
 
 
-async def cleanup_old_grom_drafts(days: int = 14) -> int:
-    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-    async with _get_conn() as conn:
-        cursor = await conn.execute("SELECT user_id FROM grom_draft_reports WHERE updated_at < ?", (cutoff,))
-        to_delete = await cursor.fetchall()
-        for (uid,) in to_delete:
-            await conn.execute("DELETE FROM grom_draft_reports WHERE user_id = ?", (uid,))
-        await conn.commit()
-    return len(to_delete)
+async def load_all_firing_requests() -> Dict[int, Dict]:
+    return await _load_all("firing_requests")
+
+
+async def load_all_promotion_requests() -> Dict[int, Dict]:
+    return await _load_all("promotion_requests")
+
+
+async def load_all_warehouse_requests() -> Dict[int, Dict]:
+    return await _load_all("warehouse_requests")
 
 
-async def save_pps_draft(user_id: int, draft: Dict[str, Any]) -> None:
+PROMOTION_DRAFT_DEPTS = ("orls", "osb", "grom", "pps")
+
+
+def _check_draft_dept(dept: str) -> str:
+    d = (dept or "").strip().lower()
+    if d not in PROMOTION_DRAFT_DEPTS:
+        raise ValueError(f"Unknown draft department: {dept}")
+    return d
+
+
+def _save_promotion_draft_stmt(dept: str, user_id: int, draft: Dict[str, Any]) -> Statement:
+    d = _check_draft_dept(dept)
     storable = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
     data_json = json.dumps(storable, ensure_ascii=False, default=str)
     updated_at = datetime.now().isoformat()
-    async with _get_conn() as conn:
-        await conn.execute(
-            "INSERT OR REPLACE INTO pps_draft_reports (user_id, data, updated_at) VALUES (?, ?, ?)",
-            (user_id, data_json, updated_at),
-        )
-        await conn.commit()
+    return (
+        ("promotion_drafts", d, user_id),
+        "INSERT OR REPLACE INTO promotion_drafts (dept, user_id, data, updated_at) VALUES (?, ?, ?, ?)",
+        (d, user_id, data_json, updated_at),
+    )
 
 
-async def load_pps_draft(user_id: int) -> Dict[str, Any] | None:
-    async with _get_conn() as conn:
-        cursor = await conn.execute("SELECT data FROM pps_draft_reports WHERE user_id = ?", (user_id,))
+def _delete_promotion_draft_stmt(dept: str, user_id: int) -> Statement:
+    d = _check_draft_dept(dept)
+    return (
+        ("promotion_drafts", d, user_id),
+        "DELETE FROM promotion_drafts WHERE dept = ? AND user_id = ?",
+        (d, user_id),
+    )
+
+
+async def save_promotion_draft(dept: str, user_id: int, draft: Dict[str, Any]) -> None:
+    await _execute_statement(_save_promotion_draft_stmt(dept, user_id, draft))
+
+
+async def load_promotion_draft(dept: str, user_id: int) -> Dict[str, Any] | None:
+    d = _check_draft_dept(dept)
+    async with _get_read_conn("promotion_drafts") as conn:
+        cursor = await conn.execute(
+            "SELECT data FROM promotion_drafts WHERE dept = ? AND user_id = ?",
+            (d, user_id),
+        )
         row = await cursor.fetchone()
     if not row or not row[0]:
         return None
@@ -368,30 +637,39 @@ async def load_pps_draft(user_id: int) -> Dict[str, Any] | None:
         data.setdefault("message_id", None)
         return data
     except json.JSONDecodeError as e:
-        logger.warning("Ошибка чтения pps_draft user_id=%s: %s", user_id, e)
+        logger.warning("Ошибка чтения черновика %s user_id=%s: %s", d, user_id, e)
         return None
 
 
-async def delete_pps_draft(user_id: int) -> None:
-    async with _get_conn() as conn:
-        await conn.execute("DELETE FROM pps_draft_reports WHERE user_id = ?", (user_id,))
-        await conn.commit()
+async def delete_promotion_draft(dept: str, user_id: int) -> None:
+    await _execute_statement(_delete_promotion_draft_stmt(dept, user_id))
 
 
-async def cleanup_old_pps_drafts(days: int = 14) -> int:
-    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-    async with _get_conn() as conn:
-        cursor = await conn.execute("SELECT user_id FROM pps_draft_reports WHERE updated_at < ?", (cutoff,))
-        to_delete = await cursor.fetchall()
-        for (uid,) in to_delete:
-            await conn.execute("DELETE FROM pps_draft_reports WHERE user_id = ?", (uid,))
+async def cleanup_old_promotion_drafts(days: int | Dict[str, int] = 14) -> int:
+    if isinstance(days, dict):
+        days_by_dept = {d: int(days.get(d, 14)) for d in PROMOTION_DRAFT_DEPTS}
+    else:
+        days_by_dept = {d: int(days) for d in PROMOTION_DRAFT_DEPTS}
+    now = datetime.now()
+    cutoffs = {d: (now - timedelta(days=n)).isoformat() for d, n in days_by_dept.items()}
+    # Первое условие идёт по индексу updated_at, CASE уточняет срок для каждого отдела.
+    case_sql = " ".join("WHEN ? THEN ?" for _ in cutoffs)
+    params: list = [max(cutoffs.values())]
+    for d, cutoff in cutoffs.items():
+        params.extend((d, cutoff))
+    async with _get_conn("promotion_drafts") as conn:
+        cursor = await conn.execute(
+            f"DELETE FROM promotion_drafts WHERE updated_at < ? AND updated_at < CASE dept {case_sql} END",
+            params,
+        )
+        deleted = cursor.rowcount
         await conn.commit()
-    return len(to_delete)
+    return max(0, deleted or 0)
 
 
 async def cleanup_old_requests_db(days: int) -> None:
     cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-    async with _get_conn() as conn:
+    async with _get_conn(*_REQUEST_TABLES) as conn:
         for table in ["requests", "firing_requests", "promotion_requests", "warehouse_requests"]:
             await conn.execute(f"DELETE FROM {table} WHERE created_at < ?", (cutoff,))
         await conn.execute("DELETE FROM department_transfer_requests WHERE created_at < ?", (cutoff,))
@@ -449,11 +727,11 @@ async def delete_warehouse_request(message_id: int) -> None:
 async def save_department_transfer_request(message_id: int, payload: Dict[str, Any]) -> None:
     data_json = json.dumps(payload.get("data", {}), ensure_ascii=False, default=str)
     from_academy = 1 if payload.get("from_academy") else 0
-    async with _get_conn() as conn:
+    async with _get_conn("department_transfer_requests") as conn:
         await conn.execute(
             """INSERT OR REPLACE INTO department_transfer_requests
-               (message_id, user_id, target_dept, source_dept, from_academy, data, approved_source, approved_target, created_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+               (message_id, user_id, target_dept, source_dept, from_academy, data, approved_source, approved_target, created_at, channel_id)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
             (
                 message_id,
                 int(payload.get("user_id", 0)),
@@ -464,6 +742,7 @@ async def save_department_transfer_request(message_id: int, payload: Dict[str, A
                 int(payload.get("approved_source", 0)),
                 int(payload.get("approved_target", 0)),
                 payload.get("created_at", datetime.now().isoformat()),
+                _channel_id_or_none(payload.get("channel_id")),
             ),
         )
         await conn.commit()
@@ -475,7 +754,7 @@ async def update_department_transfer_approval(
     approved_source: int | None = None,
     approved_target: int | None = None,
 ) -> None:
-    async with _get_conn() as conn:
+    async with _get_conn("department_transfer_requests") as conn:
         if approved_source is not None:
             await conn.execute(
                 "UPDATE department_transfer_requests SET approved_source = ? WHERE message_id = ?",
@@ -490,9 +769,9 @@ async def update_department_transfer_approval(
 
 
 async def load_department_transfer_request(message_id: int) -> Dict[str, Any] | None:
-    async with _get_conn() as conn:
+    async with _get_read_conn("department_transfer_requests") as conn:
         cursor = await conn.execute(
-            """SELECT user_id, target_dept, source_dept, from_academy, data, approved_source, approved_target, created_at
+            """SELECT user_id, target_dept, source_dept, from_academy, data, approved_source, approved_target, created_at, channel_id
                FROM department_transfer_requests WHERE message_id = ?""",
             (message_id,),
         )
@@ -515,6 +794,7 @@ async def load_department_transfer_request(message_id: int) -> Dict[str, Any] |
         "approved_source": row[5] or 0,
         "approved_target": row[6] or 0,
         "created_at": row[7],
+        "channel_id": row[8] or 0,
     }
 
 
@@ -524,9 +804,9 @@ async def delete_department_transfer_request(message_id: int) -> None:
 
 async def load_all_department_transfer_requests() -> Dict[int, Dict[str, Any]]:
     result = {}
-    async with _get_conn() as conn:
+    async with _get_read_conn("department_transfer_requests") as conn:
         cursor = await conn.execute(
-            """SELECT message_id, user_id, target_dept, source_dept, from_academy, data, approved_source, approved_target, created_at
+            """SELECT message_id, user_id, target_dept, source_dept, from_academy, data, approved_source, approved_target, created_at, channel_id
                FROM department_transfer_requests"""
         )
         rows = await cursor.fetchall()
@@ -546,6 +826,7 @@ async def load_all_department_transfer_requests() -> Dict[int, Dict[str, Any]]:
             "approved_source": r[6] or 0,
             "approved_target": r[7] or 0,
             "created_at": r[8],
+            "channel_id": r[9] or 0,
         }
     return result
 
@@ -558,7 +839,7 @@ def _session_key_to_str(session_key: Any) -> str:
 
 async def warehouse_session_get(session_key: Any) -> tuple[list, datetime]:
     key = _session_key_to_str(session_key)
-    async with _get_conn() as conn:
+    async with _get_read_conn("warehouse_sessions") as conn:
         cursor = await conn.execute(
             "SELECT items_json, created_at FROM warehouse_sessions WHERE session_key = ?",
             (key,),
@@ -574,28 +855,33 @@ async def warehouse_session_get(session_key: Any) -> tuple[list, datetime]:
         return [], datetime.now()
 
 
-async def warehouse_session_set(session_key: Any, items: list, created_at: datetime | None = None) -> None:
+def _warehouse_session_set_stmt(session_key: Any, items: list, created_at: datetime | None = None) -> Statement:
     key = _session_key_to_str(session_key)
     created = created_at or datetime.now()
     items_json = json.dumps(items, ensure_ascii=False, default=str)
-    async with _get_conn() as conn:
-        await conn.execute(
-            "INSERT OR REPLACE INTO warehouse_sessions (session_key, items_json, created_at) VALUES (?, ?, ?)",
-            (key, items_json, created.isoformat()),
-        )
-        await conn.commit()
+    return (
+        ("warehouse_sessions", key),
+        "INSERT OR REPLACE INTO warehouse_sessions (session_key, items_json, created_at) VALUES (?, ?, ?)",
+        (key, items_json, created.isoformat()),
+    )
 
 
-async def warehouse_session_delete(session_key: Any) -> None:
+def _warehouse_session_delete_stmt(session_key: Any) -> Statement:
     key = _session_key_to_str(session_key)
-    async with _get_conn() as conn:
-        await conn.execute("DELETE FROM warehouse_sessions WHERE session_key = ?", (key,))
-        await conn.commit()
+    return ("warehouse_sessions", key), "DELETE FROM warehouse_sessions WHERE session_key = ?", (key,)
+
+
+async def warehouse_session_set(session_key: Any, items: list, created_at: datetime | None = None) -> None:
+    await _execute_statement(_warehouse_session_set_stmt(session_key, items, created_at))
+
+
+async def warehouse_session_delete(session_key: Any) -> None:
+    await _execute_statement(_warehouse_session_delete_stmt(session_key))
 
 
 async def warehouse_cooldown_get_all() -> Dict[int, datetime]:
     result = {}
-    async with _get_conn() as conn:
+    async with _get_read_conn("warehouse_cooldowns") as conn:
         cursor = await conn.execute("SELECT user_id, last_issue_at FROM warehouse_cooldowns")
         rows = await cursor.fetchall()
     for user_id, last_at in rows:
@@ -606,24 +892,29 @@ async def warehouse_cooldown_get_all() -> Dict[int, datetime]:
     return result
 
 
+def _warehouse_cooldown_set_stmt(user_id: int, last_issue_at: datetime) -> Statement:
+    return (
+        ("warehouse_cooldowns", user_id),
+        "INSERT OR REPLACE INTO warehouse_cooldowns (user_id, last_issue_at) VALUES (?, ?)",
+        (user_id, last_issue_at.isoformat()),
+    )
+
+
+def _warehouse_cooldown_clear_stmt(user_id: int) -> Statement:
+    return ("warehouse_cooldowns", user_id), "DELETE FROM warehouse_cooldowns WHERE user_id = ?", (user_id,)
+
+
 async def warehouse_cooldown_set(user_id: int, last_issue_at: datetime) -> None:
-    async with _get_conn() as conn:
-        await conn.execute(
-            "INSERT OR REPLACE INTO warehouse_cooldowns (user_id, last_issue_at) VALUES (?, ?)",
-            (user_id, last_issue_at.isoformat()),
-        )
-        await conn.commit()
+    await _execute_statement(_warehouse_cooldown_set_stmt(user_id, last_issue_at))
 
 
 async def warehouse_cooldown_clear(user_id: int) -> None:
-    async with _get_conn() as conn:
-        await conn.execute("DELETE FROM warehouse_cooldowns WHERE user_id = ?", (user_id,))
-        await conn.commit()
+    await _execute_statement(_warehouse_cooldown_clear_stmt(user_id))
 
 
 async def warehouse_session_get_all() -> Dict[str, Dict[str, Any]]:
     result = {}
-    async with _get_conn() as conn:
+    async with _get_read_conn("warehouse_sessions") as conn:
         cursor = await conn.execute("SELECT session_key, items_json, created_at FROM warehouse_sessions")
         rows = await cursor.fetchall()
     for key, items_json, created_at in rows:
@@ -633,4 +924,135 @@ async def warehouse_session_get_all() -> Dict[str, Dict[str, Any]]:
             result[str(key)] = {"items": items, "created_at": created}
         except (json.JSONDecodeError, ValueError):
             continue
-    return result
\ No newline at end of file
+    return result
+
+
+# Очередь отправок в кадровый аудит: статусы pending → delivered | failed.
+async def audit_outbox_add(payload: Dict[str, Any]) -> int:
+    now = datetime.now().isoformat()
+    async with _get_conn("audit_outbox") as conn:
+        cursor = await conn.execute(
+            "INSERT INTO audit_outbox (payload, status, attempts, next_attempt_at, created_at) VALUES (?, 'pending', 0, ?, ?)",
+            (json.dumps(payload, ensure_ascii=False), now, now),
+        )
+        await conn.commit()
+        return int(cursor.lastrowid)
+
+
+async def audit_outbox_due(limit: int = 20) -> list[tuple[int, Dict[str, Any], int]]:
+    async with _get_read_conn("audit_outbox") as conn:
+        cursor = await conn.execute(
+            """SELECT id, payload, attempts FROM audit_outbox
+               WHERE status = 'pending' AND next_attempt_at <= ?
+               ORDER BY next_attempt_at, id LIMIT ?""",
+            (datetime.now().isoformat(), int(limit)),
+        )
+        rows = await cursor.fetchall()
+    result = []
+    for row_id, payload, attempts in rows:
+        try:
+            result.append((int(row_id), json.loads(payload), int(attempts)))
+        except json.JSONDecodeError:
+            logger.warning("audit_outbox: повреждённая запись id=%s", row_id)
+    return result
+
+
+async def audit_outbox_next_due() -> datetime | None:
+    async with _get_read_conn("audit_outbox") as conn:
+        cursor = await conn.execute("SELECT MIN(next_attempt_at) FROM audit_outbox WHERE status = 'pending'")
+        row = await cursor.fetchone()
+    return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+
+async def audit_outbox_mark_delivered(row_id: int) -> None:
+    async with _get_conn("audit_outbox") as conn:
+        await conn.execute(
+            "UPDATE audit_outbox SET status = 'delivered', attempts = attempts + 1, delivered_at = ?, last_error = NULL WHERE id = ?",
+            (datetime.now().isoformat(), int(row_id)),
+        )
+        await conn.commit()
+
+
+async def audit_outbox_mark_retry(row_id: int, next_attempt_at: datetime, error: str, failed: bool = False) -> None:
+    async with _get_conn("audit_outbox") as conn:
+        await conn.execute(
+            "UPDATE audit_outbox SET status = ?, attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            ("failed" if failed else "pending", next_attempt_at.isoformat(), (error or "")[:500], int(row_id)),
+        )
+        await conn.commit()
+
+
+async def audit_outbox_counts() -> Dict[str, int]:
+    async with _get_read_conn("audit_outbox") as conn:
+        cursor = await conn.execute("SELECT status, COUNT(*) FROM audit_outbox GROUP BY status")
+        rows = await cursor.fetchall()
+    counts = {"pending": 0, "delivered": 0, "failed": 0}
+    counts.update({str(status): int(n) for status, n in rows})
+    return counts
+
+
+async def audit_outbox_replay_failed() -> int:
+    async with _get_conn("audit_outbox") as conn:
+        cursor = await conn.execute(
+            "UPDATE audit_outbox SET status = 'pending', attempts = 0, next_attempt_at = ? WHERE status = 'failed'",
+            (datetime.now().isoformat(),),
+        )
+        await conn.commit()
+        return cursor.rowcount
+
+
+async def cleanup_delivered_audit(days: int) -> int:
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    async with _get_conn("audit_outbox") as conn:
+        cursor = await conn.execute(
+            "DELETE FROM audit_outbox WHERE status = 'delivered' AND delivered_at < ?", (cutoff,)
+        )
+        await conn.commit()
+        return cursor.rowcount
+
+
+# Id уже принятых webhook-сообщений: повторная доставка того же сообщения шлюзом не создаёт второй рапорт.
+def _webhook_seen_add_stmt(message_id: int) -> Statement:
+    return (
+        ("webhook_seen", int(message_id)),
+        "INSERT OR IGNORE INTO webhook_seen (message_id, seen_at) VALUES (?, ?)",
+        (int(message_id), datetime.now().isoformat()),
+    )
+
+
+async def webhook_seen_add(message_id: int) -> None:
+    await _execute_statement(_webhook_seen_add_stmt(message_id))
+
+
+async def webhook_seen_load(limit: int) -> list[int]:
+    async with _get_read_conn("webhook_seen") as conn:
+        cursor = await conn.execute(
+            "SELECT message_id FROM webhook_seen ORDER BY message_id DESC LIMIT ?", (int(limit),)
+        )
+        rows = await cursor.fetchall()
+    return [int(row[0]) for row in reversed(rows)]
+
+
+async def webhook_seen_prune(keep: int) -> int:
+    async with _get_conn("webhook_seen") as conn:
+        cursor = await conn.execute(
+            """DELETE FROM webhook_seen WHERE message_id NOT IN
+               (SELECT message_id FROM webhook_seen ORDER BY message_id DESC LIMIT ?)""",
+            (int(keep),),
+        )
+        await conn.commit()
+        return cursor.rowcount
+
+
+# Записи, которые WorkerQueue.submit_fire отдаёт в write-behind журнал вместо отдельной транзакции.
+WRITE_BEHIND_STATEMENTS: Dict[Callable[..., Any], Callable[..., Statement]] = {
+    save_request: _save_request_stmt,
+    delete_request: _delete_request_stmt,
+    save_promotion_draft: _save_promotion_draft_stmt,
+    delete_promotion_draft: _delete_promotion_draft_stmt,
+    warehouse_session_set: _warehouse_session_set_stmt,
+    warehouse_session_delete: _warehouse_session_delete_stmt,
+    warehouse_cooldown_set: _warehouse_cooldown_set_stmt,
+    warehouse_cooldown_clear: _warehouse_cooldown_clear_stmt,
+    webhook_seen_add: _webhook_seen_add_stmt,
+}
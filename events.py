@@ -7,22 +7,21 @@ import discord
 
 import state
 from config import Config
-from database import (
-    delete_grom_draft,
-    delete_orls_draft,
-    delete_osb_draft,
-    delete_pps_draft,
-    init_db,
-)
+from database import init_db
+from services.audit_outbox import init_audit_outbox
+from services.channel_tail import get_tail_tracker
+from services.expiry import get_expiry
 from services.health_report import cleanup_orphan_records, run_health_report
+from services.ingest_server import start_ingest_server
+from services.ranks import reload_rank_index
+from services.member_resolver import get_member_resolver
+from services.position_supervisor import get_position_supervisor, init_position_supervisor
+from services.promotion_draft_cleanup import clear_promotion_draft_for_user
 from services.startup_checks import run_startup_checks
+from services.webhook_queue import init_webhook_queue
 from services.worker_queue import get_worker
 from utils import startup_log
-from commands.promotion_setup import (
-    ensure_promotion_messages_on_startup,
-    move_promotion_setup_to_bottom,
-    promotion_setup_position_check_loop,
-)
+from commands.promotion_setup import ensure_promotion_messages_on_startup
 
 logger = logging.getLogger(__name__)
 
@@ -62,12 +61,17 @@ def register_events(bot: discord.ext.commands.Bot) -> None:
     @bot.event
     async def on_ready():
         global _tree_synced_once
+        # on_ready после переподключения без RESUME: пропущенные события не придут
+        get_tail_tracker().reset()
         startup_log.banner_start()
 
         startup_log.section("Подключение")
         startup_log.step("Бот", str(bot.user))
         if bot.user:
             startup_log.step("ID бота", str(bot.user.id))
+        roles_cached = state.role_cache.refresh_guild(Config.GUILD_ID) if state.role_cache else 0
+        channels_cached = state.channel_cache.refresh_guild(Config.GUILD_ID) if state.channel_cache else 0
+        startup_log.step("Кэш ролей/каналов", f"{roles_cached} / {channels_cached}")
 
         startup_log.section("База данных")
         try:
@@ -108,6 +112,14 @@ def register_events(bot: discord.ext.commands.Bot) -> None:
         else:
             startup_log.step("Уже синхронизированы", "—")
 
+        try:
+            from services.channel_backfill import backfill_request_channels
+            filled = await backfill_request_channels(bot)
+            if filled:
+                startup_log.step("channel_id заявок", f"заполнено: {filled}")
+        except Exception as e:
+            logger.error("Ошибка заполнения channel_id заявок: %s", e, exc_info=True)
+
         startup_log.section("Восстановление View")
         view_restorer = getattr(state, "view_restorer", None)
         if view_restorer:
@@ -121,6 +133,8 @@ def register_events(bot: discord.ext.commands.Bot) -> None:
             startup_log.step("View восстановлены", "пропущено (нет view_restorer)")
 
         startup_log.section("Проверки при запуске")
+        rank_index = reload_rank_index()
+        startup_log.step("Индекс званий", f"переходов: {len(rank_index.transitions)}, ролей: {len(rank_index.role_ids)}")
         try:
             await run_startup_checks(bot)
             startup_log.step("Каналы и роли", "проверены")
@@ -149,41 +163,41 @@ def register_events(bot: discord.ext.commands.Bot) -> None:
 
         startup_log.section("Фоновые задачи")
         get_worker().start()
-        start_manager = getattr(state, "start_manager", None)
-        warehouse_position_manager = getattr(state, "warehouse_position_manager", None)
         cleanup_manager = getattr(state, "cleanup_manager", None)
-        if start_manager:
-            _ensure_background_task(bot, "start_position_checker", start_manager.start_checking)
-        if warehouse_position_manager:
-            _ensure_background_task(bot, "warehouse_position_checker", warehouse_position_manager.start_checking)
         if cleanup_manager:
             _ensure_background_task(bot, "cleanup_manager", cleanup_manager.start_cleanup)
+        expiry = get_expiry()
+        _ensure_background_task(bot, "expiry", expiry.run)
+        startup_log.step("Сроки заявок/сессий/кулдаунов", f"в очереди: {expiry.stats()['scheduled']}")
+
+        supervisor = init_position_supervisor(bot)
+        _ensure_background_task(bot, "position_supervisor", supervisor.run)
+        startup_log.step("Позиции сообщений", f"каналов: {supervisor.stats()['targets']}")
+
+        webhook_handler = getattr(state, "webhook_handler", None)
+        if webhook_handler is not None:
+            webhook_queue = init_webhook_queue(webhook_handler)
+            try:
+                seen = await webhook_queue.load_seen()
+            except Exception as e:
+                logger.error("Очередь webhook: не удалось загрузить принятые id: %s", e, exc_info=True)
+                seen = 0
+            _ensure_background_task(bot, "webhook_queue", webhook_queue.run)
+            startup_log.step("Очередь webhook", f"обработчиков: {webhook_queue.consumers}, известных id: {seen}")
+
+        if webhook_handler is not None and getattr(Config, "INGEST_ENABLED", False):
+            try:
+                ingest = await start_ingest_server(bot, webhook_handler)
+                if ingest is not None:
+                    startup_log.step("Приём рапортов", f"http://{ingest.host}:{ingest.port}/reports")
+            except OSError as e:
+                logger.error("Приём рапортов: не удалось открыть порт: %s", e)
+                startup_log.step("Приём рапортов", "ошибка: %s" % e)
 
-        for name, manager_attr in (
-            ("apply_grom_position_checker", "apply_grom_manager"),
-            ("apply_pps_position_checker", "apply_pps_manager"),
-            ("apply_osb_position_checker", "apply_osb_manager"),
-            ("apply_orls_position_checker", "apply_orls_manager"),
-        ):
-            manager = getattr(state, manager_attr, None)
-            ch_attr = "CHANNEL_APPLY_GROM" if "grom" in name else "CHANNEL_APPLY_PPS" if "pps" in name else "CHANNEL_APPLY_OSB" if "osb" in name else "CHANNEL_APPLY_ORLS"
-            if manager and getattr(Config, ch_attr, 0):
-                _ensure_background_task(bot, name, manager.start_checking)
-
-        if getattr(Config, "ACADEMY_CHANNEL_ID", 0) and getattr(Config, "ROLE_ACADEMY", 0):
-            academy_apply_manager = getattr(state, "academy_apply_manager", None)
-            if academy_apply_manager:
-                _ensure_background_task(bot, "academy_apply_position_checker", academy_apply_manager.start_checking)
-        if getattr(Config, "CHANNEL_ADMIN_TRANSFER", 0):
-            admin_transfer_manager = getattr(state, "admin_transfer_manager", None)
-            if admin_transfer_manager:
-                _ensure_background_task(bot, "admin_transfer_position_checker", admin_transfer_manager.start_checking)
-        if getattr(Config, "FIRING_CHANNEL_ID", 0):
-            firing_position_manager = getattr(state, "firing_position_manager", None)
-            if firing_position_manager:
-                _ensure_background_task(bot, "firing_position_checker", firing_position_manager.start_checking)
-        if getattr(Config, "PROMOTION_SETUP_CHECK_INTERVAL", 0):
-            _ensure_background_task(bot, "promotion_setup_position_check", lambda: promotion_setup_position_check_loop(bot))
+        outbox = init_audit_outbox()
+        _ensure_background_task(bot, "audit_outbox", outbox.run)
+        counts = await outbox.refresh_counts()
+        startup_log.step("Очередь аудита", f"ждут: {counts['pending']}, не доставлено: {counts['failed']}")
 
         guild = bot.get_guild(Config.GUILD_ID) if Config.GUILD_ID else None
         startup_log.banner_ready(
@@ -194,11 +208,13 @@ def register_events(bot: discord.ext.commands.Bot) -> None:
 
     @bot.event
     async def on_message(message: discord.Message):
+        get_tail_tracker().on_message(message)
         if message.author == bot.user:
             return
 
-        if (not getattr(message.author, "bot", False)) and message.channel.id in (getattr(state, "promotion_setup_messages", None) or {}):
-            await move_promotion_setup_to_bottom(bot, message.channel)
+        supervisor = get_position_supervisor()
+        if supervisor is not None:
+            supervisor.on_channel_activity(message.channel.id)
 
         if message.webhook_id:
             allowed_ids = getattr(Config, "WEBHOOK_ALLOWED_IDS", None) or []
@@ -209,31 +225,71 @@ def register_events(bot: discord.ext.commands.Bot) -> None:
                 return
             webhook_handler = getattr(state, "webhook_handler", None)
             if webhook_handler:
-                await webhook_handler.process_webhook(message)
+                await init_webhook_queue(webhook_handler).submit(message)
             return
 
         await bot.process_commands(message)
 
+    @bot.event
+    async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
+        get_tail_tracker().on_raw_message_delete(payload)
+
+    @bot.event
+    async def on_raw_bulk_message_delete(payload: discord.RawBulkMessageDeleteEvent):
+        get_tail_tracker().on_raw_bulk_message_delete(payload)
+
+    @bot.event
+    async def on_guild_role_create(role: discord.Role):
+        if state.role_cache:
+            state.role_cache.on_role_upsert(role)
+
+    @bot.event
+    async def on_guild_role_update(before: discord.Role, after: discord.Role):
+        if state.role_cache:
+            state.role_cache.on_role_upsert(after)
+
+    @bot.event
+    async def on_guild_role_delete(role: discord.Role):
+        if state.role_cache:
+            state.role_cache.on_role_delete(role)
+
+    @bot.event
+    async def on_guild_channel_create(channel: discord.abc.GuildChannel):
+        if state.channel_cache:
+            state.channel_cache.on_channel_upsert(channel)
+
+    @bot.event
+    async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if state.channel_cache:
+            state.channel_cache.on_channel_upsert(after)
+
+    @bot.event
+    async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+        if state.channel_cache:
+            state.channel_cache.on_channel_delete(channel)
+
+    @bot.event
+    async def on_thread_delete(thread: discord.Thread):
+        if state.channel_cache:
+            state.channel_cache.on_channel_delete(thread)
+
+    @bot.event
+    async def on_member_join(member: discord.Member):
+        get_member_resolver().on_member_event(member)
+
+    @bot.event
+    async def on_member_update(before: discord.Member, after: discord.Member):
+        get_member_resolver().on_member_event(after)
+
     @bot.event
     async def on_member_remove(member: discord.Member):
+        get_member_resolver().on_member_event(member)
         try:
             from modals.firing_apply_modal import post_auto_firing_report
             await post_auto_firing_report(member)
         except Exception as e:
             logger.warning("Ошибка при авто-рапорте увольнения: %s", e, exc_info=True)
         try:
-            uid = member.id
-            (getattr(state, "orls_draft_reports", None) or {}).pop(uid, None)
-            (getattr(state, "orls_last_user_data", None) or {}).pop(uid, None)
-            get_worker().submit_fire(delete_orls_draft, uid)
-            (getattr(state, "osb_draft_reports", None) or {}).pop(uid, None)
-            (getattr(state, "osb_last_user_data", None) or {}).pop(uid, None)
-            get_worker().submit_fire(delete_osb_draft, uid)
-            (getattr(state, "grom_draft_reports", None) or {}).pop(uid, None)
-            (getattr(state, "grom_last_user_data", None) or {}).pop(uid, None)
-            get_worker().submit_fire(delete_grom_draft, uid)
-            (getattr(state, "pps_draft_reports", None) or {}).pop(uid, None)
-            (getattr(state, "pps_last_user_data", None) or {}).pop(uid, None)
-            get_worker().submit_fire(delete_pps_draft, uid)
+            clear_promotion_draft_for_user(member.id)
         except Exception as e:
             logger.debug("черновики при выходе: %s", e)
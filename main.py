@@ -36,13 +36,41 @@ intents = discord.Intents.default()
 intents.message_content = Config.ENABLE_MESSAGE_CONTENT_INTENT
 intents.members = True
 
-bot = commands.Bot(
+
+class UvdBot(commands.Bot):
+    async def close(self) -> None:
+        await super().close()
+        try:
+            from services.ingest_server import get_ingest_server
+            ingest = get_ingest_server()
+            if ingest is not None:
+                await ingest.stop()
+        except Exception as e:
+            logger.warning("Ошибка остановки приёма рапортов: %s", e)
+        try:
+            from services.audit_outbox import get_audit_outbox
+            outbox = get_audit_outbox()
+            if outbox is not None:
+                await outbox.close()
+        except Exception as e:
+            logger.warning("Ошибка закрытия очереди аудита: %s", e)
+        try:
+            from database import close_db
+            await close_db()
+        except Exception as e:
+            logger.warning("Ошибка закрытия БД при остановке: %s", e)
+
+
+bot = UvdBot(
     command_prefix=Config.COMMAND_PREFIX,
     intents=intents,
     max_messages=Config.BOT_MAX_MESSAGES if Config.BOT_MAX_MESSAGES > 0 else None,
 )
 state.bot = bot
 
+from utils.rest_scheduler import init_rest_scheduler
+init_rest_scheduler(bot, Config.REST_MAX_CONCURRENCY, Config.REST_BACKGROUND_CONCURRENCY, Config.REST_BUCKET_CONCURRENCY)
+
 from services.cache import ChannelCache, RoleCache
 from services.cleanup import CleanupManager
 from services.firing_position_manager import FiringPositionManager
@@ -57,6 +85,7 @@ from services.start_position_manager import StartPositionManager
 from services.warehouse_position_manager import WarehousePositionManager
 from services.webhook_handler import WebhookHandler
 from services.worker_queue import get_worker, init_worker
+from services.write_journal import init_journal
 
 state.role_cache = RoleCache(bot)
 state.channel_cache = ChannelCache(bot)
@@ -65,6 +94,7 @@ state.start_manager = StartPositionManager(bot)
 state.warehouse_position_manager = WarehousePositionManager(bot)
 state.cleanup_manager = CleanupManager(bot)
 init_worker()
+init_journal()
 state.view_restorer = ViewRestorer(bot)
 state.apply_grom_manager = ApplyGromPositionManager(bot)
 state.apply_pps_manager = ApplyPpsPositionManager(bot)
@@ -13,9 +13,10 @@ from services.department_roles import (
     get_base_rank_role,
     get_approval_label_target,
 )
-from utils.rate_limiter import apply_role_changes, safe_discord_call
+from utils.rate_limiter import MemberMutation
 from views.message_texts import ErrorMessages
 from services.promotion_draft_cleanup import clear_promotion_draft_for_department
+from services.member_resolver import resolve_member
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +63,7 @@ class AdminTransferModal(Modal):
                 await interaction.followup.send("❌ Нельзя перевести самого себя.", ephemeral=True)
                 return
 
-            member = guild.get_member(target_id) or await guild.fetch_member(target_id)
+            member = await resolve_member(guild, target_id)
             if not member:
                 await interaction.followup.send("❌ Пользователь с таким ID не найден на сервере.", ephemeral=True)
                 return
@@ -90,20 +91,15 @@ class AdminTransferModal(Modal):
                 await interaction.followup.send("❌ Сотрудник уже находится в ППС.", ephemeral=True)
                 return
 
-            await apply_role_changes(member, remove=to_remove, add=to_add)
-
-            clear_promotion_draft_for_department(target_id, self.from_dept)
-
             display = (member.display_name or "").strip()
             full_name = display.split(" | ", 1)[-1].strip() if " | " in display else display
             if not full_name:
                 full_name = "Сотрудник"
             prefix = getattr(Config, "PPS_NICKNAME_PREFIX", "ППС |")
             pps_nick = f"{prefix} {full_name}".strip()[:32]
-            try:
-                await safe_discord_call(member.edit, nick=pps_nick)
-            except Exception as e:
-                logger.warning("Не удалось выставить префикс ППС нику при админ-переводе: %s", e)
+            await MemberMutation(member).remove(*to_remove).add(*to_add).set_nick(pps_nick).apply()
+
+            clear_promotion_draft_for_department(target_id, self.from_dept)
 
             reason = (self.reason_input.value or "").strip() or "Не указана"
             channel_admin_id = getattr(Config, "CHANNEL_ADMIN_TRANSFER", 0) or 0
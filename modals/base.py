@@ -77,7 +77,7 @@ class BaseRequestModal(Modal):
         return {}
 
     async def has_active_request(self, user_id: int) -> bool:
-        return any(req.get('user_id') == user_id for req in active_requests.values())
+        return active_requests.has_user(user_id)
 
     async def save_request(self, interaction: discord.Interaction, message: discord.Message,
                           validated_data: Dict[str, Any], additional_data: Dict[str, Any]):
@@ -85,6 +85,7 @@ class BaseRequestModal(Modal):
             'user_id': interaction.user.id,
             'message_id': message.id,
             'message_link': message.jump_url,
+            'channel_id': message.channel.id,
             'embed': message.embeds[0].to_dict(),
             'request_type': self.request_type.value,
             'created_at': datetime.now().isoformat(),
@@ -108,13 +109,14 @@ class BaseRequestModal(Modal):
             
 
             from views.request_view import RequestView
+            from views.component_router import render_only
             
-            view = RequestView(
+            view = render_only(RequestView(
                 user_id=interaction.user.id,
                 validated_data=result,
                 request_type=self.request_type,
                 **additional_data
-            )
+            ))
             channel = bot.get_channel(Config.REQUEST_CHANNEL_ID)
             if not channel:
                 logger.error(f"канал заявок {Config.REQUEST_CHANNEL_ID} не найден")
@@ -4,6 +4,7 @@ import logging
 import asyncio
 from config import Config
 from views.message_texts import ErrorMessages
+from views.component_router import render_only
 from utils.validators import Validators
 from utils.embed_utils import copy_embed, add_officer_field, add_reject_reason
 from database import delete_request
@@ -108,7 +109,7 @@ class BaseRejectModal(Modal):
         for item in view.children:
             item.disabled = True
 
-        return view
+        return render_only(view)
 
     async def on_submit(self, interaction: discord.Interaction):
         try:
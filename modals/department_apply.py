@@ -18,11 +18,13 @@ from services.department_roles import (
     get_dept_and_rank_roles,
     get_base_rank_role,
 )
-from utils.rate_limiter import safe_send, apply_role_changes, safe_discord_call
+from utils.rate_limiter import safe_send, MemberMutation
 from utils.validators import Validators
 from views.department_approval_view import DepartmentApprovalView
+from views.component_router import render_only
 from views.message_texts import ErrorMessages
 from services.department_nickname import get_transfer_nickname
+from services.member_resolver import resolve_member
 
 logger = logging.getLogger(__name__)
 
@@ -202,7 +204,7 @@ async def _post_application(
     if from_academy and target_dept == "pps":
 
         guild = channel.guild
-        member = guild.get_member(user_id) or await guild.fetch_member(user_id)
+        member = await resolve_member(guild, user_id)
         if member:
             remove_dept, remove_rank = get_dept_and_rank_roles(guild, "academy")
             add_dept, _ = get_dept_and_rank_roles(guild, "pps")
@@ -211,14 +213,11 @@ async def _post_application(
             to_add = [r for r in add_dept if r]
             if base_rank:
                 to_add.append(base_rank)
-            if to_remove or to_add:
-                await apply_role_changes(member, remove=to_remove, add=to_add)
+            mutation = MemberMutation(member).remove(*to_remove).add(*to_add)
             new_nick = get_transfer_nickname("pps", form_data)
             if new_nick:
-                try:
-                    await safe_discord_call(member.edit, nick=new_nick)
-                except Exception:
-                    pass
+                mutation.set_nick(new_nick)
+            await mutation.apply()
             try:
                 await member.send("✅ Ваша заявка в ППС (из Академии) одобрена. Вам выданы роли ППС.")
             except (discord.Forbidden, discord.HTTPException):
@@ -227,7 +226,7 @@ async def _post_application(
         msg = await safe_send(channel, content=content, embed=embed)
         return msg
 
-    view = DepartmentApprovalView(
+    view = render_only(DepartmentApprovalView(
         message_id=0,
         user_id=user_id,
         target_dept=target_dept,
@@ -235,11 +234,9 @@ async def _post_application(
         from_academy=from_academy,
         form_data=form_data,
         channel_id=channel.id,
-    )
+    ))
     msg = await safe_send(channel, content=content, embed=embed, view=view)
     if msg:
-
-        view.message_id = msg.id
         payload = {
             "user_id": user_id,
             "target_dept": target_dept,
@@ -249,6 +246,7 @@ async def _post_application(
             "approved_source": 0,
             "approved_target": 0,
             "created_at": datetime.now().isoformat(),
+            "channel_id": msg.channel.id,
         }
         await save_department_transfer_request(msg.id, payload)
         active_department_transfers[msg.id] = {**payload, "message_id": msg.id}
@@ -11,6 +11,7 @@ from views.theme import RED
 from database import delete_department_transfer_request
 from state import active_department_transfers
 from utils.embed_utils import copy_embed, update_embed_status
+from services.member_resolver import resolve_member
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +57,7 @@ class DepartmentRejectModal(Modal, title="Отклонение заявки"):
 
             await msg.edit(embed=embed, view=None)
 
-            member = guild.get_member(self.user_id) or await guild.fetch_member(self.user_id)
+            member = await resolve_member(guild, self.user_id)
             if member:
                 try:
                     await member.send(
@@ -196,7 +196,7 @@ class EditRequestModal(Modal):
             new_embed = await self.create_updated_embed(result, message.embeds[0])
 
 
-            existing = active_requests.get(self.message_id, {}).copy()
+            existing = (await active_requests.hydrate(self.message_id) or {}).copy()
             if not existing:
                 existing = dict(self.current_data)
 
@@ -209,6 +209,7 @@ class EditRequestModal(Modal):
 
             if message.jump_url:
                 existing["message_link"] = message.jump_url
+            existing["channel_id"] = message.channel.id
 
             active_requests[self.message_id] = existing
 
@@ -12,6 +12,7 @@ from config import Config
 from database import save_request
 from state import active_firing_requests, bot
 from views.firing_view import FiringView
+from views.component_router import render_only
 from utils.validators import Validators
 from utils.rate_limiter import safe_send
 from utils.rank_decline import decline_rank_genitive
@@ -181,7 +182,7 @@ class FiringApplyModal(Modal):
         )
 
         role_mention = f"<@&{Config.FIRING_STAFF_ROLE_ID}>" if getattr(Config, "FIRING_STAFF_ROLE_ID", 0) else ""
-        view = FiringView(user_id=discord_id)
+        view = render_only(FiringView(user_id=discord_id))
 
 
         channel = None
@@ -215,6 +216,7 @@ class FiringApplyModal(Modal):
                 "photo_link": photo_link,
                 "recovery_option": "с возможностью восстановления" if with_recovery else "без возможности восстановления",
                 "message_link": msg.jump_url,
+                "channel_id": msg.channel.id,
             }
             active_firing_requests[msg.id] = request_data
             await save_request("firing_requests", msg.id, request_data)
@@ -254,7 +256,7 @@ async def post_auto_firing_report(member: discord.Member) -> bool:
         mention=member.mention,
     )
     role_mention = f"<@&{Config.FIRING_STAFF_ROLE_ID}>" if getattr(Config, "FIRING_STAFF_ROLE_ID", 0) else ""
-    view = FiringView(user_id=member.id)
+    view = render_only(FiringView(user_id=member.id))
     try:
         msg = await safe_send(channel, content=role_mention, embed=embed, view=view)
     except Exception as e:
@@ -270,6 +272,7 @@ async def post_auto_firing_report(member: discord.Member) -> bool:
         "photo_link": "—",
         "recovery_option": "без возможности восстановления",
         "message_link": msg.jump_url,
+        "channel_id": msg.channel.id,
     }
     active_firing_requests[msg.id] = request_data
     await save_request("firing_requests", msg.id, request_data)
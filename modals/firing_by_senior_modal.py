@@ -6,8 +6,9 @@ import asyncio
 
 from config import Config
 from views.message_texts import ErrorMessages
-from utils.rate_limiter import apply_role_changes, safe_discord_call
+from utils.rate_limiter import MemberMutation
 from services.audit import send_to_audit
+from services.member_resolver import resolve_member
 from views.theme import RED
 
 logger = logging.getLogger(__name__)
@@ -61,12 +62,7 @@ class FiringBySeniorModal(Modal):
         await interaction.response.defer(ephemeral=True)
 
         try:
-            member = interaction.guild.get_member(target_id)
-            if not member:
-                try:
-                    member = await interaction.guild.fetch_member(target_id)
-                except discord.NotFound:
-                    member = None
+            member = await resolve_member(interaction.guild, target_id)
         except (discord.Forbidden, discord.HTTPException) as e:
             logger.warning("FiringBySenior: не удалось получить участника %s: %s", target_id, e)
             await interaction.followup.send(
@@ -116,37 +112,23 @@ class FiringBySeniorModal(Modal):
             if role.id not in roles_to_keep_ids:
                 roles_to_remove.append(role)
 
-        if roles_to_remove:
-            try:
-                await apply_role_changes(member, remove=roles_to_remove)
-            except discord.Forbidden:
-                await interaction.followup.send("❌ У бота нет прав снять роли.", ephemeral=True)
-                return
-            except discord.HTTPException as e:
-                logger.warning("FiringBySenior: снятие ролей %s: %s", member.id, e, exc_info=True)
-                await interaction.followup.send("❌ Ошибка Discord API при снятии ролей.", ephemeral=True)
-                return
-
         fired_role = interaction.guild.get_role(Config.FIRED_ROLE_ID)
-        if fired_role:
-            try:
-                await apply_role_changes(member, add=[fired_role])
-            except discord.Forbidden:
-                await interaction.followup.send("❌ У бота нет прав выдать роль уволенного.", ephemeral=True)
-                return
-            except discord.HTTPException as e:
-                logger.warning("FiringBySenior: выдача роли уволенного %s: %s", member.id, e, exc_info=True)
-                await interaction.followup.send("❌ Ошибка Discord API при выдаче роли.", ephemeral=True)
-                return
-
         prefix = (Config.FIRING_NICKNAME_PREFIX or "Уволен |").strip()
         name_for_nick = full_name or "Сотрудник"
+        parts = name_for_nick.split(None, 1)
+        new_nick = f"{prefix} {parts[0]} {parts[1]}" if len(parts) >= 2 else f"{prefix} {name_for_nick}"
+
+        mutation = MemberMutation(member).remove(*roles_to_remove).add(fired_role).set_nick(new_nick)
         try:
-            parts = name_for_nick.split(None, 1)
-            new_nick = f"{prefix} {parts[0]} {parts[1]}" if len(parts) >= 2 else f"{prefix} {name_for_nick}"
-            await safe_discord_call(member.edit, nick=new_nick)
-        except (discord.Forbidden, discord.HTTPException) as e:
-            logger.warning("FiringBySenior: смена ника %s: %s", member.id, e)
+            await mutation.apply()
+        except discord.Forbidden:
+            await interaction.followup.send("❌ У бота нет прав изменить роли.", ephemeral=True)
+            return
+        except discord.HTTPException as e:
+            logger.warning("FiringBySenior: изменение ролей %s: %s", member.id, e, exc_info=True)
+            await interaction.followup.send("❌ Ошибка Discord API при изменении ролей.", ephemeral=True)
+            return
+        if mutation.nick_error is not None:
             new_nick = f"{prefix} {name_for_nick}"
 
         try:
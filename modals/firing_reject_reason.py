@@ -19,7 +19,7 @@ class FiringRejectReasonModal(BaseRejectModal):
         return Config.FIRING_STAFF_ROLE_ID
 
     async def get_request_data(self, message_id):
-        return active_firing_requests.get(message_id)
+        return await active_firing_requests.hydrate(message_id)
 
     def get_view_class(self):
         from views.firing_view import FiringView
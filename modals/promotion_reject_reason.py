@@ -2,6 +2,7 @@ import logging
 from config import Config
 from state import active_promotion_requests
 from .base_reject import BaseRejectModal
+from views.component_router import render_only
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +23,7 @@ class PromotionRejectReasonModal(BaseRejectModal):
         return [int(rid) for rid in role_ids if int(rid) != 0]
 
     async def get_request_data(self, message_id):
-        return active_promotion_requests.get(message_id)
+        return await active_promotion_requests.hydrate(message_id)
 
     def get_view_class(self):
         from views.promotion_view import PromotionView
@@ -50,7 +51,7 @@ class PromotionRejectReasonModal(BaseRejectModal):
         )
         for item in view.children:
             item.disabled = True
-        return view
+        return render_only(view)
 
     async def on_submit(self, interaction):
         if self.message_id not in active_promotion_requests:
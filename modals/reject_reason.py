@@ -41,7 +41,7 @@ class RejectReasonModal(Modal, title='Отклонение заявки'):
                 await interaction.response.send_message(f"❌ {reason}", ephemeral=True)
                 return
 
-            request_data = active_requests.get(self.message_id)
+            request_data = await active_requests.hydrate(self.message_id)
             if not request_data:
                 await interaction.response.send_message(ErrorMessages.NOT_FOUND.format(item="заявка"), ephemeral=True)
                 return
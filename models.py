@@ -1,7 +1,10 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
 from datetime import datetime
+from typing import Any, ClassVar, Optional
 
 class FiringRequest:
-    def __init__(self, discord_id, full_name, rank, reason="псж", photo_link=None, recovery_option="без возможности восстановления"):
+    def __init__(self, discord_id, full_name, rank, reason="псж", photo_link=None, recovery_option="без возможности восстановления", channel_id=None):
         self.discord_id = discord_id
         self.full_name = full_name
         self.rank = rank
@@ -11,6 +14,7 @@ class FiringRequest:
         self.created_at = datetime.now()
         self.status = "pending"
         self.message_link = None
+        self.channel_id = channel_id
 
     def to_dict(self):
         return {
@@ -22,15 +26,31 @@ class FiringRequest:
             'recovery_option': self.recovery_option,
             'created_at': self.created_at.isoformat(),
             'status': self.status,
-            'message_link': self.message_link
+            'message_link': self.message_link,
+            'channel_id': self.channel_id
         }
 
+    def to_record(self) -> "FiringRecord":
+        return FiringRecord(
+            discord_id=self.discord_id,
+            full_name=self.full_name,
+            rank=self.rank,
+            reason=self.reason,
+            photo_link=self.photo_link,
+            recovery_option=self.recovery_option,
+            status=self.status,
+            message_link=self.message_link,
+            channel_id=self.channel_id,
+            created_at=self.created_at,
+        )
+
 class PromotionRequest:
-    def __init__(self, discord_id, full_name, new_rank, message_link=None):
+    def __init__(self, discord_id, full_name, new_rank, message_link=None, channel_id=None):
         self.discord_id = discord_id
         self.full_name = full_name
         self.new_rank = new_rank
         self.message_link = message_link
+        self.channel_id = channel_id
         self.created_at = datetime.now()
         self.status = "pending"
 
@@ -41,5 +61,168 @@ class PromotionRequest:
             'new_rank': self.new_rank,
             'message_link': self.message_link,
             'created_at': self.created_at.isoformat(),
-            'status': self.status
-        }
\ No newline at end of file
+            'status': self.status,
+            'channel_id': self.channel_id
+        }
+
+    def to_record(self) -> "PromotionRecord":
+        return PromotionRecord(
+            discord_id=self.discord_id,
+            full_name=self.full_name,
+            new_rank=self.new_rank,
+            message_link=self.message_link,
+            status=self.status,
+            channel_id=self.channel_id,
+            created_at=self.created_at,
+        )
+
+# Записи в памяти (state.active_* / warehouse_requests): вместо свободного dict — объект со
+# __slots__ и заранее разобранным created_at. Снаружи запись читается как неизменяемый dict
+# (get, [], in, items, {**record}), поэтому код, работающий с данными заявок, не меняется;
+# изменить запись — значит присвоить в хранилище новый dict. В БД/JSON — через to_dict().
+# Поля, которых не было во входных данных, остаются «отсутствующими» (get вернёт default),
+# неизвестные ключи хранятся в extra. Атрибут с «_» на конце — ключ без него (items_ -> "items").
+class _Absent:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<нет>"
+
+
+_ABSENT = _Absent()
+
+
+class _Record(Mapping):
+    __slots__ = ()
+    _attrs: ClassVar[dict] = {}  # ключ -> имя атрибута
+    USER_KEY = "user_id"
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        data = dict(data or {})
+        kwargs = {attr: data.pop(key) for key, attr in cls._attrs.items() if key in data}
+        created = kwargs.get("created_at", _ABSENT)
+        if isinstance(created, str):
+            try:
+                kwargs["created_at"] = datetime.fromisoformat(created)
+            except ValueError:
+                pass  # битая дата остаётся строкой и считается устаревшей (см. created)
+        return cls(**kwargs, extra=data or None)
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    def copy(self) -> dict:
+        return self.to_dict()
+
+    @property
+    def created(self) -> datetime:
+        created = self.created_at
+        return created if isinstance(created, datetime) else datetime.min
+
+    def __getitem__(self, key):
+        attr = self._attrs.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            if value is _ABSENT:
+                raise KeyError(key)
+            if key == "created_at" and isinstance(value, datetime):
+                return value.isoformat()
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key, attr in self._attrs.items():
+            if getattr(self, attr) is not _ABSENT:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def _record(cls):
+    cls = dataclass(frozen=True, slots=True, eq=False, repr=False)(cls)
+    cls._attrs = {f.name.rstrip("_"): f.name for f in fields(cls) if f.name != "extra"}
+    return cls
+
+
+@_record
+class RequestRecord(_Record):
+    user_id: Any = _ABSENT
+    request_type: Any = _ABSENT
+    name: Any = _ABSENT
+    surname: Any = _ABSENT
+    static_id: Any = _ABSENT
+    reason: Any = _ABSENT
+    rank: Any = _ABSENT
+    approval: Any = _ABSENT
+    message_id: Any = _ABSENT
+    message_link: Any = _ABSENT
+    channel_id: Any = _ABSENT
+    embed: Any = _ABSENT
+    created_at: Any = _ABSENT
+    extra: Optional[dict] = None
+
+
+@_record
+class FiringRecord(_Record):
+    USER_KEY = "discord_id"
+    discord_id: Any = _ABSENT
+    full_name: Any = _ABSENT
+    rank: Any = _ABSENT
+    reason: Any = _ABSENT
+    photo_link: Any = _ABSENT
+    recovery_option: Any = _ABSENT
+    status: Any = _ABSENT
+    message_link: Any = _ABSENT
+    channel_id: Any = _ABSENT
+    created_at: Any = _ABSENT
+    extra: Optional[dict] = None
+
+
+@_record
+class PromotionRecord(_Record):
+    USER_KEY = "discord_id"
+    discord_id: Any = _ABSENT
+    full_name: Any = _ABSENT
+    new_rank: Any = _ABSENT
+    message_link: Any = _ABSENT
+    status: Any = _ABSENT
+    channel_id: Any = _ABSENT
+    created_at: Any = _ABSENT
+    extra: Optional[dict] = None
+
+
+@_record
+class WarehouseRecord(_Record):
+    user_id: Any = _ABSENT
+    items_: Any = _ABSENT
+    message_id: Any = _ABSENT
+    channel_id: Any = _ABSENT
+    edited_by: Any = _ABSENT
+    created_at: Any = _ABSENT
+    extra: Optional[dict] = None
+
+
+@_record
+class DepartmentTransferRecord(_Record):
+    message_id: Any = _ABSENT
+    user_id: Any = _ABSENT
+    source_dept: Any = _ABSENT
+    target_dept: Any = _ABSENT
+    from_academy: Any = _ABSENT
+    data: Any = _ABSENT
+    approved_source: Any = _ABSENT
+    approved_target: Any = _ABSENT
+    channel_id: Any = _ABSENT
+    created_at: Any = _ABSENT
+    extra: Optional[dict] = None
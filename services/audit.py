@@ -1,9 +1,8 @@
-import aiohttp
-import asyncio
 import logging
 import re
 
 from config import Config
+from services.audit_outbox import init_audit_outbox
 
 logger = logging.getLogger(__name__)
 
@@ -119,7 +118,7 @@ async def send_to_audit(interaction, target_member, action, rank, reason_link):
     form_data = _build_form_data(interaction, target_member, action, rank_value, reason_link)
 
     logger.info(
-        "Аудит: отправка action=%s officer=%s target=%s rank=%s",
+        "Аудит: в очередь action=%s officer=%s target=%s rank=%s",
         action,
         interaction.user.id,
         target_member.id,
@@ -127,45 +126,20 @@ async def send_to_audit(interaction, target_member, action, rank, reason_link):
     )
 
     try:
-        timeout = aiohttp.ClientTimeout(total=20)
-
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(
-                Config.AUDIT_FORM_URL,
-                data=form_data,
-                headers={"User-Agent": "Mozilla/5.0"},
-                allow_redirects=True,
-            ) as resp:
-                status = resp.status
-                logger.info("Аудит: ответ Google Forms status=%s", status)
-
-                if status in (200, 204, 302, 303):
-                    return True
-
-                try:
-                    text = await resp.text()
-                    logger.warning("Аудит: неожиданный статус=%s, ответ=%s", status, text[:200])
-                except Exception:
-                    logger.warning("Аудит: неожиданный статус=%s, тело ответа не прочитано", status)
-
-                await _safe_followup_warning(
-                    interaction,
-                    "⚠️ Не удалось отправить данные в кадровый аудит, но действие выполнено."
-                )
-                return False
-
-    except asyncio.TimeoutError:
-        logger.warning("Аудит: таймаут отправки")
-        await _safe_followup_warning(
-            interaction,
-            "⚠️ Таймаут отправки в кадровый аудит, но действие выполнено."
+        await init_audit_outbox().enqueue(
+            {
+                "url": Config.AUDIT_FORM_URL,
+                "data": form_data,
+                "action": action,
+                "officer_id": interaction.user.id,
+                "target_id": target_member.id,
+            }
         )
-        return False
-
+        return True
     except Exception as e:
-        logger.error("Аудит: ошибка отправки: %s", e, exc_info=True)
+        logger.error("Аудит: не удалось поставить отправку в очередь: %s", e, exc_info=True)
         await _safe_followup_warning(
             interaction,
             "⚠️ Ошибка отправки в кадровый аудит, но действие выполнено."
         )
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+
+import aiohttp
+
+from config import Config
+from database import (
+    audit_outbox_add,
+    audit_outbox_counts,
+    audit_outbox_due,
+    audit_outbox_mark_delivered,
+    audit_outbox_mark_retry,
+    audit_outbox_next_due,
+    audit_outbox_replay_failed,
+)
+
+logger = logging.getLogger(__name__)
+
+OK_STATUSES = (200, 204, 302, 303)
+IDLE_POLL_SEC = 60.0
+
+
+# Отправка в Google Forms отвязана от кнопок: одобрение кладёт строку в audit_outbox и сразу
+# возвращается, а эта задача доставляет строки одной сессией aiohttp, с повторами и паузой
+# между ними. Строки переживают перезапуск; после max_attempts — статус failed до /audit_replay.
+class AuditOutbox:
+    def __init__(
+        self,
+        max_attempts: int | None = None,
+        backoff_base_sec: float | None = None,
+        backoff_max_sec: float | None = None,
+        timeout_sec: float | None = None,
+    ):
+        self.max_attempts = max(1, int(max_attempts if max_attempts is not None else getattr(Config, "AUDIT_MAX_ATTEMPTS", 8)))
+        self.backoff_base = float(backoff_base_sec if backoff_base_sec is not None else getattr(Config, "AUDIT_RETRY_BASE_SEC", 30))
+        self.backoff_max = float(backoff_max_sec if backoff_max_sec is not None else getattr(Config, "AUDIT_RETRY_MAX_SEC", 3600))
+        self.timeout = float(timeout_sec if timeout_sec is not None else getattr(Config, "AUDIT_TIMEOUT_SEC", 20))
+        self._session: aiohttp.ClientSession | None = None
+        self._wakeup = asyncio.Event()
+        self._stopped = False
+        self.enqueued = 0
+        self.delivered = 0
+        self.retries = 0
+        self.failed = 0
+        self.counts = {"pending": 0, "delivered": 0, "failed": 0}
+
+    async def enqueue(self, payload: dict) -> int:
+        row_id = await audit_outbox_add(payload)
+        self.enqueued += 1
+        self.counts["pending"] += 1
+        self._wakeup.set()
+        return row_id
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": "Mozilla/5.0"},
+            )
+        return self._session
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempts - 1)))
+        return delay + random.uniform(0, delay * 0.1)
+
+    # (доставлено, текст ошибки)
+    async def _post(self, payload: dict) -> tuple[bool, str]:
+        url = payload.get("url") or Config.AUDIT_FORM_URL
+        if not url:
+            return False, "AUDIT_FORM_URL не настроен"
+        try:
+            async with self._get_session().post(url, data=payload.get("data") or {}, allow_redirects=True) as resp:
+                if resp.status in OK_STATUSES:
+                    return True, ""
+                try:
+                    text = (await resp.text())[:200]
+                except Exception:
+                    text = ""
+                return False, f"status={resp.status} {text}".strip()
+        except TimeoutError:
+            return False, "таймаут"
+        except aiohttp.ClientError as e:
+            return False, f"{type(e).__name__}: {e}"
+
+    async def deliver_due(self, limit: int = 20) -> int:
+        sent = 0
+        for row_id, payload, attempts in await audit_outbox_due(limit):
+            ok, error = await self._post(payload)
+            if ok:
+                await audit_outbox_mark_delivered(row_id)
+                self.delivered += 1
+                sent += 1
+                logger.info("Аудит: доставлено id=%s action=%s target=%s", row_id, payload.get("action"), payload.get("target_id"))
+                continue
+            attempts += 1
+            give_up = attempts >= self.max_attempts
+            await audit_outbox_mark_retry(row_id, datetime.now() + timedelta(seconds=self.backoff(attempts)), error, failed=give_up)
+            if give_up:
+                self.failed += 1
+                logger.error("Аудит: id=%s не доставлен за %s попыток (%s), нужен /audit_replay", row_id, attempts, error)
+            else:
+                self.retries += 1
+                logger.warning("Аудит: id=%s попытка %s не прошла (%s), повтор позже", row_id, attempts, error)
+        return sent
+
+    async def refresh_counts(self) -> dict:
+        self.counts = await audit_outbox_counts()
+        return self.counts
+
+    async def replay_failed(self) -> int:
+        count = await audit_outbox_replay_failed()
+        if count:
+            self._wakeup.set()
+        await self.refresh_counts()
+        return count
+
+    async def _sleep_until_due(self) -> None:
+        next_due = await audit_outbox_next_due()
+        delay = IDLE_POLL_SEC
+        if next_due is not None:
+            delay = min(IDLE_POLL_SEC, max(0.0, (next_due - datetime.now()).total_seconds()))
+        if delay <= 0:
+            return
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except TimeoutError:
+            pass
+
+    async def run(self) -> None:
+        while not self._stopped:
+            try:
+                await self.deliver_due()
+                await self.refresh_counts()
+                await self._sleep_until_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Аудит: ошибка отправителя: %s", e, exc_info=True)
+                await asyncio.sleep(5)
+
+    async def close(self) -> None:
+        self._stopped = True
+        self._wakeup.set()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.counts.get("pending", 0),
+            "failed": self.counts.get("failed", 0),
+            "delivered": self.delivered,
+            "retries": self.retries,
+            "enqueued": self.enqueued,
+        }
+
+
+outbox: AuditOutbox | None = None
+
+
+def get_audit_outbox() -> AuditOutbox | None:
+    return outbox
+
+
+def init_audit_outbox() -> AuditOutbox:
+    global outbox
+    if outbox is None:
+        outbox = AuditOutbox()
+    return outbox
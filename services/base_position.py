@@ -1,8 +1,10 @@
 import logging
-import asyncio
 import discord
 from abc import ABC, abstractmethod
 
+from services.channel_tail import get_tail_tracker
+from utils.rest_scheduler import Lane, in_lane
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,6 +13,8 @@ class BasePositionManager(ABC):
         self.bot = bot
         self.message_id = None
         self.is_updating = False
+        # запросы к API, сделанные проверками позиции (для бюджета PositionSupervisor)
+        self.rest_calls = 0
 
     @property
     @abstractmethod
@@ -33,7 +37,12 @@ class BasePositionManager(ABC):
     async def should_keep_message(self, message: discord.Message) -> bool:
         pass
 
+    # Наше сообщение по событиям шлюза всё ещё последнее — проверять через API нечего.
+    def is_in_place(self) -> bool:
+        return bool(self.message_id) and get_tail_tracker().last_id(self.channel_id) == int(self.message_id)
+
     async def find_our_message(self, channel: discord.TextChannel):
+        self.rest_calls += 1
         try:
             async for msg in channel.history(limit=50):
                 try:
@@ -53,10 +62,12 @@ class BasePositionManager(ABC):
             logger.warning("⚠️ HTTP ошибка при чтении истории канала %s: %s", self.channel_id, e)
         return None
 
-    async def ensure_position(self):
+    # True — сообщение пересоздано внизу канала.
+    @in_lane(Lane.BACKGROUND)
+    async def ensure_position(self) -> bool:
         if self.is_updating:
             logger.debug("Пропуск ensure_position: обновление уже выполняется (канал %s)", self.channel_id)
-            return
+            return False
 
 
         channel = None
@@ -71,7 +82,13 @@ class BasePositionManager(ABC):
             channel = self.bot.get_channel(self.channel_id)
         if not channel:
             logger.error("Канал %s не найден", self.channel_id)
-            return
+            return False
+
+        tracker = get_tail_tracker()
+        tracker.watch(channel.id)
+        if self.is_in_place():
+            tracker.hits += 1
+            return False
 
         try:
             self.is_updating = True
@@ -80,6 +97,7 @@ class BasePositionManager(ABC):
             current_message = None
             if self.message_id:
                 try:
+                    self.rest_calls += 1
                     current_message = await channel.fetch_message(int(self.message_id))
 
                     if not await self.should_keep_message(current_message):
@@ -96,10 +114,10 @@ class BasePositionManager(ABC):
                     self.message_id = None
                 except discord.Forbidden:
                     logger.warning("Нет прав на fetch_message в канале %s", self.channel_id)
-                    return
+                    return False
                 except discord.HTTPException as e:
                     logger.warning("HTTP ошибка fetch_message (%s) в канале %s: %s", self.message_id, self.channel_id, e)
-                    return
+                    return False
                 except Exception as e:
                     logger.error(
                         "Ошибка при получении сообщения %s в канале %s: %s",
@@ -117,17 +135,16 @@ class BasePositionManager(ABC):
                     self.message_id = current_message.id
 
 
-            last_message = None
             try:
-                async for msg in channel.history(limit=1):
-                    last_message = msg
-                    break
+                if tracker.last_id(channel.id) is None:
+                    self.rest_calls += 1
+                last_message_id = await tracker.fetch_last_id(channel)
             except discord.Forbidden:
                 logger.warning("⚠️ Нет прав на чтение последнего сообщения в канале %s", self.channel_id)
-                return
+                return False
             except discord.HTTPException as e:
                 logger.warning("⚠️ HTTP ошибка при получении последнего сообщения в канале %s: %s", self.channel_id, e)
-                return
+                return False
 
 
             need_update = False
@@ -135,7 +152,7 @@ class BasePositionManager(ABC):
             if not current_message:
                 need_update = True
                 logger.info("Сообщение не найдено в канале %s - создаем", self.channel_id)
-            elif last_message and current_message.id != last_message.id:
+            elif last_message_id and current_message.id != last_message_id:
                 need_update = True
                 logger.info("Сообщение не внизу канала %s - перемещаем", self.channel_id)
             elif len(current_message.components) == 0:
@@ -146,42 +163,48 @@ class BasePositionManager(ABC):
 
                 if current_message:
                     try:
+                        self.rest_calls += 1
                         await current_message.delete()
                     except discord.NotFound:
                         logger.info("Старое сообщение уже удалено (канал %s)", self.channel_id)
                     except discord.Forbidden:
                         logger.warning("Нет прав на удаление старого сообщения в канале %s", self.channel_id)
-                        return
+                        return False
                     except discord.HTTPException as e:
                         logger.warning("HTTP ошибка при удалении старого сообщения в канале %s: %s", self.channel_id, e)
-                        return
+                        return False
 
 
                 embed = await self.get_embed()
                 view = await self.get_view()
 
                 try:
+                    self.rest_calls += 1
                     new_message = await channel.send(embed=embed, view=view)
                 except discord.Forbidden:
                     logger.warning("Нет прав на отправку сообщения в канале %s", self.channel_id)
-                    return
+                    return False
                 except discord.HTTPException as e:
                     logger.warning("HTTP ошибка при отправке сообщения в канале %s: %s", self.channel_id, e)
-                    return
+                    return False
 
                 self.message_id = new_message.id
+                tracker.observe(channel.id, new_message.id)
 
 
                 await self._remove_duplicates(channel)
 
                 logger.info("🔄 Сообщение обновлено в канале %s (msg_id=%s)", self.channel_id, self.message_id)
+                return True
 
         except Exception as e:
             logger.error("Ошибка в ensure_position для канала %s: %s", self.channel_id, e, exc_info=True)
         finally:
             self.is_updating = False
+        return False
 
     async def _remove_duplicates(self, channel: discord.TextChannel):
+        self.rest_calls += 1
         try:
             async for msg in channel.history(limit=50):
                 try:
@@ -190,6 +213,7 @@ class BasePositionManager(ABC):
                         and msg.id != self.message_id
                         and await self.should_keep_message(msg)
                     ):
+                        self.rest_calls += 1
                         await msg.delete()
                         logger.info("🧹 Удалён дубликат сообщения %s в канале %s", msg.id, self.channel_id)
                 except discord.NotFound:
@@ -207,21 +231,3 @@ class BasePositionManager(ABC):
             logger.warning("⚠️ HTTP ошибка при чтении истории для удаления дубликатов (канал %s): %s", self.channel_id, e)
         except Exception as e:
             logger.error("Ошибка при удалении дубликатов в канале %s: %s", self.channel_id, e, exc_info=True)
-
-    async def start_checking(self):
-        await self.bot.wait_until_ready()
-
-
-        await self.ensure_position()
-
-
-        while not self.bot.is_closed():
-            try:
-                await asyncio.sleep(self.check_interval)
-                await self.ensure_position()
-            except asyncio.CancelledError:
-                logger.info("Фоновая проверка позиции остановлена (канал %s)", self.channel_id)
-                raise
-            except Exception as e:
-                logger.error("Ошибка в цикле start_checking (канал %s): %s", self.channel_id, e, exc_info=True)
-                await asyncio.sleep(5)
\ No newline at end of file
@@ -1,46 +1,134 @@
-import asyncio
+import logging
+import time
 from typing import Optional, List
+
 import discord
 
-class RoleCache:
+logger = logging.getLogger(__name__)
+
+# Сколько помнить «такой роли/канала нет». Создание роли/канала снимает отметку сразу,
+# срок — страховка на случай пропущенного события (например, при переподключении).
+NEGATIVE_TTL_SEC = 300.0
+
+
+# Записи кэшей живут до события шлюза: on_guild_role_* / on_guild_channel_* обновляют или
+# выбрасывают их (events.py). Промахи тоже кэшируются, поэтому несуществующий id из конфига
+# не ищется заново на каждый клик. Всё синхронно — под капотом только словари.
+class _EventCache:
+    def __init__(self):
+        self._items: dict = {}
+        self._missing: dict = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key, fetch):
+        item = self._items.get(key)
+        if item is not None:
+            self.hits += 1
+            return item
+        expires = self._missing.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                self.negative_hits += 1
+                return None
+            del self._missing[key]
+
+        self.misses += 1
+        item, known = fetch()
+        if item is not None:
+            self._items[key] = item
+        elif known:
+            self._missing[key] = time.monotonic() + NEGATIVE_TTL_SEC
+        return item
+
+    def _put(self, key, item) -> None:
+        self._items[key] = item
+        self._missing.pop(key, None)
+
+    def _evict(self, key) -> None:
+        if self._items.pop(key, None) is not None:
+            self.evictions += 1
+        self._missing.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size": len(self._items),
+            "missing": len(self._missing),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.negative_hits) * 100 / lookups, 1) if lookups else 0.0,
+        }
+
+
+class RoleCache(_EventCache):
     def __init__(self, bot):
+        super().__init__()
         self.bot = bot
-        self._roles = {}
-        self._lock = asyncio.Lock()
 
-    async def get_role(self, guild_id: int, role_id: int) -> Optional[discord.Role]:
-        key = (guild_id, role_id)
-        if key in self._roles:
-            return self._roles[key]
-        guild = self.bot.get_guild(guild_id)
-        if not guild:
-            return None
-        role = guild.get_role(role_id)
-        if role:
-            self._roles[key] = role
-        return role
+    def get_role(self, guild_id: int, role_id: int) -> Optional[discord.Role]:
+        def fetch():
+            guild = self.bot.get_guild(guild_id)
+            if not guild:
+                # гильдия ещё не загружена — промах не запоминаем
+                return None, False
+            return guild.get_role(role_id), True
+
+        return self._lookup((guild_id, role_id), fetch)
 
-    async def get_many_roles(self, guild_id: int, role_ids: List[int]) -> List[discord.Role]:
-        tasks = [self.get_role(guild_id, rid) for rid in role_ids]
-        return await asyncio.gather(*tasks)
+    def get_many_roles(self, guild_id: int, role_ids: List[int]) -> List[Optional[discord.Role]]:
+        return [self.get_role(guild_id, rid) for rid in role_ids]
 
-    async def refresh_guild(self, guild_id: int):
+    def refresh_guild(self, guild_id: int) -> int:
         guild = self.bot.get_guild(guild_id)
         if not guild:
-            return
-        async with self._lock:
-            for role in guild.roles:
-                self._roles[(guild_id, role.id)] = role
+            return 0
+        for key in [k for k in self._items if k[0] == guild_id]:
+            del self._items[key]
+        for key in [k for k in self._missing if k[0] == guild_id]:
+            del self._missing[key]
+        for role in guild.roles:
+            self._items[(guild_id, role.id)] = role
+        return len(guild.roles)
+
+    def on_role_upsert(self, role: discord.Role) -> None:
+        self._put((role.guild.id, role.id), role)
 
-class ChannelCache:
+    def on_role_delete(self, role: discord.Role) -> None:
+        self._evict((role.guild.id, role.id))
+
+
+class ChannelCache(_EventCache):
     def __init__(self, bot):
+        super().__init__()
         self.bot = bot
-        self._channels = {}
 
     def get_channel(self, channel_id: int):
-        if channel_id in self._channels:
-            return self._channels[channel_id]
-        ch = self.bot.get_channel(channel_id)
-        if ch:
-            self._channels[channel_id] = ch
-        return ch
\ No newline at end of file
+        def fetch():
+            if not self.bot.is_ready():
+                return None, False
+            return self.bot.get_channel(channel_id), True
+
+        return self._lookup(channel_id, fetch)
+
+    def refresh_guild(self, guild_id: int) -> int:
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
+            return 0
+        stale = {cid for cid, ch in self._items.items() if getattr(getattr(ch, "guild", None), "id", None) == guild_id}
+        for cid in stale:
+            del self._items[cid]
+        self._missing.clear()
+        for ch in guild.channels:
+            self._items[ch.id] = ch
+        return len(guild.channels)
+
+    def on_channel_upsert(self, channel: discord.abc.GuildChannel) -> None:
+        self._put(channel.id, channel)
+
+    def on_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        self._evict(channel.id)
@@ -0,0 +1,88 @@
+import logging
+import re
+
+from config import Config
+from database import list_requests_without_channel, set_request_channels
+from services.message_validator import BulkMessageValidator
+
+logger = logging.getLogger(__name__)
+
+_MESSAGE_LINK_RE = re.compile(r"/channels/(?:\d+|@me)/(\d+)/(\d+)")
+
+
+def _channel_from_link(data: dict, message_id: int) -> int:
+    link = str((data or {}).get("message_link") or "")
+    m = _MESSAGE_LINK_RE.search(link)
+    if not m or int(m.group(2)) != int(message_id):
+        return 0
+    return int(m.group(1))
+
+
+def _fixed_channels() -> dict[str, int]:
+    return {
+        "requests": getattr(Config, "REQUEST_CHANNEL_ID", 0),
+        "firing_requests": getattr(Config, "FIRING_CHANNEL_ID", 0),
+        "warehouse_requests": getattr(Config, "WAREHOUSE_REQUEST_CHANNEL_ID", 0),
+    }
+
+
+def _search_channel_ids() -> dict[str, list[int]]:
+    return {
+        "promotion_requests": [int(c) for c in (getattr(Config, "PROMOTION_CHANNELS", {}) or {})],
+        "department_transfer_requests": [
+            c for c in (
+                getattr(Config, "CHANNEL_APPLY_GROM", 0),
+                getattr(Config, "CHANNEL_APPLY_PPS", 0),
+                getattr(Config, "CHANNEL_APPLY_OSB", 0),
+                getattr(Config, "CHANNEL_APPLY_ORLS", 0),
+            ) if c
+        ],
+    }
+
+
+# Разовое заполнение channel_id у записей, сохранённых до появления колонки. Повторный запуск — no-op.
+async def backfill_request_channels(bot) -> int:
+    fixed = _fixed_channels()
+    search = _search_channel_ids()
+    total = 0
+
+    for table in ("requests", "firing_requests", "promotion_requests", "warehouse_requests", "department_transfer_requests"):
+        rows = await list_requests_without_channel(table)
+        if not rows:
+            continue
+
+        found: dict[int, int] = {}
+        unresolved: list[int] = []
+        uncertain: set[int] = set()
+        for mid, data in rows.items():
+            cid = _channel_from_link(data, mid) or fixed.get(table, 0)
+            if cid:
+                found[mid] = cid
+            else:
+                unresolved.append(mid)
+
+        if unresolved and search.get(table):
+            channels = [ch for ch in (bot.get_channel(c) for c in search[table]) if ch]
+            validator = BulkMessageValidator()
+            for ch in channels:
+                await validator.prepare(ch, unresolved)
+            for mid in unresolved:
+                ch, certain = await validator.locate(channels, mid)
+                if ch is not None:
+                    found[mid] = ch.id
+                elif not certain:
+                    uncertain.add(mid)
+
+        resolved = len(found)
+        # 0 = канал не найден; такие записи больше не перебираем, их уберёт проверка осиротевших.
+        for mid in rows:
+            if mid not in uncertain:
+                found.setdefault(mid, 0)
+        await set_request_channels(table, found)
+        total += resolved
+        logger.info(
+            "🗄️ channel_id заполнен: %s — %s из %s (не найдено: %s)",
+            table, resolved, len(rows), len(rows) - resolved,
+        )
+
+    return total
@@ -0,0 +1,111 @@
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Сколько последних id держим на канал: хватает, чтобы после удаления последнего сообщения
+# знать предыдущее без запроса к API.
+TAIL_DEPTH = 20
+
+
+# Последнее сообщение в наблюдаемых каналах по событиям шлюза (on_message / on_raw_message_delete).
+# Менеджеры позиций спрашивают его вместо channel.history(limit=1); пока в канале тихо, запросов к API нет.
+class ChannelTailTracker:
+    def __init__(self, depth: int = TAIL_DEPTH):
+        self.depth = depth
+        self._watched: set[int] = set()
+        self._tails: Dict[int, List[int]] = {}
+        self._empty: set[int] = set()
+        self.hits = 0
+        self.misses = 0
+        self.rest_calls = 0
+
+    def watch(self, channel_id: int) -> None:
+        if channel_id:
+            self._watched.add(int(channel_id))
+
+    def is_watched(self, channel_id: int) -> bool:
+        return int(channel_id) in self._watched
+
+    # None — неизвестно (нужно спросить API), 0 — канал пуст.
+    def last_id(self, channel_id: int) -> Optional[int]:
+        channel_id = int(channel_id)
+        tail = self._tails.get(channel_id)
+        if tail:
+            return tail[-1]
+        if channel_id in self._empty:
+            return 0
+        return None
+
+    def observe(self, channel_id: int, message_id: int) -> None:
+        channel_id = int(channel_id)
+        if channel_id not in self._watched:
+            return
+        message_id = int(message_id)
+        self._empty.discard(channel_id)
+        tail = self._tails.setdefault(channel_id, [])
+        if message_id in tail:
+            return
+        if tail and message_id < tail[0] and len(tail) >= self.depth:
+            return
+        tail.append(message_id)
+        tail.sort()
+        del tail[:-self.depth]
+
+    def forget(self, channel_id: int, message_ids: Iterable[int]) -> None:
+        tail = self._tails.get(int(channel_id))
+        if not tail:
+            return
+        removed = {int(m) for m in message_ids}
+        tail[:] = [m for m in tail if m not in removed]
+        # хвост опустел — что было до него, мы не знаем, спросим API при следующей проверке
+        if not tail:
+            self._tails.pop(int(channel_id), None)
+
+    def on_message(self, message: discord.Message) -> None:
+        channel = getattr(message, "channel", None)
+        if channel is not None:
+            self.observe(channel.id, message.id)
+
+    def on_raw_message_delete(self, payload) -> None:
+        self.forget(payload.channel_id, [payload.message_id])
+
+    def on_raw_bulk_message_delete(self, payload) -> None:
+        self.forget(payload.channel_id, payload.message_ids)
+
+    # После переподключения без RESUME события могли потеряться — хвосты больше не достоверны.
+    def reset(self) -> None:
+        self._tails.clear()
+        self._empty.clear()
+
+    async def fetch_last_id(self, channel) -> int:
+        self.watch(channel.id)
+        known = self.last_id(channel.id)
+        if known is not None:
+            self.hits += 1
+            return known
+        self.misses += 1
+        self.rest_calls += 1
+        async for msg in channel.history(limit=1):
+            self.observe(channel.id, msg.id)
+            return self.last_id(channel.id) or msg.id
+        self._empty.add(int(channel.id))
+        return 0
+
+    def stats(self) -> dict:
+        return {
+            "watched": len(self._watched),
+            "known": len(self._tails) + len(self._empty),
+            "hits": self.hits,
+            "misses": self.misses,
+            "rest_calls": self.rest_calls,
+        }
+
+
+tail_tracker = ChannelTailTracker()
+
+
+def get_tail_tracker() -> ChannelTailTracker:
+    return tail_tracker
@@ -1,91 +1,77 @@
 import logging
 import asyncio
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 import state
 from config import Config
-from database import cleanup_old_requests_db, cleanup_old_orls_drafts, cleanup_old_osb_drafts, cleanup_old_grom_drafts, cleanup_old_pps_drafts
+from services.expiry import get_expiry
+from services.worker_queue import get_worker
+from database import (
+    cleanup_delivered_audit,
+    cleanup_old_promotion_drafts,
+    cleanup_old_requests_db,
+    delete_request,
+    webhook_seen_prune,
+)
 
 logger = logging.getLogger(__name__)
 
+# хранилище в state -> (таблица БД, пространство имён в планировщике сроков)
+REQUEST_STORES = {
+    "active_requests": ("requests", "заявки"),
+    "active_firing_requests": ("firing_requests", "увольнения"),
+    "active_promotion_requests": ("promotion_requests", "повышения"),
+    "warehouse_requests": ("warehouse_requests", "склад"),
+    "active_department_transfers": ("department_transfer_requests", "переводы отделов"),
+}
+
+
+def _delete_expired_rows(table: str):
+    def on_expire(message_ids: list) -> None:
+        # удаления уходят в write-behind журнал и пишутся одной транзакцией
+        worker = get_worker()
+        for message_id in message_ids:
+            worker.submit_fire(delete_request, table, message_id)
+    return on_expire
+
 
 class CleanupManager:
 
     def __init__(self, bot):
         self.bot = bot
         self.check_interval = 3600  # раз в час
+        self.bind_request_stores()
 
-    def _cleanup_store_by_date(self, store: dict, name: str, cutoff: datetime) -> int:
-        if not store:
-            return 0
-
-        to_delete = []
-        for mid, data in list(store.items()):
-            created = (data or {}).get("created_at")
-            if not created:
-                to_delete.append(mid)
-                continue
-
-            try:
-                if datetime.fromisoformat(created) < cutoff:
-                    to_delete.append(mid)
-            except (ValueError, TypeError):
-                to_delete.append(mid)
-
-        for mid in to_delete:
-            store.pop(mid, None)
-
-        if to_delete:
-            logger.info("🧹 Очищено %s старых записей: %s", len(to_delete), name)
-
-        return len(to_delete)
+    def bind_request_stores(self) -> None:
+        # заявки в памяти снимает планировщик сроков по мере истечения, а не почасовой перебор
+        ttl = timedelta(days=Config.REQUEST_EXPIRY_DAYS)
+        scheduler = get_expiry()
+        for attr, (table, namespace) in REQUEST_STORES.items():
+            store = getattr(state, attr, None)
+            if store is not None and hasattr(store, "expire_after"):
+                store.expire_after(scheduler, namespace, ttl, _delete_expired_rows(table))
 
     async def cleanup(self):
         try:
-            cutoff = datetime.now() - timedelta(days=Config.REQUEST_EXPIRY_DAYS)
-
-
-            self._cleanup_store_by_date(getattr(state, "active_requests", {}), "заявки", cutoff)
-            self._cleanup_store_by_date(getattr(state, "active_firing_requests", {}), "увольнения", cutoff)
-            self._cleanup_store_by_date(getattr(state, "active_promotion_requests", {}), "повышения", cutoff)
-            self._cleanup_store_by_date(getattr(state, "warehouse_requests", {}), "склад", cutoff)
-            self._cleanup_store_by_date(getattr(state, "active_department_transfers", {}), "переводы отделов", cutoff)
-
-
+            # строки, которых нет в памяти (не восстановились при запуске); по индексу created_at
             await cleanup_old_requests_db(Config.REQUEST_EXPIRY_DAYS)
 
 
-            orls_days = getattr(Config, "ORLS_DRAFT_EXPIRY_DAYS", 14)
-            orls_deleted = await cleanup_old_orls_drafts(orls_days)
-            if orls_deleted:
-                logger.info("🧹 Удалено черновиков ОРЛС (старше %s дней): %s", orls_days, orls_deleted)
-
-
-            osb_days = getattr(Config, "OSB_DRAFT_EXPIRY_DAYS", 14)
-            osb_deleted = await cleanup_old_osb_drafts(osb_days)
-            if osb_deleted:
-                logger.info("🧹 Удалено черновиков ОСБ (старше %s дней): %s", osb_days, osb_deleted)
-
-
-            grom_days = getattr(Config, "GROM_DRAFT_EXPIRY_DAYS", 14)
-            grom_deleted = await cleanup_old_grom_drafts(grom_days)
-            if grom_deleted:
-                logger.info("🧹 Удалено черновиков ГРОМ (старше %s дней): %s", grom_days, grom_deleted)
-
-
-            pps_days = getattr(Config, "PPS_DRAFT_EXPIRY_DAYS", 14)
-            pps_deleted = await cleanup_old_pps_drafts(pps_days)
-            if pps_deleted:
-                logger.info("🧹 Удалено черновиков ППС (старше %s дней): %s", pps_days, pps_deleted)
+            draft_days = {
+                "orls": getattr(Config, "ORLS_DRAFT_EXPIRY_DAYS", 14),
+                "osb": getattr(Config, "OSB_DRAFT_EXPIRY_DAYS", 14),
+                "grom": getattr(Config, "GROM_DRAFT_EXPIRY_DAYS", 14),
+                "pps": getattr(Config, "PPS_DRAFT_EXPIRY_DAYS", 14),
+            }
+            drafts_deleted = await cleanup_old_promotion_drafts(draft_days)
+            if drafts_deleted:
+                logger.info("🧹 Удалено устаревших черновиков рапортов: %s", drafts_deleted)
 
 
-            try:
-                from services.warehouse_session import WarehouseSession
-                purged = WarehouseSession.purge_expired(max_age_hours=24)
-                if purged:
-                    logger.info("🧹 Очищено просроченных сессий склада: %s", purged)
-            except Exception as e:
-                logger.warning("Очистка сессий склада: %s", e)
+            audit_deleted = await cleanup_delivered_audit(getattr(Config, "AUDIT_OUTBOX_KEEP_DAYS", 7))
+            if audit_deleted:
+                logger.info("🧹 Удалено доставленных записей аудита: %s", audit_deleted)
+            await webhook_seen_prune(getattr(Config, "WEBHOOK_DEDUPE_KEEP", 1000))
 
             logger.info("🧹 Периодическая очистка завершена")
 
@@ -2,13 +2,16 @@ import asyncio
 import discord
 from config import Config
 import state
-from database import (
-    load_all_requests,
-    load_all_firing_requests,
-    load_all_promotion_requests,
-    load_all_warehouse_requests,
-    load_all_department_transfer_requests,
-)
+from database import count_requests
+from services.audit_outbox import get_audit_outbox
+from services.channel_tail import get_tail_tracker
+from services.expiry import get_expiry
+from services.ingest_server import get_ingest_server
+from services.member_resolver import get_member_resolver
+from services.position_supervisor import get_position_supervisor
+from services.webhook_queue import get_webhook_queue
+from utils.rate_limiter import get_mutation_stats
+from utils.rest_scheduler import LANE_TITLES, Lane, get_rest_scheduler
 
 try:
     from services.action_locks import locks_count
@@ -76,17 +79,12 @@ def _state_counts():
 
 
 async def _db_counts():
-    req = await load_all_requests()
-    fir = await load_all_firing_requests()
-    pro = await load_all_promotion_requests()
-    wh = await load_all_warehouse_requests()
-    dept = await load_all_department_transfer_requests()
     return {
-        "Заявки": len(req),
-        "Увольнения": len(fir),
-        "Повышения": len(pro),
-        "Склад": len(wh),
-        "Переводы": len(dept),
+        "Заявки": await count_requests("requests"),
+        "Увольнения": await count_requests("firing_requests"),
+        "Повышения": await count_requests("promotion_requests"),
+        "Склад": await count_requests("warehouse_requests"),
+        "Переводы": await count_requests("department_transfer_requests"),
     }
 
 
@@ -107,6 +105,28 @@ def _truncate_lines(lines: list[str], limit: int = 1000) -> str:
     return "\n".join(out) if out else "—"
 
 
+def _ts(value: float) -> str:
+    return f"<t:{int(value)}:R>" if value else "—"
+
+
+def _position_lines() -> list[str]:
+    supervisor = get_position_supervisor()
+    if supervisor is None:
+        return ["⚠️ планировщик позиций не запущен"]
+    st = supervisor.stats()
+    ds = st["debounce"]
+    lines = [
+        f"Запросов к API за минуту: **{st['spent']}/{st['budget']}**, отложено по бюджету: **{st['deferred']}**",
+        (
+            f"Переносы после тишины ({ds['quiet_sec']:.0f} с): ждут **{ds['pending']}**, выполнено **{ds['runs']}**, "
+            f"отложено новыми сообщениями **{ds['rescheduled']}**"
+        ),
+    ]
+    for t in supervisor.snapshot():
+        lines.append(f"• {t.name} (<#{t.channel_id}>): проверка {_ts(t.last_check)}, перенос {_ts(t.last_move)}")
+    return lines
+
+
 def _service_status_lines() -> list[str]:
     lines = []
 
@@ -136,6 +156,115 @@ def _service_status_lines() -> list[str]:
         lines.append("Фоновые задачи: ⚠️ state.background_tasks не инициализирован")
 
 
+    try:
+        from services.write_journal import get_journal
+        journal = get_journal()
+        if journal is not None:
+            js = journal.stats()
+            lines.append(
+                f"Журнал записей БД: в очереди **{js['pending']}**, сбросов **{js['flushes']}**, "
+                f"пакет ср./макс. **{js['avg_batch']}/{js['max_batch']}**, "
+                f"сброс ср./макс. **{js['avg_flush_ms']}/{js['max_flush_ms']} мс**, склеено **{js['coalesced']}**"
+            )
+    except Exception:
+        lines.append("Журнал записей БД: ❌ ошибка чтения")
+
+    for title, cache in (("Кэш ролей", getattr(state, "role_cache", None)), ("Кэш каналов", getattr(state, "channel_cache", None))):
+        if cache is None:
+            continue
+        cs = cache.stats()
+        lines.append(
+            f"{title}: записей **{cs['size']}** (нет: {cs['missing']}), попаданий **{cs['hits']}** + **{cs['negative_hits']}** отриц., "
+            f"промахов **{cs['misses']}**, вытеснено **{cs['evictions']}** ({cs['hit_rate']}%)"
+        )
+
+    ms = get_member_resolver().stats()
+    lines.append(
+        f"Участники: из кэша гильдии **{ms['gateway_hits']}**, из кэша запросов **{ms['cache_hits']}**, "
+        f"fetch_member **{ms['fetches']}**, общих ожиданий **{ms['shared']}**"
+    )
+    lines.append(
+        f"Проверка ролей после одобрения: по кэшу **{ms['verified_cached']}**, по событию **{ms['verified_event']}**, "
+        f"запросом (событие не пришло) **{ms['verify_fetches']}**"
+    )
+
+    drafts = getattr(state, "promotion_draft_reports", None) or {}
+    ds = [c.stats() for c in drafts.values() if hasattr(c, "stats")]
+    if ds:
+        lines.append(
+            f"Черновики рапортов: в памяти **{sum(d['size'] for d in ds)}** (лимит {ds[0]['max']} на отдел), "
+            f"попаданий **{sum(d['hits'] for d in ds)}**, из БД **{sum(d['misses'] for d in ds)}**, "
+            f"вытеснено **{sum(d['evictions'] for d in ds)}**"
+        )
+
+    stores = [getattr(state, name, None) for name in ("active_requests", "active_firing_requests", "active_promotion_requests", "warehouse_requests", "active_department_transfers")]
+    ls = [st.lazy_stats() for st in stores if hasattr(st, "lazy_stats")]
+    if ls and any(x["cold"] or x["hydrations"] for x in ls):
+        lines.append(
+            f"Заявки (ленивая загрузка): без данных **{sum(x['cold'] for x in ls)}**, подгружено из БД **{sum(x['hydrations'] for x in ls)}**, "
+            f"вытеснено обратно **{sum(x['demotions'] for x in ls)}**"
+        )
+
+    es = get_expiry().stats()
+    next_in = f"{es['next_in_sec']} с" if es['next_in_sec'] is not None else "—"
+    expired = ", ".join(f"{ns} {n}" for ns, n in es["expired"].items() if n) or "—"
+    lines.append(f"Сроки: ждут **{es['scheduled']}**, ближайший через **{next_in}**, снято: {expired}")
+
+    ts = get_tail_tracker().stats()
+    lines.append(
+        f"Хвосты каналов: наблюдается **{ts['watched']}**, из событий **{ts['hits']}**, "
+        f"запросов history **{ts['rest_calls']}**"
+    )
+
+    outbox = get_audit_outbox()
+    if outbox is not None:
+        st = outbox.stats()
+        lines.append(
+            f"Очередь аудита: ждут **{st['pending']}**, не доставлено **{st['failed']}** (/audit_replay), "
+            f"доставлено **{st['delivered']}**, повторов **{st['retries']}**"
+        )
+
+    wq = get_webhook_queue()
+    if wq is not None:
+        st = wq.stats()
+        lines.append(
+            f"Очередь webhook: в очереди **{st['backlog']}** (макс. {st['max_backlog']}), обработано **{st['processed']}**, "
+            f"повторов **{st['duplicates']}**, ожидание/обработка ср. **{st['avg_wait_ms']}/{st['avg_proc_ms']} мс**"
+        )
+
+    ingest = get_ingest_server()
+    if ingest is not None:
+        st = ingest.stats()
+        lines.append(
+            f"Приём рапортов (HTTP): принято **{st['accepted']}**, отклонено **{st['rejected']}**, ошибок **{st['failed']}**, повторов **{st['replays']}**"
+        )
+
+    rest = get_rest_scheduler()
+    if rest is not None:
+        rs = rest.stats()
+        lines.append(f"Очередь API: в работе **{rs['in_flight']}**, ждут **{rs['waiting']}**")
+        for lane in Lane:
+            ls = rs["lanes"][lane.name.lower()]
+            if ls["requests"]:
+                lines.append(
+                    f"• {LANE_TITLES[lane]}: запросов **{ls['requests']}**, ждут **{ls['waiting']}**, "
+                    f"ожидание ср./макс. **{ls['avg_wait_ms']}/{ls['max_wait_ms']} мс**"
+                )
+
+    ms = get_mutation_stats()
+    if ms["mutations"]:
+        lines.append(
+            f"Изменения участников: **{ms['mutations']}**, запросов **{ms['api_calls']}**, "
+            f"сэкономлено **{ms['calls_saved']}**, откатов на по-ролевой режим **{ms['fallbacks']}**"
+        )
+
+    routers = getattr(state, "component_routers", None) or []
+    if routers:
+        lines.append(
+            f"Кнопки заявок: маршрутизаторов **{len(routers)}**, нажатий **{sum(r.dispatched for r in routers)}**, "
+            f"заявка не найдена **{sum(r.missing for r in routers)}**"
+        )
+
     try:
         lc = locks_count()
         if lc >= 0:
@@ -220,6 +349,7 @@ async def build_diag_embed(bot: discord.Client) -> discord.Embed:
         _check_channel(guild, getattr(Config, "CHANNEL_CADRE_LOG", 0), "Лог кадровых"),
     ]
     embed.add_field(name="Ключевые каналы", value=_truncate_lines(channel_lines), inline=False)
+    embed.add_field(name="Позиции сообщений", value=_truncate_lines(_position_lines()), inline=False)
 
 
     role_lines = [
@@ -260,5 +390,5 @@ async def build_diag_embed(bot: discord.Client) -> discord.Embed:
         promo_lines.append("⚠️ PROMOTION_CHANNELS пустой")
     embed.add_field(name="Повышения (канал → роли)", value=_truncate_lines(promo_lines), inline=False)
 
-    embed.set_footer(text="/diag | /diag_clean_orphans | /clear_firing")
+    embed.set_footer(text="/diag | /diag_clean_orphans | /clear_firing | /audit_replay")
     return embed
\ No newline at end of file
@@ -0,0 +1,129 @@
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+from datetime import datetime
+from typing import Any, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_SLEEP_SEC = 3600.0
+
+
+# Один планировщик сроков для всего, что живёт ограниченное время: заявки в памяти, сессии
+# и кулдауны склада. Хранилище регистрирует обработчик для своего пространства имён и ставит
+# каждую запись со сроком; куча по сроку отдаёт только наступившие записи, пачкой на
+# пространство имён. Перенос срока или отмена не трогают кучу: старая запись пропускается,
+# когда до неё дойдёт очередь.
+class ExpiryScheduler:
+    def __init__(self):
+        self._heap: list[tuple[datetime, int, str, Hashable]] = []
+        self._deadlines: dict[tuple[str, Hashable], datetime] = {}
+        self._handlers: dict[str, Callable[[list], Any]] = {}
+        self._seq = itertools.count()
+        self._wakeup: asyncio.Event | None = None
+        self.expired: dict[str, int] = {}
+        self.runs = 0
+
+    def register(self, namespace: str, on_expire: Callable[[list], Any]) -> None:
+        self._handlers[namespace] = on_expire
+        self.expired.setdefault(namespace, 0)
+
+    def schedule(self, namespace: str, key: Hashable, deadline: datetime) -> None:
+        # голова кучи может быть отменённой записью — сравниваем с настоящим ближайшим сроком
+        earliest = self.next_deadline()
+        self._deadlines[(namespace, key)] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), namespace, key))
+        if self._wakeup is not None and (earliest is None or deadline < earliest):
+            self._wakeup.set()
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._compact()
+
+    def cancel(self, namespace: str, key: Hashable) -> None:
+        self._deadlines.pop((namespace, key), None)
+
+    def cancel_all(self, namespace: str) -> None:
+        for item in [item for item in self._deadlines if item[0] == namespace]:
+            del self._deadlines[item]
+
+    def deadline(self, namespace: str, key: Hashable) -> Optional[datetime]:
+        return self._deadlines.get((namespace, key))
+
+    def _compact(self) -> None:
+        self._heap = [(d, next(self._seq), ns, key) for (ns, key), d in self._deadlines.items()]
+        heapq.heapify(self._heap)
+
+    def _drop_stale_head(self) -> None:
+        while self._heap:
+            deadline, _, ns, key = self._heap[0]
+            if self._deadlines.get((ns, key)) == deadline:
+                return
+            heapq.heappop(self._heap)
+
+    def next_deadline(self) -> Optional[datetime]:
+        self._drop_stale_head()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime | None = None) -> dict[str, list]:
+        now = now or datetime.now()
+        due: dict[str, list] = {}
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, ns, key = heapq.heappop(self._heap)
+            if self._deadlines.get((ns, key)) != deadline:
+                continue
+            del self._deadlines[(ns, key)]
+            due.setdefault(ns, []).append(key)
+        return due
+
+    async def run_due(self, now: datetime | None = None) -> int:
+        total = 0
+        for ns, keys in self.pop_due(now).items():
+            handler = self._handlers.get(ns)
+            if handler is None:
+                continue
+            try:
+                result = handler(keys)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error("Сроки: ошибка обработчика %s (%s записей): %s", ns, len(keys), e, exc_info=True)
+                continue
+            self.expired[ns] = self.expired.get(ns, 0) + len(keys)
+            total += len(keys)
+            logger.info("🧹 Истёк срок: %s — %s", ns, len(keys))
+        self.runs += 1
+        return total
+
+    async def run(self) -> None:
+        self._wakeup = asyncio.Event()
+        while True:
+            await self.run_due()
+            next_at = self.next_deadline()
+            delay = MAX_SLEEP_SEC
+            if next_at is not None:
+                delay = min(MAX_SLEEP_SEC, max(0.0, (next_at - datetime.now()).total_seconds()))
+            if delay <= 0:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        next_at = self.next_deadline()
+        return {
+            "scheduled": len(self._deadlines),
+            "next_in_sec": max(0, int((next_at - datetime.now()).total_seconds())) if next_at else None,
+            "expired": dict(self.expired),
+            "runs": self.runs,
+        }
+
+
+expiry = ExpiryScheduler()
+
+
+def get_expiry() -> ExpiryScheduler:
+    return expiry
+
@@ -4,25 +4,23 @@ import discord
 
 import state
 from config import Config
+from services.message_validator import BulkMessageValidator, channels_for
 from database import (
-    load_all_requests,
-    load_all_firing_requests,
-    load_all_promotion_requests,
-    load_all_warehouse_requests,
-    load_all_department_transfer_requests,
+    count_requests,
+    list_message_ids,
+    list_message_channels,
     delete_request,
     delete_department_transfer_request,
 )
+from utils.rest_scheduler import Lane, in_lane
 
 logger = logging.getLogger(__name__)
 
 
 def log_memory_state():
     try:
-        orls_d = len(getattr(state, "orls_draft_reports", {}) or {})
-        osb_d = len(getattr(state, "osb_draft_reports", {}) or {})
-        grom_d = len(getattr(state, "grom_draft_reports", {}) or {})
-        pps_d = len(getattr(state, "pps_draft_reports", {}) or {})
+        drafts = getattr(state, "promotion_draft_reports", {}) or {}
+        orls_d, osb_d, grom_d, pps_d = (len(drafts.get(d) or {}) for d in ("orls", "osb", "grom", "pps"))
         promo_setup = sum(len(v) for v in (getattr(state, "promotion_setup_messages", {}) or {}).values())
         logger.info(
             "📊 ПАМЯТЬ | заявки=%s | увольнения=%s | повышения=%s | склад=%s | переводы=%s | черновики_ОРЛС=%s ОСБ=%s ГРОМ=%s ППС=%s | сообщ_рапортов=%s",
@@ -38,53 +36,55 @@ def log_memory_state():
         logger.error("Отчёт состояния: ошибка чтения памяти (state): %s", e, exc_info=True)
 
 
-async def _load_all_tables_for_report():
-    req = await load_all_requests()
-    fir = await load_all_firing_requests()
-    pro = await load_all_promotion_requests()
-    wh = await load_all_warehouse_requests()
-    dept = await load_all_department_transfer_requests()
-    return req, fir, pro, wh, dept
+async def _count_all_tables_for_report():
+    return (
+        await count_requests("requests"),
+        await count_requests("firing_requests"),
+        await count_requests("promotion_requests"),
+        await count_requests("warehouse_requests"),
+        await count_requests("department_transfer_requests"),
+    )
 
 
 async def log_db_state():
     try:
-        req, fir, pro, wh, dept = await _load_all_tables_for_report()
+        req, fir, pro, wh, dept = await _count_all_tables_for_report()
 
         logger.info(
             "🗄️ БАЗА   | заявки=%s | увольнения=%s | повышения=%s | склад=%s | переводы=%s",
-            len(req),
-            len(fir),
-            len(pro),
-            len(wh),
-            len(dept),
+            req,
+            fir,
+            pro,
+            wh,
+            dept,
         )
     except Exception as e:
         logger.error("Отчёт состояния: ошибка чтения БД: %s", e, exc_info=True)
 
 
-async def _validate_message_exists(channel: discord.TextChannel, message_id: int) -> bool:
-    try:
-        await channel.fetch_message(int(message_id))
-        return True
-    except discord.NotFound:
-        return False
-    except Exception:
-        return True  # не считаем это удалением, чтобы случайно не снести запись из БД
+async def _prepare_by_channel(validator: BulkMessageValidator, source, rows: dict, default_channels: list):
+    groups: dict[int, tuple] = {}
+    for msg_id, channel_id in rows.items():
+        for ch in channels_for(source, channel_id, default_channels):
+            groups.setdefault(ch.id, (ch, []))[1].append(msg_id)
+    for ch, ids in groups.values():
+        await validator.prepare(ch, ids)
 
 
+@in_lane(Lane.BACKGROUND)
 async def cleanup_orphan_records(bot: discord.Client, dry_run: bool = True):
     logger.info("🧹 Проверка осиротевших записей (только проверка=%s)...", dry_run)
 
     try:
         firing, promotion, warehouse = await asyncio.gather(
-            load_all_firing_requests(),
-            load_all_promotion_requests(),
-            load_all_warehouse_requests(),
+            list_message_ids("firing_requests"),
+            list_message_channels("promotion_requests"),
+            list_message_ids("warehouse_requests"),
         )
 
 
         channel_cache = getattr(state, "channel_cache", None)
+        source = channel_cache or bot
         if channel_cache is not None:
             firing_channel = channel_cache.get_channel(Config.FIRING_CHANNEL_ID)
             warehouse_channel = channel_cache.get_channel(Config.WAREHOUSE_REQUEST_CHANNEL_ID)
@@ -102,36 +102,34 @@ async def cleanup_orphan_records(bot: discord.Client, dry_run: bool = True):
                 promo_channels.append(ch)
 
 
+        validator = BulkMessageValidator()
+        await validator.prepare(firing_channel, firing)
+        await validator.prepare(warehouse_channel, warehouse)
+        await _prepare_by_channel(validator, source, promotion, promo_channels)
+
+
         if firing_channel:
-            for msg_id in list(firing.keys()):
-                exists = await _validate_message_exists(firing_channel, int(msg_id))
-                if not exists:
+            for msg_id in firing:
+                exists = await validator.exists(firing_channel, int(msg_id))
+                # None (нет доступа/ошибка API) не считаем удалением, чтобы случайно не снести запись из БД
+                if exists is False:
                     logger.warning("🧹 ЛИШНЯЯ ЗАПИСЬ (увольнение): message_id=%s (сообщение удалено)", msg_id)
                     if not dry_run:
                         await delete_request("firing_requests", int(msg_id))
 
 
         if warehouse_channel:
-            for msg_id in list(warehouse.keys()):
-                exists = await _validate_message_exists(warehouse_channel, int(msg_id))
-                if not exists:
+            for msg_id in warehouse:
+                exists = await validator.exists(warehouse_channel, int(msg_id))
+                if exists is False:
                     logger.warning("🧹 ЛИШНЯЯ ЗАПИСЬ (склад): message_id=%s (сообщение удалено)", msg_id)
                     if not dry_run:
                         await delete_request("warehouse_requests", int(msg_id))
 
 
-        for msg_id in list(promotion.keys()):
-            found = False
-            for ch in promo_channels:
-                try:
-                    ok = await _validate_message_exists(ch, int(msg_id))
-                    if ok:
-                        found = True
-                        break
-                except Exception:
-                    continue
-
-            if not found:
+        for msg_id, channel_id in promotion.items():
+            found_channel, certain = await validator.locate(channels_for(source, channel_id, promo_channels), int(msg_id))
+            if found_channel is None and certain:
                 logger.warning("🧹 ЛИШНЯЯ ЗАПИСЬ (повышение): message_id=%s (сообщение удалено)", msg_id)
                 if not dry_run:
                     await delete_request("promotion_requests", int(msg_id))
@@ -144,29 +142,34 @@ async def cleanup_orphan_records(bot: discord.Client, dry_run: bool = True):
             getattr(Config, "CHANNEL_APPLY_ORLS", 0),
         ]
         apply_channel_ids = [c for c in apply_channel_ids if c]
-        dept_transfers = await load_all_department_transfer_requests()
-        for msg_id in list(dept_transfers.keys()):
-            found = False
-            for ch_id in apply_channel_ids:
-                if channel_cache is not None:
-                    ch = channel_cache.get_channel(ch_id)
-                else:
-                    ch = bot.get_channel(ch_id)
-                if ch and await _validate_message_exists(ch, int(msg_id)):
-                    found = True
-                    break
-            if not found:
+        apply_channels = []
+        for ch_id in apply_channel_ids:
+            if channel_cache is not None:
+                ch = channel_cache.get_channel(ch_id)
+            else:
+                ch = bot.get_channel(ch_id)
+            if ch:
+                apply_channels.append(ch)
+        dept_transfers = await list_message_channels("department_transfer_requests")
+        await _prepare_by_channel(validator, source, dept_transfers, apply_channels)
+        for msg_id, channel_id in dept_transfers.items():
+            found_channel, certain = await validator.locate(channels_for(source, channel_id, apply_channels), int(msg_id))
+            if found_channel is None and certain:
                 logger.warning("🧹 ЛИШНЯЯ ЗАПИСЬ (заявка перевод): message_id=%s (сообщение удалено)", msg_id)
                 if not dry_run:
                     await delete_department_transfer_request(int(msg_id))
                     state.active_department_transfers.pop(int(msg_id), None)
 
-        logger.info("🧹 Проверка лишних записей завершена")
+        logger.info(
+            "🧹 Проверка лишних записей завершена (запросов к API: history=%s, fetch=%s)",
+            validator.history_calls, validator.fetch_calls,
+        )
 
     except Exception as e:
         logger.error("Отчёт состояния: ошибка проверки лишних записей: %s", e, exc_info=True)
 
 
+@in_lane(Lane.BACKGROUND)
 async def run_health_report(bot: discord.Client):
     logger.info("========== ОТЧЁТ О СОСТОЯНИИ ==========")
     log_memory_state()
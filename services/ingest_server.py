@@ -0,0 +1,239 @@
+import hashlib
+import hmac
+import json
+import logging
+import time
+from collections import OrderedDict
+
+import discord
+from aiohttp import web
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 64 * 1024
+SIGNATURE_HEADER = "X-Signature"
+TIMESTAMP_HEADER = "X-Timestamp"
+
+_REQUIRED = {
+    "firing": ("discord_id", "full_name", "reason"),
+    "promotion": ("discord_id", "full_name", "new_rank"),
+}
+
+
+class IngestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    digest = hmac.new(secret.encode("utf-8"), timestamp.encode("ascii") + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_signature(secret: str, timestamp: str, body: bytes, signature: str, max_skew: int) -> bool:
+    try:
+        ts = int(timestamp)
+    except (TypeError, ValueError):
+        return False
+    if abs(time.time() - ts) > max_skew:
+        return False
+    return hmac.compare_digest(sign(secret, str(ts), body), signature or "")
+
+
+def _allowed_channels() -> set[int]:
+    allowed = {int(cid) for cid in (getattr(Config, "PROMOTION_CHANNELS", {}) or {})}
+    allowed.update(int(cid) for cid in (getattr(Config, "WEBHOOK_ALLOWED_CHANNEL_IDS", None) or []))
+    if getattr(Config, "FIRING_CHANNEL_ID", 0):
+        allowed.add(int(Config.FIRING_CHANNEL_ID))
+    return allowed
+
+
+# Разбор тела запроса в (тип, данные в формате _parse_*, embed-оригинал или None).
+# Принимает то же, что форма шлёт в Discord-вебхук ({"embeds": [...]}), или уже разобранные
+# данные: {"type": "firing" | "promotion", "data": {...}}.
+def parse_payload(handler, payload: dict) -> tuple[str, dict, discord.Embed | None]:
+    if not isinstance(payload, dict):
+        raise IngestError(400, "ожидается JSON-объект")
+
+    embeds = payload.get("embeds")
+    if embeds:
+        try:
+            embed = discord.Embed.from_dict(embeds[0])
+        except Exception:
+            raise IngestError(400, "некорректный embed")
+        kind = handler.detect_kind(embed)
+        if kind == "firing":
+            data = handler._parse_firing_embed(embed)
+        elif kind == "promotion":
+            data = handler._parse_promotion_embed(embed)
+        else:
+            raise IngestError(422, "неизвестный тип рапорта")
+        if not data:
+            raise IngestError(422, "не удалось разобрать рапорт")
+        return kind, data, embed if kind == "promotion" else None
+
+    kind = payload.get("type")
+    data = payload.get("data")
+    if kind not in _REQUIRED or not isinstance(data, dict):
+        raise IngestError(400, "нужны embeds или type + data")
+    missing = [key for key in _REQUIRED[kind] if not data.get(key)]
+    if missing:
+        raise IngestError(422, f"нет полей: {', '.join(missing)}")
+    data = dict(data)
+    try:
+        data["discord_id"] = int(data["discord_id"])
+    except (TypeError, ValueError):
+        raise IngestError(422, "некорректный discord_id")
+    if kind == "firing":
+        data.setdefault("rank", "—")
+        data.setdefault("recovery_option", "без возможности восстановления")
+    return kind, data, None
+
+
+# Встроенный приём рапортов (по умолчанию выключен): форма шлёт подписанный JSON прямо боту,
+# рапорт публикуется одним send — без webhook-сообщения, разбора в on_message и его удаления.
+# Путь через Discord-вебхук остаётся как запасной.
+# Подписи принятых запросов помнятся, пока их метка времени не выйдет из окна max_skew: повтор
+# того же подписанного запроса в этом окне получает 409 и второй рапорт не публикует.
+class IngestServer:
+    def __init__(self, bot, handler, host: str, port: int, secret: str, max_skew: int = 300):
+        self.bot = bot
+        self.handler = handler
+        self.host = host
+        self.port = int(port)
+        self.secret = secret
+        self.max_skew = int(max_skew)
+        self._runner: web.AppRunner | None = None
+        self._seen: OrderedDict[str, float] = OrderedDict()
+        self.accepted = 0
+        self.rejected = 0
+        self.failed = 0
+        self.replays = 0
+
+    def _claim(self, signature: str, timestamp: str) -> bool:
+        now = time.time()
+        while self._seen and next(iter(self._seen.values())) < now:
+            self._seen.popitem(last=False)
+        if signature in self._seen:
+            return False
+        self._seen[signature] = int(timestamp) + self.max_skew
+        return True
+
+    def _resolve_channel(self, kind: str, payload: dict):
+        channel_id = payload.get("channel_id")
+        if channel_id is None and kind == "firing":
+            channel_id = getattr(Config, "FIRING_CHANNEL_ID", 0)
+        try:
+            channel_id = int(channel_id or 0)
+        except (TypeError, ValueError):
+            channel_id = 0
+        if not channel_id:
+            raise IngestError(422, "не указан channel_id")
+        if channel_id not in _allowed_channels():
+            raise IngestError(403, "канал не разрешён")
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            raise IngestError(503, "канал недоступен")
+        return channel
+
+    async def handle_report(self, request: web.Request) -> web.Response:
+        signature = request.headers.get(SIGNATURE_HEADER, "")
+        try:
+            body = await request.read()
+            if len(body) > MAX_BODY_BYTES:
+                raise IngestError(413, "слишком большой запрос")
+            timestamp = request.headers.get(TIMESTAMP_HEADER, "")
+            if not verify_signature(self.secret, timestamp, body, signature, self.max_skew):
+                raise IngestError(401, "неверная подпись")
+            try:
+                payload = json.loads(body)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                raise IngestError(400, "некорректный JSON")
+
+            kind, data, embed = parse_payload(self.handler, payload)
+            channel = self._resolve_channel(kind, payload)
+            if not self._claim(signature, timestamp):
+                self.replays += 1
+                raise IngestError(409, "запрос уже принят")
+        except IngestError as e:
+            self.rejected += 1
+            logger.warning("Приём рапортов: отклонено (%s): %s", e.status, e.message)
+            return web.json_response({"ok": False, "error": e.message}, status=e.status)
+
+        try:
+            if kind == "firing":
+                msg = await self.handler.publish_firing(channel, data)
+            else:
+                msg = await self.handler.publish_promotion(channel, data, embed)
+        except discord.HTTPException as e:
+            # рапорт не опубликован — тот же запрос можно повторить
+            self._seen.pop(signature, None)
+            self.failed += 1
+            logger.error("Приём рапортов: ошибка Discord при публикации %s: %s", kind, e)
+            return web.json_response({"ok": False, "error": "ошибка Discord"}, status=502)
+        except Exception as e:
+            self._seen.pop(signature, None)
+            self.failed += 1
+            logger.error("Приём рапортов: ошибка публикации %s: %s", kind, e, exc_info=True)
+            return web.json_response({"ok": False, "error": "внутренняя ошибка"}, status=500)
+
+        self.accepted += 1
+        logger.info("✅ Приём рапортов: %s user_id=%s → msg_id=%s", kind, data["discord_id"], msg.id)
+        return web.json_response({"ok": True, "type": kind, "message_id": str(msg.id)})
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({"ok": True, "ready": self.bot.is_ready()})
+
+    def make_app(self) -> web.Application:
+        app = web.Application(client_max_size=MAX_BODY_BYTES)
+        app.router.add_post("/reports", self.handle_report)
+        app.router.add_get("/health", self.handle_health)
+        return app
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info("Приём рапортов слушает http://%s:%s/reports", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self) -> dict:
+        return {"accepted": self.accepted, "rejected": self.rejected, "failed": self.failed, "replays": self.replays}
+
+
+server: IngestServer | None = None
+
+
+def get_ingest_server() -> IngestServer | None:
+    return server
+
+
+async def start_ingest_server(bot, handler) -> IngestServer | None:
+    global server
+    if not getattr(Config, "INGEST_ENABLED", False):
+        return None
+    if not getattr(Config, "INGEST_SECRET", ""):
+        logger.error("Приём рапортов: INGEST_ENABLED=true, но INGEST_SECRET пуст — сервер не запущен")
+        return None
+    if server is None:
+        server = IngestServer(
+            bot,
+            handler,
+            getattr(Config, "INGEST_HOST", "127.0.0.1"),
+            getattr(Config, "INGEST_PORT", 8080),
+            Config.INGEST_SECRET,
+            getattr(Config, "INGEST_MAX_SKEW_SEC", 300),
+        )
+    await server.start()
+    return server
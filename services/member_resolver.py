@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Iterable, Optional
+
+import discord
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 1024
+
+
+# Участник берётся из кэша гильдии; если его там нет — один fetch_member на (гильдия, user_id),
+# который ждут все одновременные вызовы (двойной клик, два сотрудника на одной заявке).
+# Результат, в том числе «нет на сервере», живёт ttl_sec; on_member_update / on_member_remove /
+# on_member_join сбрасывают запись раньше.
+class MemberResolver:
+    def __init__(self, ttl_sec: float | None = None):
+        self.ttl = float(ttl_sec if ttl_sec is not None else getattr(Config, "MEMBER_CACHE_TTL_SEC", 5))
+        self._cache: dict[tuple[int, int], tuple[float, Optional[discord.Member]]] = {}
+        self._inflight: dict[tuple[int, int], asyncio.Task] = {}
+        self._waiters: dict[tuple[int, int], list[tuple[Callable, asyncio.Future]]] = {}
+        self.gateway_hits = 0
+        self.cache_hits = 0
+        self.fetches = 0
+        self.shared = 0
+        self.not_found = 0
+        self.verified_cached = 0
+        self.verified_event = 0
+        self.verify_fetches = 0
+
+    async def resolve(self, guild: discord.Guild, user_id: int, *, fresh: bool = False) -> Optional[discord.Member]:
+        user_id = int(user_id)
+        key = (guild.id, user_id)
+        if fresh:
+            self.invalidate(guild.id, user_id)
+        else:
+            member = guild.get_member(user_id)
+            if member is not None:
+                self.gateway_hits += 1
+                return member
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self.cache_hits += 1
+                return cached[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(guild, user_id))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._inflight.pop(key, None) if self._inflight.get(key) is t else None)
+        else:
+            self.shared += 1
+        # отмена одного ожидающего не должна обрывать запрос для остальных
+        return await asyncio.shield(task)
+
+    async def _fetch(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        self.fetches += 1
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            self.not_found += 1
+            member = None
+        key = (guild.id, user_id)
+        if self._inflight.get(key) is asyncio.current_task():
+            self._store(key, member)
+        return member
+
+    def _store(self, key: tuple[int, int], member: Optional[discord.Member]) -> None:
+        now = time.monotonic()
+        if len(self._cache) >= MAX_ENTRIES:
+            for k in [k for k, (expires, _) in self._cache.items() if expires <= now]:
+                del self._cache[k]
+        if len(self._cache) < MAX_ENTRIES:
+            self._cache[key] = (now + self.ttl, member)
+
+    def invalidate(self, guild_id: int, user_id: int) -> None:
+        key = (guild_id, int(user_id))
+        self._cache.pop(key, None)
+        # уже идущий запрос мог начаться до изменения — следующий вызов начнёт новый
+        self._inflight.pop(key, None)
+
+    def on_member_event(self, member: discord.Member) -> None:
+        key = (member.guild.id, member.id)
+        self.invalidate(*key)
+        for check, fut in self._waiters.get(key, ()):
+            if not fut.done() and check(member):
+                fut.set_result(member)
+
+    # Проверка после смены ролей: ждём on_member_update с нужным набором ролей вместо повторного
+    # fetch_member. Если событие уже пришло — участник в кэше гильдии уже с новыми ролями.
+    # Не дождались за timeout — один свежий fetch_member; вызывающий сам сравнивает роли.
+    async def wait_for_roles(
+        self,
+        guild: discord.Guild,
+        user_id: int,
+        present: Iterable = (),
+        absent: Iterable = (),
+        timeout: float | None = None,
+    ) -> Optional[discord.Member]:
+        user_id = int(user_id)
+        key = (guild.id, user_id)
+        present_ids = {getattr(r, "id", r) for r in present}
+        absent_ids = {getattr(r, "id", r) for r in absent} - present_ids
+
+        def check(member) -> bool:
+            role_ids = {r.id for r in member.roles}
+            return present_ids <= role_ids and not (absent_ids & role_ids)
+
+        member = guild.get_member(user_id)
+        if member is not None and check(member):
+            self.verified_cached += 1
+            return member
+
+        fut = asyncio.get_running_loop().create_future()
+        entry = (check, fut)
+        self._waiters.setdefault(key, []).append(entry)
+        try:
+            wait = timeout if timeout is not None else getattr(Config, "MEMBER_VERIFY_TIMEOUT_SEC", 3)
+            member = await asyncio.wait_for(fut, timeout=wait)
+            self.verified_event += 1
+            return member
+        except TimeoutError:
+            self.verify_fetches += 1
+            logger.info("Роли участника %s не подтверждены событием, запрашиваю участника", user_id)
+            return await self.resolve(guild, user_id, fresh=True)
+        finally:
+            waiters = self._waiters.get(key)
+            if waiters is not None:
+                waiters.remove(entry)
+                if not waiters:
+                    del self._waiters[key]
+
+    def stats(self) -> dict:
+        return {
+            "gateway_hits": self.gateway_hits,
+            "cache_hits": self.cache_hits,
+            "fetches": self.fetches,
+            "shared": self.shared,
+            "not_found": self.not_found,
+            "cached": len(self._cache),
+            "inflight": len(self._inflight),
+            "verified_cached": self.verified_cached,
+            "verified_event": self.verified_event,
+            "verify_fetches": self.verify_fetches,
+        }
+
+
+member_resolver = MemberResolver()
+
+
+def get_member_resolver() -> MemberResolver:
+    return member_resolver
+
+
+async def resolve_member(guild: discord.Guild, user_id: int, *, fresh: bool = False) -> Optional[discord.Member]:
+    return await member_resolver.resolve(guild, user_id, fresh=fresh)
+
+
+async def wait_for_roles(guild: discord.Guild, user_id: int, present: Iterable = (), absent: Iterable = ()) -> Optional[discord.Member]:
+    return await member_resolver.wait_for_roles(guild, user_id, present, absent)
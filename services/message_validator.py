@@ -0,0 +1,116 @@
+import logging
+from typing import Dict, Iterable, Optional, Sequence
+
+import discord
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+HISTORY_PAGE_SIZE = 100
+
+
+class _ChannelScan:
+    __slots__ = ("covered_from", "covered_upto", "live")
+
+    def __init__(self, covered_from: int):
+        self.live: set[int] = set()
+        self.covered_from = covered_from
+        self.covered_upto = 0
+
+    def covers(self, message_id: int) -> bool:
+        return self.covered_from <= message_id <= self.covered_upto
+
+
+# Канал, в котором искать сообщение записи: сохранённый channel_id, если канал доступен, иначе
+# все каналы по умолчанию. source — бот или ChannelCache (что угодно с get_channel).
+def channels_for(source, channel_id, default_channels: Sequence) -> list:
+    try:
+        channel_id = int(channel_id or 0)
+    except (TypeError, ValueError):
+        channel_id = 0
+    if channel_id:
+        ch = source.get_channel(channel_id)
+        if ch:
+            return [ch]
+    return list(default_channels)
+
+
+# Один проход channel.history(after=самый старый id) на канал вместо fetch_message на каждую запись.
+# Для id за пределами просмотренного диапазона — точечный fetch_message.
+class BulkMessageValidator:
+    def __init__(self, max_pages: int | None = None):
+        self.max_pages = max(1, int(max_pages if max_pages is not None else getattr(Config, "MESSAGE_SCAN_MAX_PAGES", 20)))
+        self._scans: Dict[int, _ChannelScan] = {}
+        self.history_calls = 0
+        self.fetch_calls = 0
+
+    async def prepare(self, channel, message_ids: Iterable[int]) -> None:
+        ids = sorted({int(m) for m in message_ids if m})
+        if channel is None or not ids:
+            return
+
+        # Сканировать дороже, чем проверить каждую запись отдельно, не имеет смысла.
+        pages = min(self.max_pages, len(ids))
+        limit = pages * HISTORY_PAGE_SIZE
+        scan = _ChannelScan(covered_from=ids[0])
+        started_at = discord.utils.time_snowflake(discord.utils.utcnow(), high=True)
+        seen = 0
+        try:
+            async for msg in channel.history(limit=limit, after=discord.Object(id=ids[0] - 1), oldest_first=True):
+                seen += 1
+                scan.live.add(msg.id)
+                scan.covered_upto = msg.id
+        except (discord.Forbidden, discord.HTTPException) as e:
+            logger.warning("Проверка сообщений: не удалось прочитать историю канала %s: %s", getattr(channel, "id", channel), e)
+            return
+        finally:
+            self.history_calls += max(1, -(-seen // HISTORY_PAGE_SIZE))
+
+        complete = seen < limit
+        if complete:
+            scan.covered_upto = started_at
+        self._scans[channel.id] = scan
+        logger.debug(
+            "Проверка сообщений: канал %s, просмотрено %s сообщений, полный диапазон=%s",
+            channel.id, seen, complete,
+        )
+
+    # True/False — сообщение есть/удалено; None — проверить не удалось (нет доступа, ошибка API).
+    async def exists(self, channel, message_id: int) -> Optional[bool]:
+        if channel is None:
+            return None
+        message_id = int(message_id)
+        scan = self._scans.get(channel.id)
+        if scan is not None and scan.covers(message_id):
+            return message_id in scan.live
+
+        self.fetch_calls += 1
+        try:
+            await channel.fetch_message(message_id)
+            return True
+        except discord.NotFound:
+            return False
+        except (discord.Forbidden, discord.HTTPException):
+            return None
+
+    # (канал с сообщением или None, уверен ли ответ)
+    async def locate(self, channels: Sequence, message_id: int) -> tuple[Optional[object], bool]:
+        certain = True
+        channels = [ch for ch in channels if ch is not None]
+
+        for ch in channels:
+            scan = self._scans.get(ch.id)
+            if scan is not None and scan.covers(int(message_id)) and int(message_id) in scan.live:
+                return ch, True
+
+        for ch in channels:
+            scan = self._scans.get(ch.id)
+            if scan is not None and scan.covers(int(message_id)):
+                continue
+            result = await self.exists(ch, message_id)
+            if result:
+                return ch, True
+            if result is None:
+                certain = False
+        return None, certain
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+# Перенос сообщения вниз по «заднему фронту»: после каждого нового сообщения в канале перенос
+# откладывается ещё на quiet_sec, и выполняется один раз, когда в канале стало тихо.
+# Таймер всегда отсчитывается от последнего сообщения, поэтому переносов по одному ключу
+# не больше одного за quiet_sec.
+class PositionDebouncer:
+    def __init__(self, quiet_sec: float):
+        self.quiet_sec = max(0.0, float(quiet_sec))
+        self._timers: Dict[Hashable, asyncio.Task] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self.scheduled = 0
+        self.rescheduled = 0
+        self.runs = 0
+
+    def is_pending(self, key: Hashable) -> bool:
+        task = self._timers.get(key)
+        return task is not None and not task.done()
+
+    # Общий с периодической проверкой лок: два переноса одного сообщения одновременно не идут.
+    def lock(self, key: Hashable) -> asyncio.Lock:
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    def schedule(self, key: Hashable, action: Callable[[], Awaitable]) -> None:
+        task = self._timers.pop(key, None)
+        if task is not None and not task.done():
+            task.cancel()
+            self.rescheduled += 1
+        else:
+            self.scheduled += 1
+        self._timers[key] = asyncio.create_task(self._run_later(key, action))
+
+    async def _run_later(self, key: Hashable, action: Callable[[], Awaitable]) -> None:
+        await asyncio.sleep(self.quiet_sec)
+
+        # дальше не отменяемся: прерванный на полпути перенос оставил бы канал без сообщения
+        if self._timers.get(key) is asyncio.current_task():
+            self._timers.pop(key, None)
+        async with self.lock(key):
+            self.runs += 1
+            try:
+                await action()
+            except Exception as e:
+                logger.error("Отложенный перенос %s: %s", key, e, exc_info=True)
+
+    def cancel_all(self) -> None:
+        for task in self._timers.values():
+            task.cancel()
+        self._timers.clear()
+
+    def stats(self) -> dict:
+        return {
+            "quiet_sec": self.quiet_sec,
+            "pending": sum(1 for t in self._timers.values() if not t.done()),
+            "scheduled": self.scheduled,
+            "rescheduled": self.rescheduled,
+            "runs": self.runs,
+        }
@@ -0,0 +1,263 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+import state
+from config import Config
+from services.position_debounce import PositionDebouncer
+
+logger = logging.getLogger(__name__)
+
+BUDGET_WINDOW_SEC = 60.0
+SYNC_INTERVAL_SEC = 30.0
+
+# (атрибут в state, имя, приоритет, настройка канала, без которой менеджер не запускаем)
+_MANAGERS = (
+    ("start_manager", "start", 100, None),
+    ("firing_position_manager", "firing", 80, "FIRING_CHANNEL_ID"),
+    ("warehouse_position_manager", "warehouse", 80, None),
+    ("apply_grom_manager", "apply_grom", 50, "CHANNEL_APPLY_GROM"),
+    ("apply_pps_manager", "apply_pps", 50, "CHANNEL_APPLY_PPS"),
+    ("apply_osb_manager", "apply_osb", 50, "CHANNEL_APPLY_OSB"),
+    ("apply_orls_manager", "apply_orls", 50, "CHANNEL_APPLY_ORLS"),
+    ("academy_apply_manager", "academy_apply", 40, "ACADEMY_CHANNEL_ID"),
+    ("admin_transfer_manager", "admin_transfer", 30, "CHANNEL_ADMIN_TRANSFER"),
+)
+PROMOTION_SETUP_PRIORITY = 20
+
+
+class PositionTarget:
+    __slots__ = (
+        "channel_id", "check", "checks", "deferred", "in_place", "interval",
+        "last_check", "last_move", "moves", "name", "priority", "rest_calls",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        channel_id: int,
+        priority: int,
+        interval: float,
+        check: Callable[[], Awaitable[bool]],
+        in_place: Callable[[], bool],
+        rest_calls: Callable[[], int],
+    ):
+        self.name = name
+        self.channel_id = int(channel_id or 0)
+        self.priority = int(priority)
+        # 0 — только по активности в канале, без периодической проверки
+        self.interval = max(1.0, float(interval)) if interval and interval > 0 else 0.0
+        self.check = check
+        self.in_place = in_place
+        self.rest_calls = rest_calls
+        self.last_check = 0.0
+        self.last_move = 0.0
+        self.checks = 0
+        self.moves = 0
+        self.deferred = 0
+
+
+# Одна задача вместо отдельного цикла у каждого менеджера позиций: общий график с приоритетами и
+# разбросом, общий бюджет запросов к API в минуту. Проверки, которым API не нужен (сообщение
+# на месте по событиям шлюза), выполняются и при исчерпанном бюджете.
+# Новое сообщение в канале не двигает закреплённое сразу: перенос откладывается до тишины (PositionDebouncer).
+class PositionSupervisor:
+    def __init__(
+        self,
+        bot,
+        budget_per_minute: int | None = None,
+        jitter_percent: int | None = None,
+        quiet_sec: float | None = None,
+    ):
+        self.bot = bot
+        self.budget = max(1, int(budget_per_minute if budget_per_minute is not None else getattr(Config, "POSITION_REST_BUDGET_PER_MINUTE", 30)))
+        jitter = jitter_percent if jitter_percent is not None else getattr(Config, "POSITION_CHECK_JITTER_PERCENT", 10)
+        self.jitter = min(0.5, max(0.0, int(jitter) / 100))
+        self._targets: Dict[str, PositionTarget] = {}
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._spent: deque = deque()
+        self._wakeup = asyncio.Event()
+        if quiet_sec is None:
+            quiet_sec = getattr(Config, "POSITION_QUIET_PERIOD_SEC", 10)
+        self.debouncer = PositionDebouncer(quiet_sec)
+
+    def add_target(self, target: PositionTarget, delay: float = 0.0) -> None:
+        if target.name in self._targets:
+            return
+        self._targets[target.name] = target
+        if target.interval:
+            self._schedule(target, delay)
+            self._wakeup.set()
+
+    def add_manager(self, name: str, manager, priority: int) -> None:
+        self.add_target(
+            PositionTarget(
+                name=name,
+                channel_id=manager.channel_id,
+                priority=priority,
+                interval=manager.check_interval,
+                check=manager.ensure_position,
+                in_place=manager.is_in_place,
+                rest_calls=lambda m=manager: m.rest_calls,
+            ),
+            delay=0.5 * len(self._targets),
+        )
+
+    def _schedule(self, target: PositionTarget, delay: float) -> None:
+        heapq.heappush(self._heap, (time.monotonic() + delay, -target.priority, next(self._seq), target.name))
+
+    def _next_delay(self, target: PositionTarget) -> float:
+        return target.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    # Сообщение в канале от кого-то, кроме бота: переносим закреплённые сообщения, когда станет тихо.
+    def on_channel_activity(self, channel_id: int) -> None:
+        channel_id = int(channel_id)
+        if channel_id in (getattr(state, "promotion_setup_messages", None) or {}):
+            self._sync_promotion_setup()
+        for target in self._targets.values():
+            if target.channel_id == channel_id:
+                self._schedule_debounced(target)
+
+    def _schedule_debounced(self, target: PositionTarget) -> None:
+        self.debouncer.schedule(target.name, lambda t=target: self._run_target(t, debounced=True))
+
+    def spent_last_minute(self) -> int:
+        cutoff = time.monotonic() - BUDGET_WINDOW_SEC
+        while self._spent and self._spent[0][0] < cutoff:
+            self._spent.popleft()
+        return sum(cost for _, cost in self._spent)
+
+    def _sync_promotion_setup(self) -> None:
+        interval = getattr(Config, "PROMOTION_SETUP_CHECK_INTERVAL", 0) or 0
+        from commands.promotion_setup import check_promotion_setup_channel, promotion_setup_in_place
+
+        for channel_id in list((getattr(state, "promotion_setup_messages", None) or {}).keys()):
+            name = f"promotion_setup:{channel_id}"
+            if name in self._targets:
+                continue
+            counter = {"calls": 0}
+
+            async def check(cid=channel_id, counter=counter) -> bool:
+                moved, calls = await check_promotion_setup_channel(self.bot, cid)
+                counter["calls"] += calls
+                return moved
+
+            self.add_target(
+                PositionTarget(
+                    name=name,
+                    channel_id=channel_id,
+                    priority=PROMOTION_SETUP_PRIORITY,
+                    interval=interval,
+                    check=check,
+                    in_place=lambda cid=channel_id: promotion_setup_in_place(cid),
+                    rest_calls=lambda counter=counter: counter["calls"],
+                ),
+                delay=interval,
+            )
+
+    async def _run_target(self, target: PositionTarget, debounced: bool = False) -> None:
+        if not debounced and self.debouncer.is_pending(target.name):
+            # в канале идёт переписка — перенос уже запланирован на момент тишины
+            self._schedule(target, self._next_delay(target))
+            return
+
+        if not target.in_place() and self.spent_last_minute() >= self.budget:
+            target.deferred += 1
+            if debounced:
+                self._schedule_debounced(target)
+                return
+            wait = BUDGET_WINDOW_SEC - (time.monotonic() - self._spent[0][0]) if self._spent else 1.0
+            self._schedule(target, max(1.0, wait) + random.uniform(0, 1))
+            logger.debug("Позиции: бюджет API исчерпан, проверка %s отложена на %.0f с", target.name, wait)
+            return
+
+        before = target.rest_calls()
+        try:
+            if debounced:
+                # лок уже взят PositionDebouncer
+                moved = await target.check()
+            else:
+                async with self.debouncer.lock(target.name):
+                    moved = await target.check()
+        except Exception as e:
+            logger.error("Позиции: ошибка проверки %s: %s", target.name, e, exc_info=True)
+            moved = False
+        cost = max(0, target.rest_calls() - before)
+        if cost:
+            self._spent.append((time.monotonic(), cost))
+
+        target.checks += 1
+        target.last_check = time.time()
+        if moved:
+            target.moves += 1
+            target.last_move = target.last_check
+        if not debounced and target.interval:
+            self._schedule(target, self._next_delay(target))
+
+    async def run(self) -> None:
+        await self.bot.wait_until_ready()
+        last_sync = 0.0
+        while not self.bot.is_closed():
+            now = time.monotonic()
+            if now - last_sync >= SYNC_INTERVAL_SEC:
+                self._sync_promotion_setup()
+                last_sync = now
+
+            if not self._heap:
+                delay = SYNC_INTERVAL_SEC
+            else:
+                delay = self._heap[0][0] - now
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(delay, SYNC_INTERVAL_SEC))
+                except TimeoutError:
+                    pass
+                continue
+
+            _, _, _, name = heapq.heappop(self._heap)
+            target = self._targets.get(name)
+            if target is not None:
+                await self._run_target(target)
+
+    def snapshot(self) -> list[PositionTarget]:
+        return sorted(self._targets.values(), key=lambda t: (-t.priority, t.name))
+
+    def stats(self) -> dict:
+        return {
+            "targets": len(self._targets),
+            "budget": self.budget,
+            "spent": self.spent_last_minute(),
+            "deferred": sum(t.deferred for t in self._targets.values()),
+            "debounce": self.debouncer.stats(),
+        }
+
+
+supervisor: Optional[PositionSupervisor] = None
+
+
+def get_position_supervisor() -> Optional[PositionSupervisor]:
+    return supervisor
+
+
+def init_position_supervisor(bot) -> PositionSupervisor:
+    global supervisor
+    if supervisor is None:
+        supervisor = PositionSupervisor(bot)
+    for attr, name, priority, channel_setting in _MANAGERS:
+        manager = getattr(state, attr, None)
+        if manager is None:
+            continue
+        if channel_setting and not getattr(Config, channel_setting, 0):
+            continue
+        if name == "academy_apply" and not getattr(Config, "ROLE_ACADEMY", 0):
+            continue
+        supervisor.add_manager(name, manager, priority)
+    supervisor._sync_promotion_setup()
+    return supervisor
@@ -1,6 +1,7 @@
 import logging
 import re
-from typing import Dict, Tuple, Optional, Set
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, Tuple, Optional, Set
 
 import discord
 from config import Config
@@ -37,8 +38,12 @@ def _parse_role_id(role_id) -> Optional[int]:
         return None
 
 
-def build_normalized_rank_mapping() -> Dict[Tuple[str, str], int]:
-    raw = getattr(Config, "RANK_ROLE_MAPPING", {}) or {}
+def _raw_mapping() -> dict:
+    return getattr(Config, "RANK_ROLE_MAPPING", {}) or {}
+
+
+def build_normalized_rank_mapping(raw: dict | None = None) -> Dict[Tuple[str, str], int]:
+    raw = _raw_mapping() if raw is None else raw
     normalized: Dict[Tuple[str, str], int] = {}
 
     for raw_key, role_id in raw.items():
@@ -62,8 +67,8 @@ def build_normalized_rank_mapping() -> Dict[Tuple[str, str], int]:
     return normalized
 
 
-def _build_new_rank_to_role_id() -> Dict[str, int]:
-    raw = getattr(Config, "RANK_ROLE_MAPPING", {}) or {}
+def _build_new_rank_to_role_id(raw: dict | None = None) -> Dict[str, int]:
+    raw = _raw_mapping() if raw is None else raw
     result: Dict[str, int] = {}
 
     for raw_key, role_id in raw.items():
@@ -96,18 +101,8 @@ def _build_new_rank_to_role_id() -> Dict[str, int]:
 
 
 def find_role_id_for_transition(transition: str) -> Optional[int]:
-    if not (transition or "").strip():
-        return None
-
-    canon = _canon_transition_key(transition)
-    if canon:
-        mapping = build_normalized_rank_mapping()
-        rid = mapping.get(canon)
-        if rid is not None:
-            return rid
+    return get_rank_index().role_for_transition(transition)
 
-    new_rank_map = _build_new_rank_to_role_id()
-    return new_rank_map.get(_canon_rank(transition))
 
 def parse_transition_to_new_rank(transition: str):
     canon = _canon_transition_key(transition)
@@ -116,15 +111,17 @@ def parse_transition_to_new_rank(transition: str):
     return _canon_rank(transition) or None
 
 
-def get_all_rank_role_ids_from_mapping():
-    ids_from_transitions = set(build_normalized_rank_mapping().values())
-    ids_from_new_rank = set(_build_new_rank_to_role_id().values())
-    return ids_from_transitions | ids_from_new_rank
+def get_all_rank_role_ids_from_mapping() -> FrozenSet[int]:
+    return get_rank_index().role_ids
 
 
-def get_all_rank_names_from_mapping() -> Set[str]:
+def get_all_rank_names_from_mapping() -> FrozenSet[str]:
+    return get_rank_index().names
+
+
+def _build_rank_names(raw: dict | None = None) -> Set[str]:
+    raw = _raw_mapping() if raw is None else raw
     names: Set[str] = set()
-    raw = getattr(Config, "RANK_ROLE_MAPPING", {}) or {}
     for key in raw:
         text = str(key or "").strip()
         canon = _canon_transition_key(text)
@@ -138,8 +135,8 @@ def get_all_rank_names_from_mapping() -> Set[str]:
     return names
 
 
-def _build_role_id_to_display_name() -> Dict[int, str]:
-    raw = getattr(Config, "RANK_ROLE_MAPPING", {}) or {}
+def _build_role_id_to_display_name(raw: dict | None = None) -> Dict[int, str]:
+    raw = _raw_mapping() if raw is None else raw
     result: Dict[int, str] = {}
     for raw_key, role_id in raw.items():
         rid = _parse_role_id(role_id)
@@ -158,19 +155,71 @@ def _build_role_id_to_display_name() -> Dict[int, str]:
     return result
 
 
+# Всё, что раньше пересобиралось из RANK_ROLE_MAPPING на каждый вызов (с regex-разбором ключей),
+# строится один раз. Индекс неизменяемый; при смене Config.RANK_ROLE_MAPPING / ALL_RANK_ROLE_IDS
+# (новый объект) пересобирается сам, после правки на месте — reload_rank_index().
+class RankIndex:
+    __slots__ = ("_sources", "display_role_ids", "names", "new_rank_roles", "role_display", "role_ids", "transitions")
+
+    def __init__(self, raw: dict, all_rank_role_ids=()):
+        self.transitions: Mapping[Tuple[str, str], int] = MappingProxyType(build_normalized_rank_mapping(raw))
+        self.new_rank_roles: Mapping[str, int] = MappingProxyType(_build_new_rank_to_role_id(raw))
+        self.role_ids: FrozenSet[int] = frozenset(self.transitions.values()) | frozenset(self.new_rank_roles.values())
+        self.names: FrozenSet[str] = frozenset(_build_rank_names(raw))
+        self.role_display: Mapping[int, str] = MappingProxyType(_build_role_id_to_display_name(raw))
+        self.display_role_ids: FrozenSet[int] = self.role_ids | frozenset(all_rank_role_ids or ())
+        self._sources = (raw, all_rank_role_ids)
+
+    def is_built_from(self, raw, all_rank_role_ids) -> bool:
+        return self._sources[0] is raw and self._sources[1] is all_rank_role_ids
+
+    def role_for_transition(self, transition: str) -> Optional[int]:
+        if not (transition or "").strip():
+            return None
+        canon = _canon_transition_key(transition)
+        if canon:
+            rid = self.transitions.get(canon)
+            if rid is not None:
+                return rid
+        return self.new_rank_roles.get(_canon_rank(transition))
+
+    def member_rank_display(self, member: Optional[discord.Member]) -> str:
+        if not member or not getattr(member, "roles", None):
+            return ""
+        if not self.display_role_ids:
+            return ""
+        member_rank_roles = [r for r in member.roles if r.id in self.display_role_ids]
+        if not member_rank_roles:
+            return ""
+        top = max(member_rank_roles, key=lambda r: r.position)
+        return self.role_display.get(top.id, top.name) or ""
+
+
+_rank_index: Optional[RankIndex] = None
+
+
+def get_rank_index() -> RankIndex:
+    global _rank_index
+    raw = _raw_mapping()
+    all_ids = getattr(Config, "ALL_RANK_ROLE_IDS", None) or ()
+    if _rank_index is None or not _rank_index.is_built_from(raw, all_ids):
+        _rank_index = RankIndex(raw, all_ids)
+    return _rank_index
+
+
+def reload_rank_index() -> RankIndex:
+    global _rank_index
+    _rank_index = None
+    index = get_rank_index()
+    logger.info(
+        "Индекс званий: переходов %s, ролей %s, названий %s",
+        len(index.transitions), len(index.role_ids), len(index.names),
+    )
+    return index
+
+
 def get_member_rank_display(member: Optional[discord.Member]) -> str:
-    if not member or not getattr(member, "roles", None):
-        return ""
-    all_rank_ids = set(getattr(Config, "ALL_RANK_ROLE_IDS", []) or [])
-    all_rank_ids |= get_all_rank_role_ids_from_mapping()
-    if not all_rank_ids:
-        return ""
-    role_to_name = _build_role_id_to_display_name()
-    member_rank_roles = [r for r in member.roles if r.id in all_rank_ids]
-    if not member_rank_roles:
-        return ""
-    top = max(member_rank_roles, key=lambda r: r.position)
-    return role_to_name.get(top.id, top.name) or ""
+    return get_rank_index().member_rank_display(member)
 
 
 def is_promotion_key_allowed_for_member(member: Optional[discord.Member], promotion_key: str) -> bool:
@@ -1,14 +1,10 @@
 import logging
 import asyncio
-import discord
+from functools import partial
 
-from views.firing_view import FiringView
-from views.promotion_view import PromotionView
 from views.start_view import StartView
 from views.warehouse_start import WarehouseStartView
-from views.request_view import RequestView
-from views.warehouse_request_buttons import WarehouseRequestView
-from views.department_approval_view import DepartmentApprovalView
+from views.component_router import build_routers
 from views.apply_channel_view import ApplyChannelView
 from views.academy_apply_view import AcademyApplyView
 from views.orls_promotion_apply_view import OrlsPromotionApplyView
@@ -18,15 +14,21 @@ from services.firing_position_manager import FiringStartView
 import state
 from config import Config
 from enums import RequestType
+from services.cleanup import REQUEST_STORES
+from services.message_validator import BulkMessageValidator, channels_for
 from database import (
     load_all_requests,
     load_all_firing_requests,
     load_all_promotion_requests,
     load_all_warehouse_requests,
     load_all_department_transfer_requests,
+    load_request,
+    load_request_index,
+    REQUEST_INDEX_COLUMNS,
     delete_request,
     delete_department_transfer_request,
 )
+from utils.rest_scheduler import Lane, in_lane
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,7 @@ class ViewRestorer:
     def __init__(self, bot):
         self.bot = bot
 
+    @in_lane(Lane.BACKGROUND)
     async def restore_all(self):
         logger.info("Восстановление View...")
 
@@ -78,9 +81,17 @@ class ViewRestorer:
 
         from views.pps_promotion_apply_view import PpsPromotionApplyView
         self.bot.add_view(PpsPromotionApplyView())
+
+        # Кнопки заявок обслуживают по одному маршрутизатору на тип, а не View на каждое сообщение.
+        state.component_routers = build_routers()
+        for router in state.component_routers:
+            self.bot.add_view(router)
         logger.info("Стартовые View восстановлены")
 
     async def _load_requests_from_db(self):
+        if getattr(Config, "LAZY_REQUEST_HYDRATION", False):
+            await self._load_request_index_from_db()
+            return
 
         results = {}
         for name, loader in [
@@ -96,11 +107,11 @@ class ViewRestorer:
                 logger.error("Ошибка загрузки %s из БД: %s", name, e, exc_info=True)
                 results[name] = getattr(state, name, None) or {}
 
-        state.active_requests = results["active_requests"]
-        state.active_firing_requests = results["active_firing_requests"]
-        state.active_promotion_requests = results["active_promotion_requests"]
-        state.warehouse_requests = results["warehouse_requests"]
-        state.active_department_transfers = results["active_department_transfers"]
+        # на месте, а не новым словарём: модули держат ссылки из `from state import ...`
+        for name, data in results.items():
+            store = getattr(state, name)
+            if store is not data:
+                store.replace(data)
 
         logger.info(
             "📦 Загружено из БД: заявок=%s, увольнений=%s, повышений=%s, склад=%s, переводы=%s",
@@ -111,6 +122,43 @@ class ViewRestorer:
             len(getattr(state, "active_department_transfers", {}) or {}),
         )
 
+    async def _load_request_index_from_db(self):
+        # только колонки индекса: полная заявка подгрузится маршрутизатором кнопок при первом нажатии
+        keep = getattr(Config, "REQUEST_HOT_CACHE_MAX", 500)
+        for name, (table, _) in REQUEST_STORES.items():
+            store = getattr(state, name)
+            try:
+                index = await load_request_index(table)
+            except Exception as e:
+                logger.error("Ошибка загрузки %s из БД: %s", name, e, exc_info=True)
+                continue
+            store.load_lazy(index, partial(load_request, table), keep, REQUEST_INDEX_COLUMNS[table] + ("message_id",))
+
+        logger.info(
+            "📦 Загружено из БД (лениво, без данных заявок): заявок=%s, увольнений=%s, повышений=%s, склад=%s, переводы=%s",
+            *(len(getattr(state, name)) for name in REQUEST_STORES),
+        )
+
+    @staticmethod
+    def _int_ids(ids) -> list[int]:
+        result = []
+        for mid in ids or ():
+            try:
+                result.append(int(mid))
+            except (TypeError, ValueError):
+                continue
+        return result
+
+    async def _prepare_validator(self, storage: dict, default_channels: list) -> BulkMessageValidator:
+        groups: dict[int, tuple] = {}
+        for mid, data in (storage or {}).items():
+            for ch in channels_for(self.bot, (data or {}).get("channel_id"), default_channels):
+                groups.setdefault(ch.id, (ch, []))[1].append(mid)
+        validator = BulkMessageValidator()
+        for ch, ids in groups.values():
+            await validator.prepare(ch, self._int_ids(ids))
+        return validator
+
     async def _delete_orphan(self, storage: dict, table_name: str, msg_id, reason: str = ""):
         try:
             msg_id_int = int(msg_id)
@@ -146,7 +194,7 @@ class ViewRestorer:
                 continue
 
             try:
-                request_type = RequestType(rt_raw)
+                RequestType(rt_raw)
             except ValueError:
                 logger.warning("⚠️ Неизвестный request_type='%s' для message_id=%s", rt_raw, msg_id_int)
                 skipped += 1
@@ -154,27 +202,17 @@ class ViewRestorer:
 
             try:
                 user_id = int((data or {}).get("user_id", 0))
-                if not user_id:
-                    logger.warning("⚠️ Некорректный user_id для msg_id=%s", msg_id_int)
-                    skipped += 1
-                    continue
-
-                view = RequestView(
-                    user_id=user_id,
-                    validated_data=data,
-                    request_type=request_type,
-                )
-                self.bot.add_view(view, message_id=msg_id_int)
-                restored += 1
-
             except (TypeError, ValueError) as e:
                 logger.warning("⚠️ Некорректные данные заявки msg_id=%s: %s", msg_id_int, e)
                 skipped += 1
-            except Exception as e:
-                logger.warning("⚠️ Не удалось восстановить заявку msg_id=%s: %s", msg_id_int, e, exc_info=True)
+                continue
+            if not user_id:
+                logger.warning("⚠️ Некорректный user_id для msg_id=%s", msg_id_int)
                 skipped += 1
+                continue
+            restored += 1
 
-        logger.info("🔨 Восстановлено кнопок заявок: %s | пропущено: %s", restored, skipped)
+        logger.info("🔨 Активных кнопок заявок: %s | пропущено: %s", restored, skipped)
 
     async def _restore_firing_views(self):
         channel = self.bot.get_channel(Config.FIRING_CHANNEL_ID)
@@ -186,6 +224,9 @@ class ViewRestorer:
         deleted = 0
         skipped = 0
 
+        validator = BulkMessageValidator()
+        await validator.prepare(channel, self._int_ids(getattr(state, "active_firing_requests", {})))
+
         for msg_id, data in list((getattr(state, "active_firing_requests", {}) or {}).items()):
             try:
                 msg_id_int = int(msg_id)
@@ -206,34 +247,23 @@ class ViewRestorer:
                     skipped += 1
                 continue
 
-            try:
-                await channel.fetch_message(msg_id_int)
-            except discord.NotFound:
+            exists = await validator.exists(channel, msg_id_int)
+            if exists is False:
                 if await self._delete_orphan(state.active_firing_requests, "firing_requests", msg_id_int, "сообщение удалено"):
                     deleted += 1
                 else:
                     skipped += 1
                 continue
-            except discord.Forbidden:
-                logger.warning("⚠️ Нет доступа к сообщению увольнения msg_id=%s", msg_id_int)
-                skipped += 1
-                continue
-            except discord.HTTPException as e:
-                logger.warning("⚠️ HTTP ошибка при fetch увольнения msg_id=%s: %s", msg_id_int, e)
+            if exists is None:
+                logger.warning("⚠️ Не удалось проверить сообщение увольнения msg_id=%s", msg_id_int)
                 skipped += 1
                 continue
 
-            try:
-                view = FiringView(user_id=user_id)
-                self.bot.add_view(view, message_id=msg_id_int)
-                restored += 1
-            except Exception as e:
-                logger.warning("⚠️ Ошибка восстановления увольнения msg_id=%s: %s", msg_id_int, e, exc_info=True)
-                skipped += 1
+            restored += 1
 
         logger.info(
-            "🔨 Восстановлено кнопок увольнений: %s | удалено из БД: %s | пропущено: %s",
-            restored, deleted, skipped
+            "🔨 Активных кнопок увольнений: %s | удалено из БД: %s | пропущено: %s | запросов к API: %s",
+            restored, deleted, skipped, validator.history_calls + validator.fetch_calls
         )
 
     async def _restore_promotion_views(self):
@@ -242,14 +272,16 @@ class ViewRestorer:
         skipped = 0
 
         channel_ids = list(Config.PROMOTION_CHANNELS.keys()) if isinstance(Config.PROMOTION_CHANNELS, dict) else []
-        channels = {cid: self.bot.get_channel(cid) for cid in channel_ids}
+        channels = [self.bot.get_channel(cid) for cid in channel_ids]
+        channels = [ch for ch in channels if ch]
+
+        validator = await self._prepare_validator(getattr(state, "active_promotion_requests", {}), channels)
 
         for msg_id, data in list((getattr(state, "active_promotion_requests", {}) or {}).items()):
             try:
                 msg_id_int = int(msg_id)
                 discord_id = int((data or {}).get("discord_id", 0))
                 new_rank = str((data or {}).get("new_rank") or "").strip()
-                full_name = str((data or {}).get("full_name") or "сотрудник").strip() or "сотрудник"
             except (TypeError, ValueError):
                 logger.warning("⚠️ Битые данные повышения msg_id=%r", msg_id)
                 if await self._delete_orphan(state.active_promotion_requests, "promotion_requests", msg_id, "битый ID/данные"):
@@ -258,7 +290,8 @@ class ViewRestorer:
                     skipped += 1
                 continue
 
-            if not discord_id or not new_rank:
+            # у холодной записи new_rank ещё не прочитан из БД
+            if not discord_id or (not new_rank and not state.active_promotion_requests.is_cold(msg_id)):
                 logger.warning("⚠️ Некорректные данные повышения msg_id=%s (discord_id/new_rank)", msg_id_int)
                 if await self._delete_orphan(state.active_promotion_requests, "promotion_requests", msg_id_int, "нет discord_id/new_rank"):
                     deleted += 1
@@ -266,45 +299,23 @@ class ViewRestorer:
                     skipped += 1
                 continue
 
-            found = False
-            for _, ch in channels.items():
-                if not ch:
-                    continue
-                try:
-                    await ch.fetch_message(msg_id_int)
-                    found = True
-                    break
-                except discord.NotFound:
-                    continue
-                except discord.Forbidden:
-                    logger.warning("⚠️ Нет доступа к каналу повышения при проверке msg_id=%s", msg_id_int)
-                    continue
-                except discord.HTTPException:
-                    continue
-
-            if not found:
+            found_channel, certain = await validator.locate(channels_for(self.bot, (data or {}).get("channel_id"), channels), msg_id_int)
+            if found_channel is None and not certain:
+                logger.warning("⚠️ Не удалось проверить сообщение повышения msg_id=%s", msg_id_int)
+                skipped += 1
+                continue
+            if found_channel is None:
                 if await self._delete_orphan(state.active_promotion_requests, "promotion_requests", msg_id_int, "сообщение удалено"):
                     deleted += 1
                 else:
                     skipped += 1
                 continue
 
-            try:
-                view = PromotionView(
-                    user_id=discord_id,
-                    new_rank=new_rank,
-                    full_name=full_name,
-                    message_id=msg_id_int,
-                )
-                self.bot.add_view(view, message_id=msg_id_int)
-                restored += 1
-            except Exception as e:
-                logger.warning("⚠️ Ошибка восстановления повышения msg_id=%s: %s", msg_id_int, e, exc_info=True)
-                skipped += 1
+            restored += 1
 
         logger.info(
-            "🔨 Восстановлено кнопок повышений: %s | удалено из БД: %s | пропущено: %s",
-            restored, deleted, skipped
+            "🔨 Активных кнопок повышений: %s | удалено из БД: %s | пропущено: %s | запросов к API: %s",
+            restored, deleted, skipped, validator.history_calls + validator.fetch_calls
         )
 
     async def _restore_warehouse_views(self):
@@ -317,6 +328,9 @@ class ViewRestorer:
         deleted = 0
         skipped = 0
 
+        validator = BulkMessageValidator()
+        await validator.prepare(channel, self._int_ids(getattr(state, "warehouse_requests", {})))
+
         for msg_id, data in list((getattr(state, "warehouse_requests", {}) or {}).items()):
             try:
                 msg_id_int = int(msg_id)
@@ -337,34 +351,23 @@ class ViewRestorer:
                     skipped += 1
                 continue
 
-            try:
-                await channel.fetch_message(msg_id_int)
-            except discord.NotFound:
+            exists = await validator.exists(channel, msg_id_int)
+            if exists is False:
                 if await self._delete_orphan(state.warehouse_requests, "warehouse_requests", msg_id_int, "сообщение удалено"):
                     deleted += 1
                 else:
                     skipped += 1
                 continue
-            except discord.Forbidden:
-                logger.warning("⚠️ Нет доступа к сообщению склада msg_id=%s", msg_id_int)
-                skipped += 1
-                continue
-            except discord.HTTPException as e:
-                logger.warning("⚠️ HTTP ошибка при fetch склада msg_id=%s: %s", msg_id_int, e)
+            if exists is None:
+                logger.warning("⚠️ Не удалось проверить сообщение склада msg_id=%s", msg_id_int)
                 skipped += 1
                 continue
 
-            try:
-                view = WarehouseRequestView(author_id=user_id, message_id=msg_id_int)
-                self.bot.add_view(view, message_id=msg_id_int)
-                restored += 1
-            except Exception as e:
-                logger.warning("⚠️ Ошибка восстановления склада msg_id=%s: %s", msg_id_int, e, exc_info=True)
-                skipped += 1
+            restored += 1
 
         logger.info(
-            "🔨 Восстановлено кнопок склада: %s | удалено из БД: %s | пропущено: %s",
-            restored, deleted, skipped
+            "🔨 Активных кнопок склада: %s | удалено из БД: %s | пропущено: %s | запросов к API: %s",
+            restored, deleted, skipped, validator.history_calls + validator.fetch_calls
         )
 
     async def _restore_department_transfer_views(self):
@@ -377,6 +380,13 @@ class ViewRestorer:
             ch_id = getattr(Config, name, 0)
             if ch_id:
                 apply_channel_ids.append(ch_id)
+        apply_channels = [ch for ch in (self.bot.get_channel(ch_id) for ch_id in apply_channel_ids) if ch]
+
+        pending = {
+            mid: data for mid, data in (getattr(state, "active_department_transfers", {}) or {}).items()
+            if not (int((data or {}).get("approved_source") or 0) and int((data or {}).get("approved_target") or 0))
+        }
+        validator = await self._prepare_validator(pending, apply_channels)
 
         for msg_id, data in list((getattr(state, "active_department_transfers", {}) or {}).items()):
             try:
@@ -392,23 +402,13 @@ class ViewRestorer:
                 skipped += 1
                 continue
 
-            found = False
-            found_channel_id = 0
-            for ch_id in apply_channel_ids:
-                ch = self.bot.get_channel(ch_id)
-                if not ch:
-                    continue
-                try:
-                    await ch.fetch_message(msg_id_int)
-                    found = True
-                    found_channel_id = ch_id
-                    break
-                except discord.NotFound:
-                    continue
-                except (discord.Forbidden, discord.HTTPException):
-                    continue
-
-            if not found:
+            found_channel, certain = await validator.locate(channels_for(self.bot, (data or {}).get("channel_id"), apply_channels), msg_id_int)
+            if found_channel is None and not certain:
+                logger.warning("⚠️ Не удалось проверить заявку перевод msg_id=%s", msg_id_int)
+                skipped += 1
+                continue
+
+            if found_channel is None:
                 state.active_department_transfers.pop(msg_id_int, None)
                 try:
                     await delete_department_transfer_request(msg_id_int)
@@ -418,25 +418,9 @@ class ViewRestorer:
                     skipped += 1
                 continue
 
-            try:
-                view = DepartmentApprovalView(
-                    message_id=msg_id_int,
-                    user_id=int(data.get("user_id", 0)),
-                    target_dept=str(data.get("target_dept", "")),
-                    source_dept=str(data.get("source_dept", "")),
-                    from_academy=bool(data.get("from_academy")),
-                    form_data=dict(data.get("data") or {}),
-                    approved_source=approved_src,
-                    approved_target=approved_tgt,
-                    channel_id=found_channel_id,
-                )
-                self.bot.add_view(view, message_id=msg_id_int)
-                restored += 1
-            except Exception as e:
-                logger.warning("⚠️ Ошибка восстановления заявки перевод msg_id=%s: %s", msg_id_int, e, exc_info=True)
-                skipped += 1
+            restored += 1
 
         logger.info(
-            "🔨 Восстановлено кнопок заявок на перевод: %s | удалено из БД: %s | пропущено: %s",
-            restored, deleted, skipped
+            "🔨 Активных кнопок заявок на перевод: %s | удалено из БД: %s | пропущено: %s | запросов к API: %s",
+            restored, deleted, skipped, validator.history_calls + validator.fetch_calls
         )
\ No newline at end of file
@@ -2,20 +2,44 @@ from datetime import datetime, timedelta
 import logging
 from typing import Dict, Optional
 from config import Config
+from services.expiry import get_expiry
 
 logger = logging.getLogger(__name__)
 
+EXPIRY_NAMESPACE = "кулдауны склада"
+
 
 class WarehouseCooldown:
 
     def __init__(self):
         self.last_issue: Dict[int, datetime] = {}
         self.cooldown_hours = Config.WAREHOUSE_COOLDOWN_HOURS
+        get_expiry().register(EXPIRY_NAMESPACE, self._expire)
+
+    def _schedule(self, user_id: int) -> None:
+        get_expiry().schedule(EXPIRY_NAMESPACE, user_id, self.last_issue[user_id] + timedelta(hours=self.cooldown_hours))
+
+    def _expire(self, user_ids: list) -> None:
+        # истёкший кулдаун ничего не запрещает — убираем запись из памяти и из БД
+        expired = [uid for uid in user_ids if self.last_issue.pop(uid, None) is not None]
+        if not expired:
+            return
+        try:
+            from services.worker_queue import get_worker
+            from database import warehouse_cooldown_clear
+            worker = get_worker()
+            for uid in expired:
+                worker.submit_fire(warehouse_cooldown_clear, uid)
+        except Exception as e:
+            logger.debug("WarehouseCooldown expiry persist: %s", e)
 
     async def load_from_db(self) -> None:
         try:
             from database import warehouse_cooldown_get_all
             self.last_issue = await warehouse_cooldown_get_all()
+            get_expiry().cancel_all(EXPIRY_NAMESPACE)
+            for user_id in self.last_issue:
+                self._schedule(user_id)
             if self.last_issue:
                 logger.info("WarehouseCooldown: загружено %s записей из БД", len(self.last_issue))
         except Exception as e:
@@ -42,11 +66,12 @@ class WarehouseCooldown:
 
     def register_issue(self, user_id: int):
         self.last_issue[user_id] = datetime.now()
+        self._schedule(user_id)
         logger.info("✅ Кулдаун установлен для %s до %s", user_id, self.last_issue[user_id] + timedelta(hours=self.cooldown_hours))
         try:
             from services.worker_queue import get_worker
             from database import warehouse_cooldown_set
-            get_worker().submit_fire(warehouse_cooldown_set(user_id, self.last_issue[user_id]))
+            get_worker().submit_fire(warehouse_cooldown_set, user_id, self.last_issue[user_id])
         except Exception as e:
             logger.debug("WarehouseCooldown persist: %s", e)
 
@@ -70,10 +95,11 @@ class WarehouseCooldown:
     def clear_user(self, user_id: int):
         if user_id in self.last_issue:
             del self.last_issue[user_id]
+            get_expiry().cancel(EXPIRY_NAMESPACE, user_id)
             logger.info("🔄 Кулдаун сброшен для %s", user_id)
         try:
             from services.worker_queue import get_worker
             from database import warehouse_cooldown_clear
-            get_worker().submit_fire(warehouse_cooldown_clear(user_id))
+            get_worker().submit_fire(warehouse_cooldown_clear, user_id)
         except Exception as e:
             logger.debug("WarehouseCooldown clear persist: %s", e)
\ No newline at end of file
@@ -2,12 +2,40 @@ from typing import Dict, List, Any, Tuple, Hashable
 from datetime import datetime, timedelta
 import logging
 from data.warehouse_items import WAREHOUSE_ITEMS
+from services.expiry import get_expiry
 
 logger = logging.getLogger(__name__)
 
+SESSION_TTL = timedelta(hours=24)
+EXPIRY_NAMESPACE = "сессии склада"
+
 user_sessions: Dict[Hashable, Dict[str, Any]] = {}
 
 
+def _schedule(key: Hashable, created: Any) -> None:
+    if not isinstance(created, datetime):
+        created = datetime.now()
+    get_expiry().schedule(EXPIRY_NAMESPACE, key, created + SESSION_TTL)
+
+
+def _expire_sessions(keys: list) -> None:
+    # сессия живёт сутки с момента создания; снимаем из памяти и одной пачкой из БД
+    expired = [key for key in keys if user_sessions.pop(key, None) is not None]
+    if not expired:
+        return
+    try:
+        from services.worker_queue import get_worker
+        from database import warehouse_session_delete
+        worker = get_worker()
+        for key in expired:
+            worker.submit_fire(warehouse_session_delete, key)
+    except Exception as e:
+        logger.debug("WarehouseSession expiry persist: %s", e)
+
+
+get_expiry().register(EXPIRY_NAMESPACE, _expire_sessions)
+
+
 def _normalize_key(session_key: Hashable) -> Hashable | None:
     if session_key in user_sessions:
         return session_key
@@ -20,36 +48,18 @@ class WarehouseSession:
     @staticmethod
     def load_sessions_into_memory(sessions_dict: Dict[str, Dict[str, Any]]) -> None:
         user_sessions.clear()
+        get_expiry().cancel_all(EXPIRY_NAMESPACE)
         for key, data in sessions_dict.items():
             user_sessions[key] = {
                 "items": list((data.get("items") or [])),
                 "created_at": data.get("created_at") or datetime.now(),
             }
+            _schedule(key, user_sessions[key]["created_at"])
         if sessions_dict:
             logger.info("WarehouseSession: загружено %s сессий из БД", len(sessions_dict))
 
-    @staticmethod
-    def purge_expired(max_age_hours: int = 24) -> int:
-        cutoff = datetime.now() - timedelta(hours=max_age_hours)
-        to_delete = []
-
-        for key, session in list(user_sessions.items()):
-            created = session.get("created_at")
-            if isinstance(created, datetime) and created < cutoff:
-                to_delete.append(key)
-
-        for key in to_delete:
-            user_sessions.pop(key, None)
-
-        if to_delete:
-            logger.info("🧹 WarehouseSession: очищено %s старых сессий", len(to_delete))
-
-        return len(to_delete)
-
     @staticmethod
     def get_session(session_key: Hashable) -> Dict[str, Any]:
-        WarehouseSession.purge_expired(24)
-
         key = _normalize_key(session_key)
         if key is not None:
             return user_sessions[key]
@@ -57,6 +67,7 @@ class WarehouseSession:
             "items": [],
             "created_at": datetime.now(),
         }
+        _schedule(session_key, user_sessions[session_key]["created_at"])
         return user_sessions[session_key]
 
     @staticmethod
@@ -67,7 +78,7 @@ class WarehouseSession:
             from services.worker_queue import get_worker
             from database import warehouse_session_set
             get_worker().submit_fire(
-                warehouse_session_set(session_key, session["items"], session.get("created_at"))
+                warehouse_session_set, session_key, session["items"], session.get("created_at")
             )
         except Exception as e:
             logger.debug("WarehouseSession persist: %s", e)
@@ -118,7 +129,7 @@ class WarehouseSession:
             from services.worker_queue import get_worker
             from database import warehouse_session_set
             get_worker().submit_fire(
-                warehouse_session_set(session_key, session["items"], session.get("created_at"))
+                warehouse_session_set, session_key, session["items"], session.get("created_at")
             )
         except Exception as e:
             logger.debug("WarehouseSession persist: %s", e)
@@ -133,14 +144,13 @@ class WarehouseSession:
     def clear_session(session_key: Hashable):
         key = _normalize_key(session_key)
         k = key if key in user_sessions else str(session_key)
-        if k in user_sessions:
-            user_sessions.pop(k, None)
-        if session_key in user_sessions:
-            user_sessions.pop(session_key, None)
+        for candidate in {k, session_key}:
+            if user_sessions.pop(candidate, None) is not None:
+                get_expiry().cancel(EXPIRY_NAMESPACE, candidate)
         try:
             from services.worker_queue import get_worker
             from database import warehouse_session_delete
-            get_worker().submit_fire(warehouse_session_delete(session_key))
+            get_worker().submit_fire(warehouse_session_delete, session_key)
         except Exception as e:
             logger.debug("WarehouseSession delete persist: %s", e)
 
@@ -153,7 +163,7 @@ class WarehouseSession:
                 from services.worker_queue import get_worker
                 from database import warehouse_session_set
                 get_worker().submit_fire(
-                    warehouse_session_set(session_key, session["items"], session.get("created_at"))
+                    warehouse_session_set, session_key, session["items"], session.get("created_at")
                 )
             except Exception as e:
                 logger.debug("WarehouseSession persist: %s", e)
@@ -8,6 +8,7 @@ from state import active_firing_requests, active_promotion_requests
 from database import save_request
 from views.firing_view import FiringView
 from views.promotion_view import PromotionView
+from views.component_router import render_only
 from models import FiringRequest, PromotionRequest
 from constants import WebhookPatterns
 
@@ -40,19 +41,11 @@ class WebhookHandler:
                 return
 
             embed = message.embeds[0]
-            title = (embed.title or "").strip()
-
-
-            if title == "РАПОРТ ОБ УВОЛЬНЕНИИ":
+            kind = self.detect_kind(embed)
+            if kind == "firing":
                 await self.process_firing(message, embed)
-                return
-
-
-            for field in (embed.fields or []):
-                field_name = (field.name or "").strip()
-                if "👤" in field_name and "|" in field_name:
-                    await self.process_promotion(message, embed)
-                    return
+            elif kind == "promotion":
+                await self.process_promotion(message, embed)
 
         except Exception as e:
             logger.error(
@@ -63,6 +56,17 @@ class WebhookHandler:
                 exc_info=True,
             )
 
+    @staticmethod
+    def detect_kind(embed: discord.Embed) -> str | None:
+        title = (embed.title or "").strip()
+        if title == "РАПОРТ ОБ УВОЛЬНЕНИИ":
+            return "firing"
+        for field in (embed.fields or []):
+            field_name = (field.name or "").strip()
+            if "👤" in field_name and "|" in field_name:
+                return "promotion"
+        return None
+
     async def process_firing(self, message: discord.Message, embed: discord.Embed):
         data = self._parse_firing_embed(embed)
         if not data:
@@ -70,48 +74,7 @@ class WebhookHandler:
             return
 
         try:
-            from modals.firing_apply_modal import _build_firing_embed
-            from datetime import datetime
-
-            created_at = datetime.now()
-            with_recovery = "с возможностью восстановления" in (data.get("recovery_option") or "")
-            new_embed = _build_firing_embed(
-                discord_id=data["discord_id"],
-                full_name=data["full_name"],
-                rank=data.get("rank") or "—",
-                photo_link=data.get("photo_link") or "—",
-                with_recovery=with_recovery,
-                reason=data["reason"],
-                created_at=created_at,
-            )
-            view = FiringView(user_id=data["discord_id"])
-
-            role_mention = f"<@&{Config.FIRING_STAFF_ROLE_ID}>"
-
-            bot_msg = await message.channel.send(
-                content=role_mention,
-                embed=new_embed,
-                view=view
-            )
-
-            firing_request = FiringRequest(
-                discord_id=data["discord_id"],
-                full_name=data["full_name"],
-                rank=data.get("rank") or "",
-                reason=data["reason"],
-                recovery_option=data.get("recovery_option", "без возможности восстановления"),
-                photo_link=data.get("photo_link"),
-            )
-            firing_request.message_link = bot_msg.jump_url
-
-            active_firing_requests[bot_msg.id] = firing_request.to_dict()
-
-            await save_request(
-                "firing_requests",
-                bot_msg.id,
-                firing_request.to_dict()
-            )
-
+            bot_msg = await self.publish_firing(message.channel, data)
 
             try:
                 await message.delete()
@@ -142,42 +105,7 @@ class WebhookHandler:
             return
 
         try:
-            new_embed = discord.Embed.from_dict(embed.to_dict())
-            view = PromotionView(
-                user_id=data["discord_id"],
-                new_rank=data["new_rank"],
-                full_name=data["full_name"],
-                message_id=0  # временно, обновим после отправки
-            )
-
-            bot_msg = await message.channel.send(embed=new_embed, view=view)
-
-            promo_request = PromotionRequest(
-                discord_id=data["discord_id"],
-                full_name=data["full_name"],
-                new_rank=data["new_rank"],
-                message_link=bot_msg.jump_url
-            )
-
-            active_promotion_requests[bot_msg.id] = promo_request.to_dict()
-
-            await save_request(
-                "promotion_requests",
-                bot_msg.id,
-                promo_request.to_dict()
-            )
-
-
-            view.message_id = bot_msg.id
-            try:
-                await bot_msg.edit(view=view)
-            except discord.NotFound:
-                logger.warning("Сообщение повышения исчезло до обновления view (msg_id=%s)", bot_msg.id)
-            except discord.Forbidden:
-                logger.warning("Нет прав обновить view у сообщения повышения (msg_id=%s)", bot_msg.id)
-            except discord.HTTPException as e:
-                logger.warning("HTTP ошибка при обновлении view у повышения (msg_id=%s): %s", bot_msg.id, e)
-
+            bot_msg = await self.publish_promotion(message.channel, data, embed)
 
             try:
                 await message.delete()
@@ -202,6 +130,101 @@ class WebhookHandler:
         except Exception as e:
             logger.error("❌ Ошибка process_promotion (src_msg=%s): %s", message.id, e, exc_info=True)
 
+    # Публикация рапорта одним send: общая для webhook-сообщения и для встроенного приёма JSON.
+    async def publish_firing(self, channel, data: dict) -> discord.Message:
+        from modals.firing_apply_modal import _build_firing_embed
+        from datetime import datetime
+
+        with_recovery = "с возможностью восстановления" in (data.get("recovery_option") or "")
+        new_embed = _build_firing_embed(
+            discord_id=data["discord_id"],
+            full_name=data["full_name"],
+            rank=data.get("rank") or "—",
+            photo_link=data.get("photo_link") or "—",
+            with_recovery=with_recovery,
+            reason=data["reason"],
+            created_at=datetime.now(),
+        )
+        view = render_only(FiringView(user_id=data["discord_id"]))
+
+        role_mention = f"<@&{Config.FIRING_STAFF_ROLE_ID}>"
+
+        bot_msg = await channel.send(
+            content=role_mention,
+            embed=new_embed,
+            view=view
+        )
+
+        firing_request = FiringRequest(
+            discord_id=data["discord_id"],
+            full_name=data["full_name"],
+            rank=data.get("rank") or "",
+            reason=data["reason"],
+            recovery_option=data.get("recovery_option", "без возможности восстановления"),
+            photo_link=data.get("photo_link"),
+            channel_id=bot_msg.channel.id,
+        )
+        firing_request.message_link = bot_msg.jump_url
+
+        record = firing_request.to_record()
+        active_firing_requests[bot_msg.id] = record
+
+        await save_request(
+            "firing_requests",
+            bot_msg.id,
+            record.to_dict()
+        )
+        return bot_msg
+
+    async def publish_promotion(self, channel, data: dict, embed: discord.Embed | None = None) -> discord.Message:
+        if embed is not None:
+            new_embed = discord.Embed.from_dict(embed.to_dict())
+        else:
+            new_embed = self._build_promotion_embed(data)
+        view = render_only(PromotionView(
+            user_id=data["discord_id"],
+            new_rank=data["new_rank"],
+            full_name=data["full_name"],
+            message_id=0,
+        ))
+
+        bot_msg = await channel.send(embed=new_embed, view=view)
+
+        promo_request = PromotionRequest(
+            discord_id=data["discord_id"],
+            full_name=data["full_name"],
+            new_rank=data["new_rank"],
+            message_link=bot_msg.jump_url,
+            channel_id=bot_msg.channel.id,
+        )
+
+        record = promo_request.to_record()
+        active_promotion_requests[bot_msg.id] = record
+
+        await save_request(
+            "promotion_requests",
+            bot_msg.id,
+            record.to_dict()
+        )
+        return bot_msg
+
+    # Тот же вид, что у рапорта из формы: поле «👤 Имя | Звание» с упоминанием — его разбирает _parse_promotion_embed.
+    def _build_promotion_embed(self, data: dict) -> discord.Embed:
+        embed = discord.Embed(title=data.get("title") or "Рапорт на повышение", color=discord.Color.blue())
+        if data.get("description"):
+            embed.description = str(data["description"])[:4000]
+        embed.add_field(
+            name=f"👤 {data['full_name']} | {data['new_rank']}"[:256],
+            value=f"<@{data['discord_id']}>",
+            inline=False,
+        )
+        for field in (data.get("fields") or [])[:20]:
+            name = str(field.get("name") or "").strip()
+            value = str(field.get("value") or "").strip()
+            if name and value:
+                embed.add_field(name=name[:256], value=value[:1024], inline=False)
+        return embed
+
     def _parse_firing_embed(self, embed: discord.Embed):
         description = (embed.description or "").strip()
         if not description:
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+import discord
+
+from config import Config
+from database import webhook_seen_add, webhook_seen_load, webhook_seen_prune
+from services.worker_queue import get_worker
+
+logger = logging.getLogger(__name__)
+
+
+# on_message только кладёт webhook-сообщение в очередь и возвращается; рапорты обрабатывают
+# consumers задач параллельно. Очередь ограничена: при переполнении on_message ждёт место.
+# Id обработанных сообщений хранятся (последние dedupe_keep — и в памяти, и в БД), поэтому повторная
+# доставка того же сообщения шлюзом, в том числе после перезапуска, второй рапорт не создаёт.
+# Пока сообщение в очереди или в обработке, повтор отсекается по _inflight; в _seen и БД id попадает
+# только после успешной обработки — если она упала, повторная доставка обработает рапорт заново.
+class WebhookQueue:
+    def __init__(self, handler, maxsize: int | None = None, consumers: int | None = None, dedupe_keep: int | None = None):
+        self.handler = handler
+        self.maxsize = max(1, int(maxsize if maxsize is not None else getattr(Config, "WEBHOOK_QUEUE_SIZE", 100)))
+        self.consumers = max(1, int(consumers if consumers is not None else getattr(Config, "WEBHOOK_CONSUMERS", 2)))
+        self.dedupe_keep = max(1, int(dedupe_keep if dedupe_keep is not None else getattr(Config, "WEBHOOK_DEDUPE_KEEP", 1000)))
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.maxsize)
+        self._seen: OrderedDict[int, None] = OrderedDict()
+        self._inflight: set[int] = set()
+        self.accepted = 0
+        self.duplicates = 0
+        self.processed = 0
+        self.failed = 0
+        self.full_waits = 0
+        self.max_backlog = 0
+        self._wait_total = 0.0
+        self._proc_total = 0.0
+        self.max_proc = 0.0
+
+    @property
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+    def _remember(self, message_id: int) -> None:
+        self._seen[message_id] = None
+        while len(self._seen) > self.dedupe_keep:
+            self._seen.popitem(last=False)
+
+    async def load_seen(self) -> int:
+        await webhook_seen_prune(self.dedupe_keep)
+        for message_id in await webhook_seen_load(self.dedupe_keep):
+            self._remember(message_id)
+        return len(self._seen)
+
+    async def submit(self, message: discord.Message) -> bool:
+        message_id = int(message.id)
+        if message_id in self._seen or message_id in self._inflight:
+            self.duplicates += 1
+            logger.info("Webhook-сообщение %s уже принято, повтор пропущен", message_id)
+            return False
+        self._inflight.add(message_id)
+
+        if self._queue.full():
+            self.full_waits += 1
+            logger.warning("Очередь webhook-сообщений заполнена (%s), ждём место", self.maxsize)
+        try:
+            await self._queue.put((time.monotonic(), message))
+        except BaseException:
+            self._inflight.discard(message_id)
+            raise
+        self.accepted += 1
+        self.max_backlog = max(self.max_backlog, self._queue.qsize())
+        return True
+
+    async def _consume(self, index: int) -> None:
+        while True:
+            queued_at, message = await self._queue.get()
+            started = time.monotonic()
+            self._wait_total += started - queued_at
+            message_id = int(message.id)
+            try:
+                await self.handler.process_webhook(message)
+                self._remember(message_id)
+                get_worker().submit_fire(webhook_seen_add, message_id)
+            except Exception as e:
+                self.failed += 1
+                logger.error("Очередь webhook: ошибка обработки msg_id=%s: %s", message_id, e, exc_info=True)
+            finally:
+                self._inflight.discard(message_id)
+                elapsed = time.monotonic() - started
+                self._proc_total += elapsed
+                self.max_proc = max(self.max_proc, elapsed)
+                self.processed += 1
+                self._queue.task_done()
+
+    async def run(self) -> None:
+        await asyncio.gather(*(self._consume(i) for i in range(self.consumers)))
+
+    async def join(self) -> None:
+        await self._queue.join()
+
+    def stats(self) -> dict:
+        done = self.processed or 1
+        return {
+            "backlog": self.backlog,
+            "max_backlog": self.max_backlog,
+            "consumers": self.consumers,
+            "accepted": self.accepted,
+            "processed": self.processed,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "full_waits": self.full_waits,
+            "avg_wait_ms": round(self._wait_total * 1000 / done, 1),
+            "avg_proc_ms": round(self._proc_total * 1000 / done, 1),
+            "max_proc_ms": round(self.max_proc * 1000, 1),
+        }
+
+
+queue: WebhookQueue | None = None
+
+
+def get_webhook_queue() -> WebhookQueue | None:
+    return queue
+
+
+def init_webhook_queue(handler) -> WebhookQueue:
+    global queue
+    if queue is None:
+        queue = WebhookQueue(handler)
+    return queue
@@ -30,11 +30,31 @@ class WorkerQueue:
         *args: Any,
         **kwargs: Any,
     ) -> None:
+        if self._write_behind(fn, args, kwargs):
+            return
         try:
             self._queue.put_nowait((fn, args, kwargs, None))
         except asyncio.QueueFull:
             logger.warning("Очередь воркера переполнена, задача %s пропущена", getattr(fn, "__name__", fn))
 
+    def _write_behind(self, fn: Any, args: tuple, kwargs: dict) -> bool:
+        if asyncio.iscoroutine(fn):
+            return False
+        from database import WRITE_BEHIND_STATEMENTS
+        from services.write_journal import get_journal
+
+        journal = get_journal()
+        build = WRITE_BEHIND_STATEMENTS.get(fn)
+        if journal is None or build is None:
+            return False
+        try:
+            key, sql, params = build(*args, **kwargs)
+        except Exception as e:
+            logger.warning("Воркер: не удалось подготовить запись %s: %s", getattr(fn, "__name__", fn), e)
+            return True
+        journal.add(key, sql, params)
+        return True
+
     async def _run_worker(self) -> None:
         while self._running:
             try:
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable
+
+import database
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def _key_table(key: Any) -> str | None:
+    # ключ записи — (таблица, первичный ключ...); None значит «неизвестно какая таблица»
+    return key[0] if isinstance(key, tuple) and key else None
+
+
+class WriteJournal:
+    def __init__(self, flush_interval_ms: int = 50, max_ops: int = 100):
+        self.flush_interval = max(1, int(flush_interval_ms)) / 1000
+        self.max_ops = max(1, int(max_ops))
+        self._pending: Dict[Any, tuple[str, tuple]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._inflight: set | None = None
+        self.ops_received = 0
+        self.ops_coalesced = 0
+        self.ops_written = 0
+        self.ops_failed = 0
+        self.flushes = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def barrier(self, tables: Iterable[str] = ()) -> None:
+        # Перед чтением/прямой записью таблиц: сбросить их записи из очереди и дождаться пакета,
+        # который уже пишется (его строк нет в _pending, но в БД их ещё тоже нет).
+        # Без tables — все таблицы. Чтения других таблиц пакет не трогают, и он успевает набраться.
+        wanted = set(tables)
+
+        def touches(names: set) -> bool:
+            return not wanted or None in names or bool(wanted & names)
+
+        if self._pending and touches({_key_table(key) for key in self._pending}):
+            await self.flush()
+        elif self._inflight is not None and touches(self._inflight):
+            async with self._lock:
+                pass
+
+    def add(self, key: Any, sql: str, params: tuple) -> None:
+        self.ops_received += 1
+        if self._pending.pop(key, None) is not None:
+            self.ops_coalesced += 1
+        self._pending[key] = (sql, params)
+        if len(self._pending) >= self.max_ops:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._schedule_flush)
+
+    def _schedule_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_safe())
+
+    async def _flush_safe(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Журнал записей: ошибка сброса: %s", e, exc_info=True)
+
+    async def flush(self) -> int:
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            statements = [(key, sql, params) for key, (sql, params) in batch.items()]
+            self._inflight = {_key_table(key) for key in batch}
+            started = time.perf_counter()
+            try:
+                written = await database.execute_batch(statements)
+            except Exception as e:
+                logger.warning("Журнал записей: пакет из %s операций не записан (%s), пишу по одной", len(statements), e)
+                written = 0
+                for stmt in statements:
+                    try:
+                        written += await database.execute_batch([stmt])
+                    except Exception as err:
+                        self.ops_failed += 1
+                        logger.error("Журнал записей: не удалось записать %s: %s", stmt[0], err)
+            finally:
+                self._inflight = None
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.flushes += 1
+            self.ops_written += written
+            self.last_batch_size = len(statements)
+            self.max_batch_size = max(self.max_batch_size, len(statements))
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+            return written
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "received": self.ops_received,
+            "coalesced": self.ops_coalesced,
+            "written": self.ops_written,
+            "failed": self.ops_failed,
+            "flushes": self.flushes,
+            "last_batch": self.last_batch_size,
+            "max_batch": self.max_batch_size,
+            "avg_batch": round(self.ops_written / self.flushes, 1) if self.flushes else 0.0,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 2) if self.flushes else 0.0,
+        }
+
+
+journal: WriteJournal | None = None
+
+
+def get_journal() -> WriteJournal | None:
+    return journal
+
+
+def init_journal(flush_interval_ms: int | None = None, max_ops: int | None = None) -> WriteJournal:
+    global journal
+    journal = WriteJournal(
+        flush_interval_ms=Config.DB_FLUSH_INTERVAL_MS if flush_interval_ms is None else flush_interval_ms,
+        max_ops=Config.DB_FLUSH_MAX_OPS if max_ops is None else max_ops,
+    )
+    database.attach_write_journal(journal)
+    return journal
@@ -1,23 +1,32 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Optional
 import discord
 from discord.ext import commands
 
+from models import DepartmentTransferRecord, FiringRecord, PromotionRecord, RequestRecord, WarehouseRecord
+from config import Config
+from utils.draft_cache import DraftCache
+from utils.request_store import RequestStore
+
 bot: Optional[commands.Bot] = None  # Теперь с правильным типом
-active_requests: Dict[int, Dict] = {}
-active_firing_requests: Dict[int, Dict] = {}
-active_promotion_requests: Dict[int, Dict] = {}
-orls_draft_reports: Dict[int, Dict] = {}
-orls_last_user_data: Dict[int, Dict[str, str]] = {}
-osb_draft_reports: Dict[int, Dict] = {}
-osb_last_user_data: Dict[int, Dict[str, str]] = {}
-grom_draft_reports: Dict[int, Dict] = {}
-grom_last_user_data: Dict[int, Dict[str, str]] = {}
-pps_draft_reports: Dict[int, Dict] = {}
-pps_last_user_data: Dict[int, Dict[str, str]] = {}
+active_requests: RequestStore = RequestStore("user_id", record=RequestRecord)
+active_firing_requests: RequestStore = RequestStore("discord_id", record=FiringRecord)
+active_promotion_requests: RequestStore = RequestStore("discord_id", record=PromotionRecord)
+# Черновики рапортов на повышение: отдел -> user_id -> черновик (LRU, холодные подгружаются из БД)
+_DRAFT_CACHE_LIMITS = (Config.PROMOTION_DRAFT_CACHE_MAX, Config.PROMOTION_DRAFT_CACHE_IDLE_MIN * 60)
+promotion_draft_reports: Dict[str, DraftCache] = {d: DraftCache(*_DRAFT_CACHE_LIMITS) for d in ("orls", "osb", "grom", "pps")}
+promotion_last_user_data: Dict[str, DraftCache] = {d: DraftCache(*_DRAFT_CACHE_LIMITS) for d in ("orls", "osb", "grom", "pps")}
+orls_draft_reports = promotion_draft_reports["orls"]
+orls_last_user_data = promotion_last_user_data["orls"]
+osb_draft_reports = promotion_draft_reports["osb"]
+osb_last_user_data = promotion_last_user_data["osb"]
+grom_draft_reports = promotion_draft_reports["grom"]
+grom_last_user_data = promotion_last_user_data["grom"]
+pps_draft_reports = promotion_draft_reports["pps"]
+pps_last_user_data = promotion_last_user_data["pps"]
 role_cache = None
 channel_cache = None
-warehouse_requests: Dict[int, Dict] = {}  # Для заявок склада
-active_department_transfers: Dict[int, Dict[str, Any]] = {}  # Заявки на перевод между отделами
+warehouse_requests: RequestStore = RequestStore("user_id", record=WarehouseRecord)  # Для заявок склада
+active_department_transfers: RequestStore = RequestStore("user_id", record=DepartmentTransferRecord)  # Заявки на перевод между отделами
 
 promotion_setup_messages: Dict[int, list] = {}
-promotion_setup_move_cooldown: Dict[int, float] = {}
\ No newline at end of file
+component_routers: list = []  # Постоянные маршрутизаторы кнопок заявок (по одному на тип)
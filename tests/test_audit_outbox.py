@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+
+import pytest
+
+
+@pytest.fixture
+async def outbox_db(monkeypatch):
+    import database
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    monkeypatch.setattr(database, "DB_PATH", path)
+    await database.init_db()
+    yield database
+    await database.close_db()
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_failed_post_is_retried_then_delivered(outbox_db):
+    from services.audit_outbox import AuditOutbox
+
+    outbox = AuditOutbox(max_attempts=3, backoff_base_sec=0, backoff_max_sec=0)
+    results = [(False, "status=500"), (True, "")]
+
+    async def post(payload):
+        return results.pop(0)
+
+    outbox._post = post
+    await outbox.enqueue({"url": "http://form", "data": {"a": "1"}, "action": "Принят", "target_id": 1})
+
+    assert await outbox.deliver_due() == 0
+    assert (await outbox.refresh_counts())["pending"] == 1
+    assert await outbox.deliver_due() == 1
+    counts = await outbox.refresh_counts()
+    assert counts["pending"] == 0 and counts["delivered"] == 1
+    assert outbox.stats()["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_row_fails_after_max_attempts_and_replay_requeues(outbox_db):
+    from services.audit_outbox import AuditOutbox
+
+    outbox = AuditOutbox(max_attempts=2, backoff_base_sec=0, backoff_max_sec=0)
+    form_up = {"ok": False}
+
+    async def post(payload):
+        return (True, "") if form_up["ok"] else (False, "таймаут")
+
+    outbox._post = post
+    await outbox.enqueue({"url": "http://form", "data": {}})
+    await outbox.deliver_due()
+    await outbox.deliver_due()
+    assert (await outbox.refresh_counts())["failed"] == 1
+    assert await outbox.deliver_due() == 0
+
+    form_up["ok"] = True
+    assert await outbox.replay_failed() == 1
+    assert await outbox.deliver_due() == 1
+    assert (await outbox.refresh_counts())["failed"] == 0
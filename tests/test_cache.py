@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+
+class _Guild:
+    def __init__(self, gid, roles=(), channels=()):
+        self.id = gid
+        self.roles = list(roles)
+        self.channels = list(channels)
+        self.lookups = 0
+
+    def get_role(self, role_id):
+        self.lookups += 1
+        return next((r for r in self.roles if r.id == role_id), None)
+
+
+class _Bot:
+    def __init__(self, guild):
+        self.guild = guild
+
+    def get_guild(self, gid):
+        return self.guild if gid == self.guild.id else None
+
+    def get_channel(self, cid):
+        return next((c for c in self.guild.channels if c.id == cid), None)
+
+    def is_ready(self):
+        return True
+
+
+def test_role_cache_hits_misses_and_events():
+    from services.cache import RoleCache
+
+    guild = _Guild(1)
+    role = SimpleNamespace(id=10, guild=guild, name="staff")
+    guild.roles.append(role)
+    cache = RoleCache(_Bot(guild))
+
+    assert cache.get_role(1, 10) is role
+    assert cache.get_role(1, 10) is role
+    assert cache.get_role(1, 99) is None
+    assert cache.get_role(1, 99) is None
+    assert guild.lookups == 2
+    assert cache.get_many_roles(1, [10, 99]) == [role, None]
+
+    created = SimpleNamespace(id=99, guild=guild, name="new")
+    cache.on_role_upsert(created)
+    assert cache.get_role(1, 99) is created
+
+    cache.on_role_delete(role)
+    guild.roles.remove(role)
+    assert cache.get_role(1, 10) is None
+
+    st = cache.stats()
+    assert (st["hits"], st["negative_hits"], st["misses"], st["evictions"]) == (3, 2, 3, 1)
+
+
+def test_channel_cache_refresh_and_delete():
+    from services.cache import ChannelCache
+
+    guild = _Guild(1)
+    ch = SimpleNamespace(id=5, guild=guild)
+    guild.channels.append(ch)
+    cache = ChannelCache(_Bot(guild))
+
+    assert cache.get_channel(7) is None
+    assert cache.refresh_guild(1) == 1
+    assert cache.stats()["missing"] == 0
+    assert cache.get_channel(5) is ch
+    assert cache.stats()["misses"] == 1
+
+    cache.on_channel_delete(ch)
+    guild.channels.remove(ch)
+    assert cache.get_channel(5) is None
+    assert cache.stats()["evictions"] == 1
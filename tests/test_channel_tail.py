@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+
+class _Msg:
+    def __init__(self, mid):
+        self.id = mid
+
+
+class _Channel:
+    def __init__(self, cid, ids):
+        self.id = cid
+        self.ids = list(ids)
+        self.history_calls = 0
+
+    def history(self, limit=1):
+        self.history_calls += 1
+        ids = sorted(self.ids, reverse=True)[:limit]
+
+        async def gen():
+            for mid in ids:
+                yield _Msg(mid)
+
+        return gen()
+
+
+class _Delete:
+    def __init__(self, channel_id, message_id):
+        self.channel_id = channel_id
+        self.message_id = message_id
+
+
+@pytest.mark.asyncio
+async def test_tail_known_from_events_without_history():
+    from services.channel_tail import ChannelTailTracker
+
+    tracker = ChannelTailTracker()
+    channel = _Channel(1, [10, 20])
+
+    assert await tracker.fetch_last_id(channel) == 20
+    assert channel.history_calls == 1
+
+    tracker.observe(1, 30)
+    tracker.observe(2, 99)  # канал не наблюдается
+    assert await tracker.fetch_last_id(channel) == 30
+    assert tracker.last_id(2) is None
+
+    tracker.on_raw_message_delete(_Delete(1, 30))
+    assert await tracker.fetch_last_id(channel) == 20
+    assert channel.history_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_tail_unknown_after_last_known_deleted_or_reset():
+    from services.channel_tail import ChannelTailTracker
+
+    tracker = ChannelTailTracker()
+    channel = _Channel(1, [10])
+    tracker.watch(1)
+    tracker.observe(1, 10)
+
+    tracker.on_raw_message_delete(_Delete(1, 10))
+    assert tracker.last_id(1) is None
+
+    channel.ids = [5]
+    assert await tracker.fetch_last_id(channel) == 5
+
+    tracker.reset()
+    assert tracker.last_id(1) is None
+    channel.ids = []
+    assert await tracker.fetch_last_id(channel) == 0
+    assert tracker.last_id(1) == 0
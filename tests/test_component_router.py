@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import discord
+import pytest
+from discord.ui import View
+
+
+class _Response:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, content=None, **kwargs):
+        self.sent.append(content)
+
+
+class _Interaction:
+    def __init__(self, custom_id, message_id):
+        self.data = {"custom_id": custom_id}
+        self.message = type("M", (), {"id": message_id})()
+        self.response = _Response()
+
+
+class _TargetView(View):
+    def __init__(self, message_id, calls):
+        super().__init__(timeout=None)
+        self.message_id = message_id
+        self.calls = calls
+
+    @discord.ui.button(label="ok", custom_id="fire_accept")
+    async def accept(self, interaction, button):
+        self.calls.append((self.message_id, button.custom_id))
+
+    @discord.ui.button(label="no", custom_id="fire_reject", disabled=True)
+    async def reject(self, interaction, button):
+        self.calls.append((self.message_id, button.custom_id))
+
+
+@pytest.mark.asyncio
+async def test_router_dispatches_by_message_id_and_custom_id():
+    from views.component_router import ComponentRouter
+
+    calls = []
+    pending = {10, 20}
+
+    async def factory(interaction, message_id):
+        return _TargetView(message_id, calls) if message_id in pending else None
+
+    router = ComponentRouter("firing", ("fire_accept", "fire_reject"), factory)
+    assert router.is_persistent()
+
+    await router._dispatch(_Interaction("fire_accept", 20))
+    assert calls == [(20, "fire_accept")]
+
+    missing = _Interaction("fire_accept", 30)
+    await router._dispatch(missing)
+    assert router.missing == 1 and missing.response.sent
+
+    disabled = _Interaction("fire_reject", 10)
+    await router._dispatch(disabled)
+    assert calls == [(20, "fire_accept")] and disabled.response.sent
+
+
+@pytest.mark.asyncio
+async def test_render_only_view_still_renders_components():
+    from views.component_router import render_only
+
+    view = render_only(_TargetView(1, []))
+    # discord.py привязывает View к сообщению только если он не остановлен
+    assert view.is_finished()
+    assert [c["custom_id"] for c in view.to_components()[0]["components"]] == ["fire_accept", "fire_reject"]
@@ -10,6 +10,11 @@ def temp_db_path():
     fd, path = tempfile.mkstemp(suffix=".db")
     os.close(fd)
     yield path
+    for suffix in ("-wal", "-shm"):
+        try:
+            os.unlink(path + suffix)
+        except FileNotFoundError:
+            pass
     try:
         os.unlink(path)
     except FileNotFoundError:
@@ -29,5 +34,157 @@ async def test_init_db_creates_tables(temp_db_path, monkeypatch):
             "SELECT name FROM sqlite_master WHERE type='table' AND name='requests'"
         )
         row = await cursor.fetchone()
+    await database.close_db()
     assert row is not None
     assert row[0] == "requests"
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_connections(temp_db_path, monkeypatch):
+    import database
+    monkeypatch.setattr(database, "DB_PATH", temp_db_path)
+
+    try:
+        await database.init_db()
+        async with database._get_conn() as first:
+            pass
+        await database.save_request("requests", 1, {"user_id": 5, "request_type": "cadet"})
+        async with database._get_conn() as second:
+            pass
+        assert first is second
+        loaded = await database.load_all_requests()
+        assert loaded[1]["user_id"] == 5
+    finally:
+        await database.close_db()
+
+
+@pytest.mark.asyncio
+async def test_legacy_draft_tables_are_migrated(temp_db_path, monkeypatch):
+    import aiosqlite
+    import database
+    monkeypatch.setattr(database, "DB_PATH", temp_db_path)
+
+    async with aiosqlite.connect(temp_db_path) as conn:
+        await conn.execute("CREATE TABLE orls_draft_reports (user_id INTEGER PRIMARY KEY, data TEXT NOT NULL, updated_at TEXT)")
+        await conn.execute("CREATE TABLE pps_draft_reports (user_id INTEGER PRIMARY KEY, data TEXT NOT NULL, updated_at TEXT)")
+        await conn.execute("INSERT INTO orls_draft_reports VALUES (1, '{\"a\": 1}', '2020-01-01T00:00:00')")
+        await conn.execute("INSERT INTO pps_draft_reports VALUES (1, '{\"b\": 2}', '2999-01-01T00:00:00')")
+        await conn.commit()
+
+    try:
+        await database.init_db()
+        assert (await database.load_promotion_draft("orls", 1))["a"] == 1
+        assert (await database.load_promotion_draft("pps", 1))["b"] == 2
+        assert await database.load_promotion_draft("osb", 1) is None
+
+        assert await database.cleanup_old_promotion_drafts({"orls": 14, "pps": 14}) == 1
+        assert await database.load_promotion_draft("orls", 1) is None
+        assert await database.load_promotion_draft("pps", 1) is not None
+    finally:
+        await database.close_db()
+
+
+@pytest.mark.asyncio
+async def test_migrations_upgrade_v0_database(temp_db_path, monkeypatch):
+    import aiosqlite
+    import database
+    monkeypatch.setattr(database, "DB_PATH", temp_db_path)
+
+    async with aiosqlite.connect(temp_db_path) as conn:
+        await conn.execute("CREATE TABLE requests (message_id INTEGER PRIMARY KEY, user_id INTEGER, data TEXT, created_at TEXT, request_type TEXT)")
+        await conn.execute("CREATE TABLE firing_requests (message_id INTEGER PRIMARY KEY, discord_id INTEGER, data TEXT, created_at TEXT)")
+        await conn.execute("INSERT INTO requests VALUES (10, 5, '{\"user_id\": 5}', '2024-01-01T00:00:00', 'cadet')")
+        await conn.commit()
+        cursor = await conn.execute("PRAGMA user_version")
+        assert (await cursor.fetchone())[0] == 0
+
+    try:
+        await database.init_db()
+        async with database._get_read_conn() as conn:
+            assert await database._get_user_version(conn) == database.SCHEMA_VERSION
+            cursor = await conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%'")
+            indexes = {row[0] for row in await cursor.fetchall()}
+            cursor = await conn.execute("EXPLAIN QUERY PLAN SELECT message_id FROM requests WHERE created_at < ?", ("2025",))
+            plan = " ".join(str(row[-1]) for row in await cursor.fetchall())
+        assert {"idx_requests_created_at", "idx_requests_user_id", "idx_firing_requests_discord_id"} <= indexes
+        assert "idx_requests_created_at" in plan
+        assert (await database.load_all_requests())[10]["user_id"] == 5
+
+        await database.init_db()
+        async with database._get_read_conn() as conn:
+            assert await database._get_user_version(conn) == database.SCHEMA_VERSION
+    finally:
+        await database.close_db()
+
+
+@pytest.mark.asyncio
+async def test_count_exists_and_list_message_ids(temp_db_path, monkeypatch):
+    import database
+    monkeypatch.setattr(database, "DB_PATH", temp_db_path)
+
+    try:
+        await database.init_db()
+        for mid in (30, 10, 20):
+            await database.save_request("firing_requests", mid, {"discord_id": mid})
+
+        assert await database.count_requests("firing_requests") == 3
+        assert await database.count_requests("promotion_requests") == 0
+        assert await database.request_exists("firing_requests", 20)
+        assert not await database.request_exists("firing_requests", 99)
+        assert await database.list_message_ids("firing_requests") == [10, 20, 30]
+        with pytest.raises(ValueError):
+            await database.count_requests("sqlite_master")
+    finally:
+        await database.close_db()
+
+
+@pytest.mark.asyncio
+async def test_channel_id_saved_and_backfilled(temp_db_path, monkeypatch):
+    import database
+    from services.channel_backfill import backfill_request_channels
+    monkeypatch.setattr(database, "DB_PATH", temp_db_path)
+
+    class _Bot:
+        def get_channel(self, _):
+            return None
+
+    try:
+        await database.init_db()
+        await database.save_request("promotion_requests", 1, {"discord_id": 5, "channel_id": 77})
+        await database.save_request(
+            "promotion_requests", 2, {"discord_id": 6, "message_link": "https://discord.com/channels/1/88/2"}
+        )
+        await database.save_request("promotion_requests", 3, {"discord_id": 7})
+
+        assert await backfill_request_channels(_Bot()) == 1
+        assert await database.list_message_channels("promotion_requests") == {1: 77, 2: 88, 3: 0}
+        assert (await database.load_all_promotion_requests())[2]["channel_id"] == 88
+        assert await backfill_request_channels(_Bot()) == 0
+    finally:
+        await database.close_db()
+
+
+@pytest.mark.asyncio
+async def test_read_waits_for_journal_batch_in_flight(temp_db_path, monkeypatch):
+    import database
+    from services.write_journal import WriteJournal
+    monkeypatch.setattr(database, "DB_PATH", temp_db_path)
+
+    journal = WriteJournal(flush_interval_ms=10_000)
+    monkeypatch.setattr(database, "_write_journal", journal)
+    try:
+        await database.init_db()
+        journal.add(*database._save_request_stmt("firing_requests", 1, {"discord_id": 5}))
+        journal.add(*database._save_promotion_draft_stmt("orls", 5, {"rank": "сержант"}))
+
+        # чтение другой таблицы пакет не сбрасывает
+        assert await database.count_requests("warehouse_requests") == 0
+        assert journal.pending == 2
+
+        flushing = asyncio.create_task(journal.flush())
+        await asyncio.sleep(0)
+        assert journal.pending == 0  # пакет уже снят с очереди, но ещё пишется
+        assert await database.request_exists("firing_requests", 1)
+        await flushing
+    finally:
+        await database.close_db()
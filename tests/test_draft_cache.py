@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+
+def test_draft_cache_evicts_coldest_and_counts(monkeypatch):
+    from utils import draft_cache
+    from utils.draft_cache import DraftCache
+
+    now = [1000.0]
+    monkeypatch.setattr(draft_cache.time, "monotonic", lambda: now[0])
+    cache = DraftCache(max_entries=2, max_idle_sec=60)
+    cache[1] = {"a": 1}
+    cache[2] = {"a": 2}
+    assert cache.get(1) == {"a": 1}
+    cache[3] = {"a": 3}  # вытесняется 2 — к нему дольше всех не обращались
+
+    assert cache.get(2) is None
+    assert list(cache) == [1, 3]
+
+    now[0] += 61
+    assert cache.get(3) is None and not cache
+    st = cache.stats()
+    assert (st["hits"], st["misses"], st["evictions"]) == (1, 2, 3)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+
+
+def test_scheduler_pops_only_due_and_skips_cancelled():
+    from services.expiry import ExpiryScheduler
+
+    now = datetime(2024, 1, 10)
+    scheduler = ExpiryScheduler()
+    scheduler.schedule("a", 1, now - timedelta(minutes=5))
+    scheduler.schedule("a", 2, now - timedelta(minutes=1))
+    scheduler.schedule("b", 3, now - timedelta(minutes=2))
+    scheduler.schedule("a", 4, now + timedelta(hours=1))
+    scheduler.cancel("a", 2)
+    scheduler.schedule("b", 3, now + timedelta(minutes=30))  # срок перенесён
+
+    assert scheduler.pop_due(now) == {"a": [1]}
+    assert scheduler.next_deadline() == now + timedelta(minutes=30)
+    assert scheduler.stats()["scheduled"] == 2
+
+
+async def test_request_store_expires_through_scheduler():
+    from services.expiry import ExpiryScheduler
+    from utils.request_store import RequestStore
+
+    scheduler = ExpiryScheduler()
+    deleted = []
+    store = RequestStore("user_id")
+    store[1] = {"user_id": 10, "created_at": "2024-01-01T00:00:00"}
+    store.expire_after(scheduler, "заявки", timedelta(days=7), deleted.extend)
+    store[2] = {"user_id": 20, "created_at": "2024-01-05T00:00:00"}
+    store[3] = {"user_id": 30, "created_at": "2024-01-06T00:00:00"}
+    store.pop(3)
+
+    assert await scheduler.run_due(datetime(2024, 1, 9)) == 1
+    assert list(store) == [2] and deleted == [1]
+    assert not store.has_user(10)
+
+    assert await scheduler.run_due(datetime(2024, 1, 20)) == 1
+    assert not store and deleted == [1, 2]
+    assert scheduler.stats()["expired"] == {"заявки": 2}
+
+
+async def test_rewrite_without_created_at_keeps_deadline():
+    from services.expiry import ExpiryScheduler
+    from utils.request_store import RequestStore
+
+    scheduler = ExpiryScheduler()
+    deleted = []
+    store = RequestStore("user_id")
+    store.expire_after(scheduler, "переводы", timedelta(days=7), deleted.extend)
+    created = datetime.now().replace(microsecond=0)
+    store[1] = {"user_id": 10, "created_at": created.isoformat(), "approved_source": 0}
+    store[1] = {"user_id": 10, "approved_source": 5}  # как в _handle_approve_source
+    store[2] = {"user_id": 20}  # восстановлена из embed, даты нет
+
+    assert await scheduler.run_due(datetime.now()) == 0
+    assert sorted(store) == [1, 2] and deleted == []
+    assert store[1]["created_at"] == created.isoformat() and store[1]["approved_source"] == 5
+    assert scheduler.deadline("переводы", 1) == created + timedelta(days=7)
+
+
+async def test_schedule_wakes_runner_past_cancelled_head():
+    import asyncio
+
+    from services.expiry import ExpiryScheduler
+
+    now = datetime.now()
+    scheduler = ExpiryScheduler()
+    scheduler._wakeup = asyncio.Event()  # как в run()
+    scheduler.schedule("a", 1, now + timedelta(minutes=10))
+    scheduler.cancel("a", 1)
+    scheduler._wakeup.clear()
+
+    scheduler.schedule("a", 2, now + timedelta(minutes=30))
+    assert scheduler._wakeup.is_set()
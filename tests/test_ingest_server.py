@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import aiohttp
+import pytest
+
+SECRET = "test-secret"
+CHANNEL_ID = 5005
+
+
+class _Sent:
+    _next_id = 1000
+
+    def __init__(self, channel):
+        _Sent._next_id += 1
+        self.id = _Sent._next_id
+        self.channel = channel
+        self.jump_url = f"https://discord.com/channels/1/{channel.id}/{self.id}"
+
+
+class _Channel:
+    def __init__(self, cid):
+        self.id = cid
+        self.sends = 0
+
+    async def send(self, *args, **kwargs):
+        self.sends += 1
+        await asyncio.sleep(0)
+        return _Sent(self)
+
+
+class _Bot:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_channel(self, cid):
+        return self.channel if cid == self.channel.id else None
+
+    def is_ready(self):
+        return True
+
+
+@pytest.fixture
+async def ingest(monkeypatch):
+    import database
+    from config import Config
+    from services.ingest_server import IngestServer
+    from services.webhook_handler import WebhookHandler
+    from state import active_firing_requests
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    monkeypatch.setattr(database, "DB_PATH", path)
+    monkeypatch.setattr(Config, "FIRING_CHANNEL_ID", CHANNEL_ID)
+    await database.init_db()
+    existing = set(active_firing_requests)
+
+    channel = _Channel(CHANNEL_ID)
+    bot = _Bot(channel)
+    server = IngestServer(bot, WebhookHandler(bot), "127.0.0.1", 0, SECRET)
+    runner = aiohttp.web.AppRunner(server.make_app())
+    await runner.setup()
+    site = aiohttp.web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield server, channel, f"http://127.0.0.1:{port}/reports"
+    await runner.cleanup()
+    for key in set(active_firing_requests) - existing:
+        active_firing_requests.pop(key, None)
+    await database.close_db()
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def _signed(payload: dict, secret: str = SECRET):
+    from services.ingest_server import sign
+
+    body = json.dumps(payload).encode("utf-8")
+    ts = str(int(time.time()))
+    return body, {"X-Timestamp": ts, "X-Signature": sign(secret, ts, body), "Content-Type": "application/json"}
+
+
+def _firing(i: int) -> dict:
+    return {"type": "firing", "data": {"discord_id": 10_000 + i, "full_name": f"Иван {i}", "reason": "псж"}}
+
+
+@pytest.mark.asyncio
+async def test_load_hundreds_of_signed_reports(ingest):
+    import database
+    from state import active_firing_requests
+
+    server, channel, url = ingest
+    total = 300
+    before = len(active_firing_requests)
+
+    async with aiohttp.ClientSession() as session:
+        async def post(i):
+            body, headers = _signed(_firing(i))
+            async with session.post(url, data=body, headers=headers) as resp:
+                return resp.status
+
+        statuses = await asyncio.gather(*(post(i) for i in range(total)))
+
+    assert statuses == [200] * total
+    # одна отправка в Discord на рапорт
+    assert channel.sends == total
+    assert server.stats()["accepted"] == total
+    assert len(active_firing_requests) - before == total
+    assert await database.count_requests("firing_requests") == total
+
+
+@pytest.mark.asyncio
+async def test_rejects_bad_signature_and_unknown_channel(ingest):
+    server, channel, url = ingest
+
+    async with aiohttp.ClientSession() as session:
+        body, headers = _signed(_firing(1), secret="wrong")
+        async with session.post(url, data=body, headers=headers) as resp:
+            assert resp.status == 401
+
+        payload = {"type": "promotion", "channel_id": 999, "data": {"discord_id": 7, "full_name": "А", "new_rank": "Сержант"}}
+        body, headers = _signed(payload)
+        async with session.post(url, data=body, headers=headers) as resp:
+            assert resp.status == 403
+
+    assert channel.sends == 0
+    assert server.stats()["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_accepts_discord_webhook_shaped_promotion(ingest, monkeypatch):
+    from config import Config
+
+    _, channel, url = ingest
+    monkeypatch.setattr(Config, "PROMOTION_CHANNELS", {CHANNEL_ID: [1]})
+    payload = {
+        "channel_id": CHANNEL_ID,
+        "embeds": [{"title": "Рапорт", "fields": [{"name": "👤 Пётр Петров | Сержант", "value": "<@42>"}]}],
+    }
+    async with aiohttp.ClientSession() as session:
+        body, headers = _signed(payload)
+        async with session.post(url, data=body, headers=headers) as resp:
+            assert resp.status == 200
+            assert (await resp.json())["type"] == "promotion"
+    assert channel.sends == 1
+
+
+@pytest.mark.asyncio
+async def test_replayed_request_is_rejected(ingest):
+    server, channel, url = ingest
+
+    body, headers = _signed(_firing(1))
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, data=body, headers=headers) as resp:
+            assert resp.status == 200
+        async with session.post(url, data=body, headers=headers) as resp:
+            assert resp.status == 409
+
+    assert channel.sends == 1
+    assert server.stats()["replays"] == 1
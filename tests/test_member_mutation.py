@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import discord
+import pytest
+
+
+class _Role:
+    def __init__(self, rid, default=False):
+        self.id = rid
+        self._default = default
+
+    def is_default(self):
+        return self._default
+
+    def __hash__(self):
+        return self.id
+
+    def __eq__(self, other):
+        return isinstance(other, _Role) and other.id == self.id
+
+
+class _Member:
+    def __init__(self, roles, nick=None, fail_bulk=False):
+        self.id = 1
+        self.roles = list(roles)
+        self.nick = nick
+        self.fail_bulk = fail_bulk
+        self.calls = []
+
+    async def edit(self, reason=None, **kwargs):
+        self.calls.append(("edit", sorted(kwargs)))
+        if self.fail_bulk and "roles" in kwargs:
+            raise discord.Forbidden(type("R", (), {"status": 403, "reason": "forbidden"})(), "missing permissions")
+        if "roles" in kwargs:
+            self.roles = [r for r in self.roles if r.is_default()] + list(kwargs["roles"])
+        if "nick" in kwargs:
+            self.nick = kwargs["nick"]
+
+    async def add_roles(self, role, reason=None):
+        self.calls.append(("add", role.id))
+        self.roles.append(role)
+
+    async def remove_roles(self, role, reason=None):
+        self.calls.append(("remove", role.id))
+        self.roles.remove(role)
+
+
+@pytest.mark.asyncio
+async def test_roles_and_nick_applied_in_one_edit():
+    from utils.rate_limiter import MemberMutation
+
+    everyone = _Role(0, default=True)
+    old_ranks = [_Role(i) for i in range(1, 11)]
+    keep, new_dept = _Role(50), _Role(60)
+    member = _Member([everyone, keep, *old_ranks])
+
+    mutation = MemberMutation(member).remove(*old_ranks).add(new_dept).set_nick("ППС | Иван Иванов")
+    assert await mutation.apply(delay=0) is True
+
+    assert member.calls == [("edit", ["nick", "roles"])]
+    assert mutation.api_calls == 1 and mutation.calls_saved == 11
+    assert set(member.roles) == {everyone, keep, new_dept}
+    assert member.nick == "ППС | Иван Иванов"
+
+    assert await MemberMutation(member).add(new_dept).apply(delay=0) is False
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_per_role_calls():
+    from utils.rate_limiter import MemberMutation
+
+    a, b, c = _Role(1), _Role(2), _Role(3)
+    member = _Member([a, b], fail_bulk=True)
+
+    mutation = MemberMutation(member).remove(a, b).add(c).set_nick("Уволен | Иван")
+    await mutation.apply(delay=0)
+
+    assert member.calls[0] == ("edit", ["nick", "roles"])
+    assert member.calls[1:] == [("remove", 1), ("remove", 2), ("add", 3), ("edit", ["nick"])]
+    assert member.roles == [c] and member.nick == "Уволен | Иван"
+    assert mutation.calls_saved == 0 and mutation.nick_error is None
+
+
+@pytest.mark.asyncio
+async def test_keeps_roles_added_after_member_was_fetched():
+    from utils.rate_limiter import MemberMutation
+
+    everyone, old_rank, new_rank, added_meanwhile = _Role(0, default=True), _Role(1), _Role(2), _Role(3)
+    stale = _Member([everyone, old_rank])
+    fresh = _Member([everyone, old_rank, added_meanwhile])
+    stale.guild = type("G", (), {"get_member": lambda self, uid: fresh if uid == stale.id else None})()
+
+    await MemberMutation(stale).remove(old_rank).add(new_rank).apply(delay=0)
+
+    assert set(stale.roles) == {everyone, added_meanwhile, new_rank}
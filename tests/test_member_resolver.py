@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+
+class _Guild:
+    def __init__(self, gid=1):
+        self.id = gid
+        self.cached = {}
+        self.fetches = 0
+
+    def get_member(self, user_id):
+        return self.cached.get(user_id)
+
+    async def fetch_member(self, user_id):
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        if user_id == 404:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Member")
+        return SimpleNamespace(id=user_id, guild=self)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_fetch():
+    from services.member_resolver import MemberResolver
+
+    resolver = MemberResolver(ttl_sec=60)
+    guild = _Guild()
+
+    members = await asyncio.gather(*(resolver.resolve(guild, 7) for _ in range(5)))
+    assert guild.fetches == 1
+    assert all(m is members[0] for m in members)
+    assert resolver.stats()["shared"] == 4
+
+    assert await resolver.resolve(guild, 7) is members[0]
+    assert guild.fetches == 1
+
+    resolver.on_member_event(members[0])
+    await resolver.resolve(guild, 7)
+    assert guild.fetches == 2
+
+    assert await resolver.resolve(guild, 7, fresh=True) is not members[0]
+    assert guild.fetches == 3
+
+
+@pytest.mark.asyncio
+async def test_gateway_cache_first_and_not_found_is_cached():
+    from services.member_resolver import MemberResolver
+
+    resolver = MemberResolver(ttl_sec=60)
+    guild = _Guild()
+    guild.cached[5] = SimpleNamespace(id=5, guild=guild)
+
+    assert await resolver.resolve(guild, 5) is guild.cached[5]
+    assert await resolver.resolve(guild, 404) is None
+    assert await resolver.resolve(guild, 404) is None
+    assert guild.fetches == 1
+    assert resolver.stats()["gateway_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_roles_uses_member_update_event():
+    from services.member_resolver import MemberResolver
+
+    resolver = MemberResolver(ttl_sec=60)
+    guild = _Guild()
+    old, new = SimpleNamespace(id=1), SimpleNamespace(id=2)
+    guild.cached[7] = SimpleNamespace(id=7, guild=guild, roles=[old])
+
+    async def gateway_update():
+        await asyncio.sleep(0.01)
+        resolver.on_member_event(SimpleNamespace(id=7, guild=guild, roles=[old]))
+        await asyncio.sleep(0.01)
+        guild.cached[7] = SimpleNamespace(id=7, guild=guild, roles=[new])
+        resolver.on_member_event(guild.cached[7])
+
+    asyncio.create_task(gateway_update())
+    member = await resolver.wait_for_roles(guild, 7, present=[new], absent=[old], timeout=1)
+    assert member is guild.cached[7]
+    assert guild.fetches == 0
+    assert resolver.stats()["verified_event"] == 1
+
+    assert await resolver.wait_for_roles(guild, 7, present=[new], absent=[old]) is guild.cached[7]
+    assert resolver.stats()["verified_cached"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_roles_falls_back_to_one_fetch():
+    from services.member_resolver import MemberResolver
+
+    resolver = MemberResolver(ttl_sec=60)
+    guild = _Guild()
+
+    member = await resolver.wait_for_roles(guild, 8, present=[3], timeout=0.02)
+    assert member.id == 8
+    assert guild.fetches == 1
+    assert resolver.stats()["verify_fetches"] == 1
+    assert not resolver._waiters
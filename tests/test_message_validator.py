@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import discord
+import pytest
+
+
+class _Msg:
+    def __init__(self, mid):
+        self.id = mid
+
+
+class _FakeChannel:
+    def __init__(self, channel_id, live_ids):
+        self.id = channel_id
+        self.live = sorted(live_ids)
+        self.history_calls = 0
+        self.fetched = []
+
+    def history(self, limit=100, after=None, oldest_first=True):
+        self.history_calls += 1
+        ids = [m for m in self.live if after is None or m > after.id][:limit]
+
+        async def gen():
+            for mid in ids:
+                yield _Msg(mid)
+
+        return gen()
+
+    async def fetch_message(self, mid):
+        self.fetched.append(mid)
+        if mid in self.live:
+            return _Msg(mid)
+        raise discord.NotFound(type("R", (), {"status": 404, "reason": "nf"})(), "not found")
+
+
+@pytest.mark.asyncio
+async def test_scan_answers_from_history_without_fetch():
+    from services.message_validator import BulkMessageValidator
+
+    channel = _FakeChannel(1, [100, 105, 110, 120])
+    validator = BulkMessageValidator(max_pages=5)
+    await validator.prepare(channel, [100, 103, 120])
+
+    assert await validator.exists(channel, 100) is True
+    assert await validator.exists(channel, 103) is False
+    assert await validator.exists(channel, 120) is True
+    assert channel.history_calls == 1
+    assert channel.fetched == []
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_fetch_beyond_scanned_range():
+    from services.message_validator import BulkMessageValidator, HISTORY_PAGE_SIZE
+
+    live = list(range(1000, 1000 + HISTORY_PAGE_SIZE * 3))
+    channel = _FakeChannel(1, live)
+    validator = BulkMessageValidator(max_pages=1)
+    await validator.prepare(channel, [1000, live[-1]])
+
+    assert await validator.exists(channel, 1000) is True
+    assert channel.fetched == []
+    assert await validator.exists(channel, live[-1]) is True
+    assert channel.fetched == [live[-1]]
+
+
+@pytest.mark.asyncio
+async def test_locate_across_channels():
+    from services.message_validator import BulkMessageValidator
+
+    a = _FakeChannel(1, [10, 30])
+    b = _FakeChannel(2, [20])
+    validator = BulkMessageValidator()
+    for ch in (a, b):
+        await validator.prepare(ch, [10, 20, 25])
+
+    assert (await validator.locate([a, b], 20)) == (b, True)
+    assert (await validator.locate([a, b], 25)) == (None, True)
+    assert a.fetched == [] and b.fetched == []
+
+
+def test_channels_for_prefers_saved_channel():
+    from services.message_validator import channels_for
+
+    class _Source:
+        def get_channel(self, cid):
+            return {7: "saved"}.get(cid)
+
+    defaults = ["a", "b"]
+    assert channels_for(_Source(), "7", defaults) == ["saved"]
+    assert channels_for(_Source(), 8, defaults) == defaults
+    assert channels_for(_Source(), "bad", defaults) == defaults
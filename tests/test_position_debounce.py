@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_burst_of_activity_runs_one_move_after_quiet_period():
+    from services.position_debounce import PositionDebouncer
+
+    debouncer = PositionDebouncer(quiet_sec=0.05)
+    runs = []
+
+    async def move():
+        runs.append(asyncio.get_running_loop().time())
+
+    for _ in range(5):
+        debouncer.schedule(1, move)
+        await asyncio.sleep(0.01)
+    assert runs == []
+    assert debouncer.is_pending(1)
+
+    await asyncio.sleep(0.1)
+    assert len(runs) == 1
+    assert not debouncer.is_pending(1)
+    assert debouncer.stats()["rescheduled"] == 4
+
+
+@pytest.mark.asyncio
+async def test_keys_are_independent():
+    from services.position_debounce import PositionDebouncer
+
+    debouncer = PositionDebouncer(quiet_sec=0.02)
+    runs = []
+
+    async def move(key):
+        runs.append(key)
+
+    debouncer.schedule("a", lambda: move("a"))
+    debouncer.schedule("b", lambda: move("b"))
+    await asyncio.sleep(0.06)
+    assert sorted(runs) == ["a", "b"]
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+
+class _Target:
+    def __init__(self, in_place=True, cost=0, moved=False):
+        self.place = in_place
+        self.cost = cost
+        self.moved = moved
+        self.calls = 0
+        self.checked = 0
+
+    async def check(self):
+        self.checked += 1
+        self.calls += self.cost
+        return self.moved
+
+
+def _add(sup, name, t, priority=50, delay=0.0):
+    from services.position_supervisor import PositionTarget
+
+    sup.add_target(
+        PositionTarget(
+            name=name, channel_id=1, priority=priority, interval=60,
+            check=t.check, in_place=lambda: t.place, rest_calls=lambda: t.calls,
+        ),
+        delay=delay,
+    )
+
+
+@pytest.mark.asyncio
+async def test_budget_defers_only_checks_that_need_api():
+    from services.position_supervisor import PositionSupervisor
+
+    sup = PositionSupervisor(bot=None, budget_per_minute=3, jitter_percent=0)
+    moving = _Target(in_place=False, cost=3, moved=True)
+    quiet = _Target(in_place=True)
+    _add(sup, "moving", moving)
+    _add(sup, "quiet", quiet)
+
+    await sup._run_target(sup._targets["moving"])
+    assert sup.spent_last_minute() == 3
+    assert sup._targets["moving"].last_move > 0
+
+    # бюджет исчерпан: проверка, которой нужен API, откладывается, а «на месте» — выполняется
+    await sup._run_target(sup._targets["moving"])
+    await sup._run_target(sup._targets["quiet"])
+    assert moving.checked == 1
+    assert quiet.checked == 1
+    assert sup.stats()["deferred"] == 1
+    assert sup._targets["quiet"].last_check > 0
+    assert sup._targets["quiet"].last_move == 0
+
+
+def test_higher_priority_runs_first_when_due_together():
+    import heapq
+    from services.position_supervisor import PositionSupervisor
+
+    sup = PositionSupervisor(bot=None, budget_per_minute=10, jitter_percent=0)
+    _add(sup, "low", _Target(), priority=10)
+    _add(sup, "high", _Target(), priority=100)
+    # одинаковый срок — выше приоритет раньше
+    sup._heap = [(0.0, -sup._targets[n].priority, i, n) for i, n in enumerate(("low", "high"))]
+    heapq.heapify(sup._heap)
+    assert heapq.heappop(sup._heap)[3] == "high"
+    assert [t.name for t in sup.snapshot()] == ["high", "low"]
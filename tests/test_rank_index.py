@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def mapping(monkeypatch):
+    from config import Config
+
+    monkeypatch.setattr(Config, "RANK_ROLE_MAPPING", {
+        "Рядовой -> Младший сержант": "10",
+        "младший сержант → Сержант": 11,
+        "Лейтенант": 20,
+    })
+    monkeypatch.setattr(Config, "ALL_RANK_ROLE_IDS", [99])
+
+
+def _role(role_id, name, position):
+    return SimpleNamespace(id=role_id, name=name, position=position)
+
+
+def test_lookups_match_mapping(mapping):
+    from services import ranks
+
+    assert ranks.find_role_id_for_transition("  РЯДОВОЙ ⇒ младший   сержант ") == 10
+    assert ranks.find_role_id_for_transition("сержант") == 11
+    assert ranks.find_role_id_for_transition("лейтенант") == 20
+    assert ranks.find_role_id_for_transition("генерал") is None
+    assert ranks.get_all_rank_role_ids_from_mapping() == {10, 11, 20}
+    assert ranks.get_all_rank_names_from_mapping() == {"рядовой", "младший сержант", "сержант", "лейтенант"}
+
+    member = SimpleNamespace(roles=[_role(10, "x", 1), _role(11, "y", 5), _role(7, "other", 50)])
+    assert ranks.get_member_rank_display(member) == "Сержант"
+    assert ranks.get_member_rank_display(SimpleNamespace(roles=[_role(99, "Стажёр", 1)])) == "Стажёр"
+
+
+def test_index_is_built_once_and_rebuilt_on_config_change(mapping, monkeypatch):
+    from config import Config
+    from services import ranks
+
+    index = ranks.get_rank_index()
+    assert ranks.get_rank_index() is index
+    with pytest.raises(TypeError):
+        index.transitions[("a", "b")] = 1
+
+    monkeypatch.setattr(Config, "RANK_ROLE_MAPPING", {"Сержант -> Старшина": 30})
+    rebuilt = ranks.get_rank_index()
+    assert rebuilt is not index
+    assert ranks.find_role_id_for_transition("сержант -> старшина") == 30
+    assert ranks.find_role_id_for_transition("лейтенант") is None
+
+    Config.RANK_ROLE_MAPPING["Старшина -> Прапорщик"] = 31
+    assert ranks.find_role_id_for_transition("прапорщик") is None
+    ranks.reload_rank_index()
+    assert ranks.find_role_id_for_transition("прапорщик") == 31
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+
+
+def _req(user_id, days_ago):
+    return {"user_id": user_id, "created_at": (datetime.now() - timedelta(days=days_ago)).isoformat()}
+
+
+def test_user_index_follows_insert_and_delete():
+    from utils.request_store import RequestStore
+
+    store = RequestStore("user_id")
+    store[1] = _req(10, 0)
+    store[2] = _req(10, 0)
+    store.update({3: _req(20, 0)})
+    assert store.has_user(10) and store.for_user(10) == {1, 2}
+
+    del store[1]
+    store.pop(2)
+    assert not store.has_user(10)
+
+    store[3] = _req(30, 0)
+    assert not store.has_user(20) and store.has_user(30)
+
+    store.replace({4: _req(40, 0)})
+    assert list(store) == [4] and store.for_user(40) == {4} and not store.has_user(30)
+
+
+def test_pop_expired_removes_only_old_entries():
+    from utils.request_store import RequestStore
+
+    store = RequestStore("discord_id")
+    store[1] = {"discord_id": 1, "created_at": (datetime.now() - timedelta(days=10)).isoformat()}
+    store[2] = {"discord_id": 2}
+    store[3] = {"discord_id": 3, "created_at": datetime.now().isoformat()}
+    store[4] = {"discord_id": 4, "created_at": (datetime.now() - timedelta(days=10)).isoformat()}
+    store[4] = {"discord_id": 4, "created_at": datetime.now().isoformat()}
+
+    cutoff = datetime.now() - timedelta(days=7)
+    assert store.expired(cutoff) == [2, 1]
+    assert store.pop_expired(cutoff) == [2, 1]
+    assert sorted(store) == [3, 4]
+    assert not store.has_user(1) and store.has_user(4)
+    assert store.pop_expired(cutoff) == []
+
+
+def test_store_keeps_compact_records_readable_as_dicts():
+    from models import FiringRecord
+    from utils.request_store import RequestStore
+
+    created = datetime.now().replace(microsecond=0)
+    raw = {"discord_id": 5, "full_name": "Иван", "created_at": created.isoformat(), "custom": 1}
+    store = RequestStore("discord_id", record=FiringRecord)
+    store[1] = raw
+
+    record = store[1]
+    assert isinstance(record, FiringRecord)
+    assert record.created == created
+    assert record.get("reason", "псж") == "псж"
+    assert record["created_at"] == raw["created_at"]
+    assert record.to_dict() == raw and {**record} == raw
+    assert store.has_user(5)
+    assert store.pop_expired(created + timedelta(seconds=1)) == [1]
+
+
+async def test_lazy_store_hydrates_on_demand_and_demotes_cold():
+    from models import PromotionRecord
+    from utils.request_store import RequestStore
+
+    created = datetime.now().replace(microsecond=0).isoformat()
+    rows = {mid: {"discord_id": mid, "new_rank": f"ранг {mid}", "created_at": created, "channel_id": 7} for mid in (1, 2, 3)}
+    loads = []
+
+    async def loader(mid):
+        loads.append(mid)
+        return dict(rows[mid]) if mid in rows else None
+
+    store = RequestStore("discord_id", record=PromotionRecord)
+    index = {mid: {"discord_id": mid, "created_at": created, "channel_id": 7} for mid in (1, 2, 3, 4)}
+    store.load_lazy(index, loader, keep=1, fields=("discord_id", "created_at", "channel_id"))
+    assert store.is_cold(1) and store.has_user(2) and 1 in store and store.get(1) is None
+
+    assert (await store.hydrate(1))["new_rank"] == "ранг 1"
+    assert (await store.hydrate(1))["new_rank"] == "ранг 1"
+    assert (await store.hydrate(2))["new_rank"] == "ранг 2"
+    assert store.is_cold(1) and store.get(1) is None and store.has_user(1)
+
+    assert await store.hydrate(4) is None and 4 not in store
+    assert loads == [1, 2, 4]
+    assert store.lazy_stats() == {"cold": 2, "hot": 1, "hydrations": 2, "demotions": 1}
+
+
+async def test_edit_after_demotion_keeps_full_request():
+    from models import RequestRecord
+    from utils.request_store import RequestStore
+
+    created = datetime.now().replace(microsecond=0).isoformat()
+    db = {
+        mid: {"user_id": mid, "request_type": "cadet", "name": "Иван", "surname": f"Иванов{mid}",
+              "static_id": "123-456", "created_at": created, "channel_id": 7}
+        for mid in (1, 2)
+    }
+
+    async def loader(mid):
+        return dict(db[mid])
+
+    store = RequestStore("user_id", record=RequestRecord)
+    index = {mid: {"user_id": mid, "request_type": "cadet", "created_at": created, "channel_id": 7} for mid in db}
+    store.load_lazy(index, loader, keep=1, fields=("user_id", "request_type", "created_at", "channel_id"))
+    await store.hydrate(1)
+    await store.hydrate(2)  # заявка 1 вытеснена, пока модалка редактирования открыта
+    assert store.is_cold(1)
+
+    # как в EditRequestModal.on_submit
+    existing = (await store.hydrate(1) or {}).copy()
+    existing.update({"name": "Пётр"})
+    store[1] = existing
+    db[1] = dict(store[1].to_dict())
+
+    assert db[1]["surname"] == "Иванов1" and db[1]["static_id"] == "123-456" and db[1]["name"] == "Пётр"
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+
+class _Route:
+    def __init__(self, method, path, channel_id=None):
+        self.method = method
+        self.path = path
+        self.key = f"{method} {path}"
+        self.major_parameters = str(channel_id or "")
+
+
+class _Http:
+    def __init__(self):
+        self.order = []
+        self.gate = asyncio.Event()
+
+    async def request(self, route, **kwargs):
+        self.order.append(kwargs.get("tag"))
+        await self.gate.wait()
+        return kwargs.get("tag")
+
+
+@pytest.mark.asyncio
+async def test_free_slot_goes_to_higher_lane_first():
+    from utils.rest_scheduler import Lane, RestScheduler, rest_lane
+
+    http = _Http()
+    sched = RestScheduler(max_concurrency=1, background_concurrency=1)
+    sched.install(http)
+    route = _Route("GET", "/channels/{channel_id}/messages", 1)
+
+    async def call(lane, tag):
+        with rest_lane(lane):
+            return await http.request(route, tag=tag)
+
+    first = asyncio.create_task(call(Lane.BACKGROUND, "bg1"))
+    await asyncio.sleep(0)
+    rest = [
+        asyncio.create_task(call(Lane.BACKGROUND, "bg2")),
+        asyncio.create_task(call(Lane.POST, "post")),
+        asyncio.create_task(call(Lane.INTERACTION, "click")),
+    ]
+    await asyncio.sleep(0)
+    assert sched.stats()["waiting"] == 3
+
+    http.gate.set()
+    await asyncio.gather(first, *rest)
+    assert http.order == ["bg1", "click", "post", "bg2"]
+    assert sched.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_background_lane_is_capped():
+    from utils.rest_scheduler import Lane, RestScheduler, rest_lane
+
+    http = _Http()
+    sched = RestScheduler(max_concurrency=3, background_concurrency=1)
+    sched.install(http)
+    route = _Route("GET", "/channels/{channel_id}/messages", 1)
+
+    async def call(lane, tag):
+        with rest_lane(lane):
+            return await http.request(route, tag=tag)
+
+    tasks = [asyncio.create_task(call(Lane.BACKGROUND, f"bg{i}")) for i in range(3)]
+    tasks.append(asyncio.create_task(call(Lane.POST, "post")))
+    await asyncio.sleep(0)
+    # один фоновый в работе, второй слот сразу достался сообщению
+    assert http.order == ["bg0", "post"]
+    assert sched.stats()["lanes"]["background"]["waiting"] == 2
+
+    http.gate.set()
+    await asyncio.gather(*tasks)
+    assert sorted(http.order) == ["bg0", "bg1", "bg2", "post"]
+
+
+def test_lane_inferred_from_route():
+    from utils.rest_scheduler import Lane, lane_for_route
+
+    assert lane_for_route("PATCH", "/guilds/{guild_id}/members/{user_id}") == Lane.MEMBER
+    assert lane_for_route("PUT", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}") == Lane.MEMBER
+    assert lane_for_route("POST", "/channels/{channel_id}/messages") == Lane.POST
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_bucket_does_not_take_all_slots():
+    from utils.rest_scheduler import Lane, RestScheduler, rest_lane
+
+    class _LockedBucketHttp(_Http):
+        async def request(self, route, **kwargs):
+            self.order.append(kwargs.get("tag"))
+            if route.major_parameters == "1":
+                await self.gate.wait()  # discord.py ждёт retry_after этого канала
+            return kwargs.get("tag")
+
+    http = _LockedBucketHttp()
+    sched = RestScheduler(max_concurrency=4, background_concurrency=1, bucket_concurrency=2)
+    sched.install(http)
+    busy = _Route("POST", "/channels/{channel_id}/messages", 1)
+    other = _Route("PATCH", "/guilds/{guild_id}/members/{user_id}")
+
+    async def call(route, lane, tag):
+        with rest_lane(lane):
+            return await http.request(route, tag=tag)
+
+    burst = [asyncio.create_task(call(busy, Lane.POST, f"post{i}")) for i in range(6)]
+    await asyncio.sleep(0)
+    assert http.order == ["post0", "post1"]
+    assert sched.stats()["in_flight"] == 2
+
+    assert await asyncio.wait_for(call(other, Lane.MEMBER, "member"), timeout=1) == "member"
+
+    http.gate.set()
+    await asyncio.gather(*burst)
+    assert sched.stats()["in_flight"] == 0
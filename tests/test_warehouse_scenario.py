@@ -14,6 +14,9 @@ WAREHOUSE_ITEMS_MOCK = {
 def warehouse_items_mock(monkeypatch):
     import data.warehouse_items as wh_data
     monkeypatch.setattr(wh_data, "WAREHOUSE_ITEMS", WAREHOUSE_ITEMS_MOCK)
+    # модуль мог быть импортирован раньше (через пакет views) и держит свою ссылку
+    import services.warehouse_session as wh_session
+    monkeypatch.setattr(wh_session, "WAREHOUSE_ITEMS", WAREHOUSE_ITEMS_MOCK)
 
 
 def test_warehouse_session_get_session_creates_new(warehouse_items_mock):
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+
+class _Msg:
+    def __init__(self, mid):
+        self.id = mid
+
+
+class _Handler:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.processed = []
+        self.running = 0
+        self.max_running = 0
+
+    async def process_webhook(self, message):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.processed.append(message.id)
+        self.running -= 1
+
+
+@pytest.fixture
+async def temp_db(monkeypatch):
+    import database
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    monkeypatch.setattr(database, "DB_PATH", path)
+    await database.init_db()
+    from services import worker_queue
+    monkeypatch.setattr(worker_queue, "worker", worker_queue.WorkerQueue())
+    yield database
+    await database.close_db()
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_consumers_process_in_parallel_and_skip_redelivery(temp_db):
+    from services.webhook_queue import WebhookQueue
+
+    handler = _Handler()
+    queue = WebhookQueue(handler, maxsize=10, consumers=3, dedupe_keep=100)
+    runner = asyncio.create_task(queue.run())
+    try:
+        for mid in (1, 2, 3, 2, 1):
+            await queue.submit(_Msg(mid))
+        await queue.join()
+    finally:
+        runner.cancel()
+
+    assert sorted(handler.processed) == [1, 2, 3]
+    assert handler.max_running > 1
+    st = queue.stats()
+    assert st["duplicates"] == 2 and st["processed"] == 3 and st["backlog"] == 0
+
+
+@pytest.mark.asyncio
+async def test_seen_ids_survive_restart(temp_db):
+    from services.webhook_queue import WebhookQueue
+
+    await temp_db.webhook_seen_add(42)
+    await temp_db.webhook_seen_add(43)
+
+    handler = _Handler()
+    queue = WebhookQueue(handler, maxsize=10, consumers=1, dedupe_keep=1)
+    assert await queue.load_seen() == 1
+    # храним только последний id
+    assert await queue.submit(_Msg(43)) is False
+    assert await temp_db.webhook_seen_load(10) == [43]
+
+
+@pytest.mark.asyncio
+async def test_failed_message_is_not_marked_seen(temp_db):
+    from services.webhook_queue import WebhookQueue
+
+    class _Flaky(_Handler):
+        async def process_webhook(self, message):
+            if message.id == 7 and 7 not in self.processed:
+                self.processed.append(7)
+                raise RuntimeError("сбой обработки")
+            await super().process_webhook(message)
+
+    handler = _Flaky(delay=0)
+    queue = WebhookQueue(handler, maxsize=10, consumers=1, dedupe_keep=100)
+    runner = asyncio.create_task(queue.run())
+    try:
+        assert await queue.submit(_Msg(7)) is True
+        await queue.join()
+        # повторная доставка после сбоя обрабатывается заново
+        assert await queue.submit(_Msg(7)) is True
+        await queue.join()
+        assert await queue.submit(_Msg(7)) is False
+    finally:
+        runner.cancel()
+
+    assert handler.processed == [7, 7]
+    assert queue.stats()["failed"] == 1
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+
+import pytest
+
+
+@pytest.fixture
+async def journal_db(monkeypatch):
+    import database
+    from services import write_journal
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    monkeypatch.setattr(database, "DB_PATH", path)
+    await database.init_db()
+    journal = write_journal.init_journal(flush_interval_ms=10_000, max_ops=1000)
+    yield journal
+    await database.close_db()
+    database.attach_write_journal(None)
+    write_journal.journal = None
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_submit_fire_coalesces_writes_by_key(journal_db):
+    import database
+    from services.worker_queue import WorkerQueue
+
+    worker = WorkerQueue()
+    for step in range(5):
+        worker.submit_fire(database.save_promotion_draft, "orls", 42, {"step": step})
+    worker.submit_fire(database.save_promotion_draft, "orls", 7, {"step": 0})
+
+    assert journal_db.pending == 2
+    assert journal_db.ops_coalesced == 4
+
+    assert await journal_db.flush() == 2
+    assert journal_db.last_batch_size == 2
+    assert (await database.load_promotion_draft("orls", 42))["step"] == 4
+
+
+@pytest.mark.asyncio
+async def test_reads_see_pending_writes(journal_db):
+    import database
+    from services.worker_queue import WorkerQueue
+
+    worker = WorkerQueue()
+    worker.submit_fire(database.save_request, "requests", 1, {"user_id": 5})
+    worker.submit_fire(database.delete_request, "requests", 1)
+    worker.submit_fire(database.save_request, "requests", 2, {"user_id": 6})
+
+    loaded = await database.load_all_requests()
+    assert journal_db.pending == 0
+    assert list(loaded) == [2]
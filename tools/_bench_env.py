@@ -0,0 +1,18 @@
+"""
+Общая подготовка для скриптов tools/bench_*.py: корень проекта в sys.path и минимальные
+переменные окружения, без которых config.py не загружается. Импортируется первым.
+"""
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+for _key, _value in {
+    "DISCORD_BOT_TOKEN": "bench",
+    "GUILD_ID": "1",
+    "PROMOTION_CH_01": "1:2",
+    "RANKMAP_01": "bench:3",
+}.items():
+    os.environ.setdefault(_key, _value)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Замер ops/sec для save_request / load_promotion_draft:
+  - legacy: новое соединение + PRAGMA на каждый вызов (как было раньше);
+  - pool:   постоянный пул соединений из database.py.
+
+Запуск: python tools/bench_db.py [кол-во операций]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+
+import _bench_env  # noqa: F401  (sys.path и окружение до импорта config)
+import aiosqlite
+
+import database
+
+
+@asynccontextmanager
+async def _legacy_conn(*tables):
+    conn = await aiosqlite.connect(database.DB_PATH)
+    try:
+        await conn.execute("PRAGMA journal_mode=WAL;")
+        await conn.execute("PRAGMA foreign_keys=ON;")
+        yield conn
+    finally:
+        await conn.close()
+
+
+async def _measure(label: str, ops: int) -> dict:
+    payload = {"user_id": 1, "request_type": "cadet", "name": "Иван", "surname": "Иванов"}
+    draft = {"rank": "сержант", "items": list(range(20)), "_ephemeral_msg": None}
+    await database.save_promotion_draft("orls", 1, draft)
+
+    t0 = time.perf_counter()
+    for i in range(ops):
+        await database.save_request("requests", 10_000 + i, payload)
+    save_rate = ops / (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for _ in range(ops):
+        await database.load_promotion_draft("orls", 1)
+    load_rate = ops / (time.perf_counter() - t0)
+
+    print(f"{label:>7}: save_request {save_rate:8.0f} ops/s | load_promotion_draft {load_rate:8.0f} ops/s")
+    return {"save": save_rate, "load": load_rate}
+
+
+async def main(ops: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "legacy.db")
+        pooled_get_conn, pooled_get_read_conn = database._get_conn, database._get_read_conn
+        database._get_conn = _legacy_conn
+        database._get_read_conn = _legacy_conn
+        await database.init_db()
+        before = await _measure("legacy", ops)
+
+        database._get_conn, database._get_read_conn = pooled_get_conn, pooled_get_read_conn
+        database.DB_PATH = os.path.join(tmp, "pool.db")
+        await database.init_db()
+        after = await _measure("pool", ops)
+        await database.close_db()
+
+    print(f"speedup: save_request x{after['save'] / before['save']:.1f}, load_promotion_draft x{after['load'] / before['load']:.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
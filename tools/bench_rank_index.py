@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Замер ops/sec для поиска роли по переходу и звания участника:
+  - legacy: словари пересобираются из RANK_ROLE_MAPPING на каждый вызов (как было раньше);
+  - index:  RankIndex, построенный один раз.
+
+Запуск: python tools/bench_rank_index.py [кол-во операций] [кол-во званий]
+"""
+import sys
+import time
+from types import SimpleNamespace
+
+import _bench_env  # noqa: F401  (sys.path и окружение до импорта config)
+
+from config import Config
+from services import ranks
+
+
+def _legacy_find(transition: str):
+    if not (transition or "").strip():
+        return None
+    canon = ranks._canon_transition_key(transition)
+    if canon:
+        rid = ranks.build_normalized_rank_mapping().get(canon)
+        if rid is not None:
+            return rid
+    return ranks._build_new_rank_to_role_id().get(ranks._canon_rank(transition))
+
+
+def _legacy_display(member) -> str:
+    all_ids = set(getattr(Config, "ALL_RANK_ROLE_IDS", None) or [])
+    all_ids |= set(ranks.build_normalized_rank_mapping().values())
+    all_ids |= set(ranks._build_new_rank_to_role_id().values())
+    member_rank_roles = [r for r in member.roles if r.id in all_ids]
+    if not member_rank_roles:
+        return ""
+    top = max(member_rank_roles, key=lambda r: r.position)
+    return ranks._build_role_id_to_display_name().get(top.id, top.name) or ""
+
+
+def _measure(label: str, find, display, transitions, member, ops: int) -> dict:
+    started = time.perf_counter()
+    for i in range(ops):
+        find(transitions[i % len(transitions)])
+    find_rate = ops / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(ops):
+        display(member)
+    display_rate = ops / (time.perf_counter() - started)
+
+    print(f"{label:>7}: find_role_id_for_transition {find_rate:10.0f} ops/s | get_member_rank_display {display_rate:10.0f} ops/s")
+    return {"find": find_rate, "display": display_rate}
+
+
+def main(ops: int, ranks_count: int) -> None:
+    names = [f"звание {i}" for i in range(ranks_count + 1)]
+    Config.RANK_ROLE_MAPPING = {f"{names[i]} -> {names[i + 1]}": 1000 + i for i in range(ranks_count)}
+    transitions = [f"  {names[i].upper()}  →  {names[i + 1]} " for i in range(ranks_count)]
+    member = SimpleNamespace(roles=[
+        SimpleNamespace(id=1000 + i, name=names[i + 1], position=i) for i in range(0, ranks_count, 3)
+    ] + [SimpleNamespace(id=5000 + i, name=f"роль {i}", position=i) for i in range(10)])
+
+    before = _measure("legacy", _legacy_find, _legacy_display, transitions, member, ops)
+    ranks.reload_rank_index()
+    after = _measure("index", ranks.find_role_id_for_transition, ranks.get_member_rank_display, transitions, member, ops)
+
+    print(f"speedup: find_role_id_for_transition x{after['find'] / before['find']:.1f}, get_member_rank_display x{after['display'] / before['display']:.1f}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
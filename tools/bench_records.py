@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Замер памяти (tracemalloc) на N активных заявок каждого типа, загруженных из JSON БД:
+  - dict:   свободный словарь со строковым created_at (как было раньше);
+  - record: запись из models.py (__slots__, created_at уже datetime).
+
+Запуск: python tools/bench_records.py [кол-во заявок]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+import _bench_env  # noqa: F401  (sys.path и окружение до импорта config)
+
+from models import (
+    DepartmentTransferRecord,
+    FiringRecord,
+    PromotionRecord,
+    RequestRecord,
+    WarehouseRecord,
+)
+
+
+def _created(i: int) -> str:
+    return (datetime(2024, 1, 1) + timedelta(seconds=i)).isoformat()
+
+
+def _samples(i: int) -> dict:
+    uid = 100000000000000000 + i
+    link = f"https://discord.com/channels/1/2/{300000000000000000 + i}"
+    return {
+        "заявки": (RequestRecord, {
+            "user_id": uid, "message_id": 300000000000000000 + i, "message_link": link, "channel_id": 2,
+            "request_type": "cadet", "name": "Иван", "surname": f"Иванов{i}", "static_id": f"{i % 1000:03d}-{i % 997:03d}",
+            "reason": "Электронная заявка", "created_at": _created(i),
+        }),
+        "увольнения": (FiringRecord, {
+            "discord_id": uid, "full_name": f"Иван Иванов {i}", "rank": "Сержант", "reason": "псж",
+            "photo_link": None, "recovery_option": "без возможности восстановления", "created_at": _created(i),
+            "status": "pending", "message_link": link, "channel_id": 2,
+        }),
+        "повышения": (PromotionRecord, {
+            "discord_id": uid, "full_name": f"Иван Иванов {i}", "new_rank": "сержант -> старшина",
+            "message_link": link, "created_at": _created(i), "status": "pending", "channel_id": 2,
+        }),
+        "склад": (WarehouseRecord, {
+            "user_id": uid, "items": [{"category": "Оружие", "item": "Пистолет", "quantity": 1}],
+            "message_id": 300000000000000000 + i, "channel_id": 2, "created_at": _created(i),
+        }),
+        "переводы": (DepartmentTransferRecord, {
+            "message_id": 300000000000000000 + i, "user_id": uid, "target_dept": "grom", "source_dept": "pps",
+            "from_academy": False, "data": {"reason": "перевод"}, "approved_source": 0, "approved_target": 0,
+            "created_at": _created(i), "channel_id": 2,
+        }),
+    }
+
+
+def _measure(build) -> tuple[int, list]:
+    gc.collect()
+    tracemalloc.start()
+    objs = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, objs
+
+
+def main(count: int) -> None:
+    rows: dict[str, list[str]] = {}
+    types = {}
+    for i in range(count):
+        for name, (record_type, data) in _samples(i).items():
+            types[name] = record_type
+            rows.setdefault(name, []).append(json.dumps(data, ensure_ascii=False))
+
+    total_before = total_after = 0
+    for name, lines in rows.items():
+        before, objs = _measure(lambda lines=lines: [json.loads(line) for line in lines])
+        del objs
+        record_type = types[name]
+        after, objs = _measure(lambda lines=lines, record_type=record_type: [record_type.from_dict(json.loads(line)) for line in lines])
+        assert objs[0].to_dict() == json.loads(lines[0])
+        del objs
+        total_before += before
+        total_after += after
+        print(f"{name:>10}: dict {before / count:7.0f} Б/заявку | record {after / count:7.0f} Б/заявку | -{100 - after * 100 / before:4.1f}%")
+
+    print(f"{'итого':>10}: dict {total_before / 2**20:6.1f} МБ | record {total_after / 2**20:6.1f} МБ на {count} заявок каждого типа")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Замер загрузки заявок при запуске (ViewRestorer._load_requests_from_db) на N ожидающих
+заявок, поровну по пяти таблицам:
+  - eager: все строки с разбором JSON в state (как было раньше);
+  - lazy:  только колонки индекса (LAZY_REQUEST_HYDRATION), данные — при первом нажатии.
+
+Запуск: python tools/bench_restore.py [кол-во заявок ...]   (по умолчанию 1000 и 10000)
+"""
+import asyncio
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import _bench_env  # noqa: F401  (sys.path и окружение до импорта config)
+
+import database
+import state
+from config import Config
+from services.restore_views import ViewRestorer
+
+STORES = ("active_requests", "active_firing_requests", "active_promotion_requests", "warehouse_requests", "active_department_transfers")
+
+
+def _statements(count: int) -> list:
+    created = datetime.now() - timedelta(hours=1)
+    statements = []
+    for i in range(count):
+        mid = 300000000000000000 + i
+        uid = 100000000000000000 + i
+        link = f"https://discord.com/channels/1/2/{mid}"
+        at = (created + timedelta(seconds=i)).isoformat()
+        kind = i % 5
+        if kind == 0:
+            statements.append(database._save_request_stmt("requests", mid, {
+                "user_id": uid, "message_id": mid, "message_link": link, "channel_id": 2, "request_type": "cadet",
+                "name": "Иван", "surname": f"Иванов{i}", "static_id": f"{i % 1000:03d}-{i % 997:03d}",
+                "reason": "Электронная заявка", "created_at": at,
+            }))
+        elif kind == 1:
+            statements.append(database._save_request_stmt("firing_requests", mid, {
+                "discord_id": uid, "full_name": f"Иван Иванов {i}", "rank": "Сержант", "reason": "псж",
+                "recovery_option": "без возможности восстановления", "created_at": at, "status": "pending",
+                "message_link": link, "channel_id": 2,
+            }))
+        elif kind == 2:
+            statements.append(database._save_request_stmt("promotion_requests", mid, {
+                "discord_id": uid, "full_name": f"Иван Иванов {i}", "new_rank": "сержант -> старшина",
+                "message_link": link, "created_at": at, "status": "pending", "channel_id": 2,
+            }))
+        elif kind == 3:
+            statements.append(database._save_request_stmt("warehouse_requests", mid, {
+                "user_id": uid, "items": [{"category": "Оружие", "item": "Пистолет", "quantity": 1}] * 3,
+                "message_id": mid, "channel_id": 2, "created_at": at,
+            }))
+        else:
+            statements.append((None, (
+                "INSERT INTO department_transfer_requests (message_id, user_id, target_dept, source_dept, from_academy, "
+                "data, approved_source, approved_target, created_at, channel_id) VALUES (?,?,?,?,?,?,?,?,?,?)"
+            ), (mid, uid, "grom", "pps", 0, json.dumps({"reason": "перевод", "static_id": f"{i:06d}"}), 0, 0, at, 2)))
+    return statements
+
+
+async def _load(lazy: bool) -> None:
+    Config.LAZY_REQUEST_HYDRATION = lazy
+    for name in STORES:
+        getattr(state, name).clear()
+    gc.collect()
+    await ViewRestorer(None)._load_requests_from_db()
+
+
+async def _measure(lazy: bool) -> tuple[float, int]:
+    # время и память — отдельными прогонами: tracemalloc сам замедляет загрузку в разы
+    t0 = time.perf_counter()
+    await _load(lazy)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    await _load(lazy)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, current
+
+
+async def _hydrate_ms(samples: int = 200) -> float:
+    store = state.active_promotion_requests
+    keys = list(store)[:samples]
+    t0 = time.perf_counter()
+    for key in keys:
+        await store.hydrate(key)
+    return (time.perf_counter() - t0) * 1000 / max(1, len(keys))
+
+
+async def main(counts: list[int]) -> None:
+    import logging
+    logging.disable(logging.INFO)
+    for count in counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            database.DB_PATH = os.path.join(tmp, "bench.db")
+            await database.init_db()
+            await database.execute_batch(_statements(count))
+
+            eager_s, eager_mem = await _measure(lazy=False)
+            lazy_s, lazy_mem = await _measure(lazy=True)
+            first_click_ms = await _hydrate_ms()
+            await database.close_db()
+
+        print(
+            f"{count:>6} заявок: eager {eager_s * 1000:7.1f} мс / {eager_mem / 2**20:5.1f} МБ | "
+            f"lazy {lazy_s * 1000:7.1f} мс / {lazy_mem / 2**20:5.1f} МБ | "
+            f"x{eager_s / lazy_s:.1f} быстрее, первое нажатие +{first_click_ms:.2f} мс"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(a) for a in sys.argv[1:]] or [1000, 10000]))
@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+# Черновики рапортов в памяти (user_id -> черновик): словарь в порядке последнего обращения,
+# не больше max_entries записей и не дольше max_idle_sec без обращений. Вытесняется самый
+# холодный черновик — он уже сохранён через save_promotion_draft, и следующее обращение
+# по промаху подгрузит его через load_promotion_draft, как после перезапуска.
+class DraftCache(OrderedDict):
+    def __init__(self, max_entries: int = 200, max_idle_sec: float = 3600):
+        super().__init__()
+        self.max_entries = max(1, int(max_entries))
+        self.max_idle = float(max_idle_sec)
+        self._touched: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _touch(self, key) -> None:
+        self.move_to_end(key)
+        self._touched[key] = time.monotonic()
+
+    def _trim(self) -> None:
+        cutoff = time.monotonic() - self.max_idle if self.max_idle > 0 else None
+        while len(self):
+            key = next(iter(self))
+            if len(self) <= self.max_entries and (cutoff is None or self._touched.get(key, 0) > cutoff):
+                break
+            super().__delitem__(key)
+            self._touched.pop(key, None)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        self._trim()
+        if key in self:
+            self.hits += 1
+            self._touch(key)
+            return super().__getitem__(key)
+        self.misses += 1
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self._touch(key)
+        self._trim()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self._touched.pop(key, None)
+
+    def pop(self, key, default=_MISSING):
+        self._touched.pop(key, None)
+        if default is _MISSING:
+            return super().pop(key)
+        return super().pop(key, default)
+
+    def popitem(self, last: bool = True):
+        key, value = super().popitem(last)
+        self._touched.pop(key, None)
+        return key, value
+
+    def clear(self) -> None:
+        super().clear()
+        self._touched.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits * 100 / lookups, 1) if lookups else 0.0,
+        }
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import re
 
+from utils.rest_scheduler import Lane, in_lane
+
 
 def required_count_from_text(requirement_text: str) -> int:
     if not (requirement_text or "").strip():
@@ -37,6 +39,7 @@ def parse_thanks_lines(text: str) -> list[list]:
     return result
 
 
+@in_lane(Lane.POST)
 async def send_long(thread, body: str, header: str = ""):
     if not thread:
         return
@@ -3,6 +3,8 @@ import discord
 import logging
 import random
 
+from utils.rest_scheduler import Lane, in_lane
+
 logger = logging.getLogger(__name__)
 
 class RateLimiter:
@@ -60,29 +62,122 @@ async def safe_edit(message, *args, **kwargs):
 async def safe_delete(message):
     return await safe_discord_call(message.delete)
 
-async def apply_role_changes(member, add=None, remove=None, delay: float = 0.5):
-    add = add or []
-    remove = remove or []
-    for role in remove:
-        if role and role in member.roles:
-            await safe_discord_call(member.remove_roles, role)
+_mutation_stats = {"mutations": 0, "api_calls": 0, "calls_saved": 0, "fallbacks": 0}
+
+
+def get_mutation_stats() -> dict:
+    return dict(_mutation_stats)
+
+
+_UNSET = object()
+
+
+# Итоговый набор ролей и ник применяются одним member.edit(roles=..., nick=...) вместо вызова на каждую роль.
+# Если так не вышло (например, одна из ролей выше роли бота) — по одной роли, как раньше.
+# Ограничение: edit(roles=...) заменяет весь список ролей участника, а не только названные. Роль,
+# которую кто-то выдал уже после того, как кэш бота видел участника, этим запросом снимется. Поэтому
+# список собирается из guild.get_member() прямо перед запросом (кэш обновляется по событиям гильдии),
+# но окно между событием и запросом остаётся.
+class MemberMutation:
+    def __init__(self, member, reason: str | None = None):
+        self.member = member
+        self.reason = reason
+        self._add: list = []
+        self._remove: list = []
+        self._nick = _UNSET
+        self.nick_error: Exception | None = None
+        self.api_calls = 0
+        self.calls_saved = 0
+
+    def add(self, *roles) -> "MemberMutation":
+        self._add.extend(r for r in roles if r)
+        return self
+
+    def remove(self, *roles) -> "MemberMutation":
+        self._remove.extend(r for r in roles if r)
+        return self
+
+    def set_nick(self, nick: str | None) -> "MemberMutation":
+        self._nick = nick
+        return self
+
+    def _current_roles(self) -> list:
+        guild = getattr(self.member, "guild", None)
+        cached = guild.get_member(self.member.id) if guild is not None else None
+        return list((cached or self.member).roles)
+
+    def _plan(self, roles: list):
+        current = set(roles)
+        add_set = set(self._add)
+        # роль, которую одновременно добавляют и снимают, остаётся: add важнее remove
+        to_remove = [r for r in dict.fromkeys(self._remove) if r in current and r not in add_set]
+        to_add = [r for r in dict.fromkeys(self._add) if r not in current]
+        nick_changed = self._nick is not _UNSET and self._nick != self.member.nick
+        return to_add, to_remove, nick_changed
+
+    def _final_roles(self, roles: list, to_add: list, to_remove: list) -> list:
+        removed = set(to_remove)
+        kept = [r for r in roles if not r.is_default() and r not in removed]
+        return kept + to_add
+
+    @in_lane(Lane.MEMBER)
+    async def apply(self, delay: float = 0.5) -> bool:
+        roles = self._current_roles()
+        to_add, to_remove, nick_changed = self._plan(roles)
+        naive_calls = len(to_add) + len(to_remove) + (1 if nick_changed else 0)
+        if not naive_calls:
+            return False
+
+        kwargs = {}
+        if to_add or to_remove:
+            kwargs["roles"] = self._final_roles(roles, to_add, to_remove)
+        if nick_changed:
+            kwargs["nick"] = self._nick
+
+        _mutation_stats["mutations"] += 1
+        try:
+            self.api_calls += 1
+            try:
+                await safe_discord_call(self.member.edit, reason=self.reason, **kwargs)
+            except discord.NotFound:
+                raise
+            except discord.HTTPException as e:
+                if "roles" not in kwargs:
+                    self._nick_failed(e)
+                    return True
+                _mutation_stats["fallbacks"] += 1
+                logger.warning(
+                    "Изменение участника %s одним запросом не прошло (%s), применяю роли по одной",
+                    self.member.id, e,
+                )
+                await self._apply_one_by_one(to_add, to_remove, nick_changed, delay)
+        finally:
+            self.calls_saved = max(0, naive_calls - self.api_calls)
+            _mutation_stats["api_calls"] += self.api_calls
+            _mutation_stats["calls_saved"] += self.calls_saved
+        return True
+
+    async def _apply_one_by_one(self, to_add: list, to_remove: list, nick_changed: bool, delay: float):
+        for role in to_remove:
+            self.api_calls += 1
+            await safe_discord_call(self.member.remove_roles, role, reason=self.reason)
             await asyncio.sleep(delay)
-    for role in add:
-        if role and role not in member.roles:
-            await safe_discord_call(member.add_roles, role)
+        for role in to_add:
+            self.api_calls += 1
+            await safe_discord_call(self.member.add_roles, role, reason=self.reason)
             await asyncio.sleep(delay)
+        if nick_changed:
+            self.api_calls += 1
+            try:
+                await safe_discord_call(self.member.edit, nick=self._nick, reason=self.reason)
+            except discord.HTTPException as e:
+                self._nick_failed(e)
 
-async def batch_role_changes(member, add=None, remove=None):
-    add = add or []
-    remove = remove or []
-    
-    if add or remove:
-        roles_to_add = [r for r in add if r and r not in member.roles]
-        roles_to_remove = [r for r in remove if r and r in member.roles]
-        if roles_to_add or roles_to_remove:
-            new_roles = set(member.roles)
-            new_roles.difference_update(roles_to_remove)
-            new_roles.update(roles_to_add)
-            await safe_discord_call(member.edit, roles=list(new_roles))
-            return True
-    return False
\ No newline at end of file
+    def _nick_failed(self, error: Exception):
+        # ник не критичен: ошибку не пробрасываем, вызывающий код смотрит nick_error
+        self.nick_error = error
+        logger.warning("Не удалось сменить ник участника %s: %s", self.member.id, error)
+
+
+async def apply_role_changes(member, add=None, remove=None, delay: float = 0.5):
+    await MemberMutation(member).remove(*(remove or [])).add(*(add or [])).apply(delay=delay)
@@ -0,0 +1,275 @@
+import heapq
+import itertools
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Hashable
+
+_MISSING = object()
+
+
+def _created_at(data) -> datetime:
+    if hasattr(data, "created"):
+        created = data.created
+    else:
+        created = data.get("created_at") if isinstance(data, Mapping) else None
+    if not isinstance(created, datetime):
+        try:
+            created = datetime.fromisoformat(created)
+        except (TypeError, ValueError):
+            # как и раньше при очистке: без даты или с битой датой запись считается устаревшей
+            return datetime.min
+    if created.tzinfo is not None:
+        created = created.astimezone().replace(tzinfo=None)
+    return created
+
+
+def _deadline(created: datetime, ttl: timedelta) -> datetime:
+    # без даты срок считается от вставки: по отсутствующей дате нельзя сразу удалять строку из БД
+    if created == datetime.min:
+        created = datetime.now()
+    try:
+        return created + ttl
+    except OverflowError:
+        return datetime.max
+
+
+def _user_id(data, key: str):
+    value = data.get(key) if isinstance(data, Mapping) else None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Хранилище активных заявок (message_id -> данные): обычный dict плюс два индекса,
+# которые обновляются при вставке и удалении — user_id -> {message_id} для проверки
+# «уже есть заявка» и куча по created_at, чтобы очистка трогала только устаревшие записи.
+# Индексы следят за присваиванием store[mid] = ...; правка полей user/created_at внутри
+# уже сохранённого словаря их не обновит — в таком случае запись нужно присвоить заново.
+# С record=<тип из models> присвоенные dict сразу превращаются в компактную запись.
+# После expire_after(...) каждая запись стоит в планировщике сроков на created_at + ttl.
+# После load_lazy(...) записи из БД лежат «холодными» — только колонки индекса; полная заявка
+# подгружается hydrate() и держится в LRU, вытесненная снова становится холодной. Кто читает
+# заявку по ключу, делает это через await hydrate(key): get/[] для холодной записи пусты.
+class RequestStore(dict):
+    def __init__(self, user_key: str = "user_id", data=None, record=None):
+        super().__init__()
+        self.user_key = user_key
+        self.record = record
+        self._by_user: dict[int, set] = {}
+        self._created: dict[Hashable, datetime] = {}
+        self._heap: list[tuple[datetime, int, Hashable]] = []
+        self._seq = itertools.count()
+        self._expiry = None
+        self._cold: set = set()
+        self._hydrated: OrderedDict = OrderedDict()
+        self._loader = None
+        self._keep = 0
+        self._fields: tuple = ()
+        self.hydrations = 0
+        self.demotions = 0
+        if data:
+            self.update(data)
+
+    def _index(self, key, data) -> None:
+        uid = _user_id(data, self.user_key)
+        if uid is not None:
+            self._by_user.setdefault(uid, set()).add(key)
+        created = _created_at(data)
+        self._created[key] = created
+        heapq.heappush(self._heap, (created, next(self._seq), key))
+        if self._expiry is not None:
+            scheduler, namespace, ttl, _ = self._expiry
+            scheduler.schedule(namespace, key, _deadline(created, ttl))
+
+    def _unindex(self, key, data) -> None:
+        uid = _user_id(data, self.user_key)
+        keys = self._by_user.get(uid)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[uid]
+        # запись в куче остаётся и пропускается при очистке; кучу изредка пересобираем
+        self._created.pop(key, None)
+        if self._expiry is not None:
+            self._expiry[0].cancel(self._expiry[1], key)
+        if len(self._heap) > 2 * len(self._created) + 64:
+            self._heap = [(c, next(self._seq), k) for k, c in self._created.items()]
+            heapq.heapify(self._heap)
+
+    def __setitem__(self, key, data) -> None:
+        if key in self and isinstance(data, Mapping) and _created_at(data) == datetime.min:
+            previous = self._created.get(key)
+            if previous is not None and previous != datetime.min:
+                # перезапись без даты (одобрение, восстановление из embed) сохраняет дату заявки
+                data = {**data, "created_at": previous.isoformat()}
+        if self.record is not None and data is not None:
+            data = self.record.from_dict(data)
+        if key in self:
+            self._unindex(key, super().__getitem__(key))
+        self._cold.discard(key)
+        super().__setitem__(key, data)
+        self._index(key, data)
+
+    def _forget(self, key) -> None:
+        self._cold.discard(key)
+        self._hydrated.pop(key, None)
+
+    def __delitem__(self, key) -> None:
+        data = super().__getitem__(key)
+        super().__delitem__(key)
+        self._unindex(key, data)
+        self._forget(key)
+
+    def pop(self, key, default=_MISSING):
+        if key in self:
+            data = super().pop(key)
+            self._unindex(key, data)
+            self._forget(key)
+            return data
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def popitem(self):
+        key, data = super().popitem()
+        self._unindex(key, data)
+        self._forget(key)
+        return key, data
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, data in dict(*args, **kwargs).items():
+            self[key] = data
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._by_user.clear()
+        self._created.clear()
+        self._heap.clear()
+        self._cold.clear()
+        self._hydrated.clear()
+        if self._expiry is not None:
+            self._expiry[0].cancel_all(self._expiry[1])
+
+    def expire_after(self, scheduler, namespace: str, ttl: timedelta, on_expire: Callable[[list], object] | None = None) -> None:
+        # истёкшие записи снимаются планировщиком; on_expire получает снятые ключи (например, для удаления из БД)
+        self._expiry = (scheduler, namespace, ttl, on_expire)
+        scheduler.register(namespace, self._expire_keys)
+        for key, created in self._created.items():
+            scheduler.schedule(namespace, key, _deadline(created, ttl))
+
+    def _expire_keys(self, keys: list):
+        removed = [key for key in keys if self.pop(key, None) is not None]
+        on_expire = self._expiry[3] if self._expiry is not None else None
+        if removed and on_expire is not None:
+            return on_expire(removed)
+
+    def replace(self, data) -> None:
+        self.clear()
+        self.update(data or {})
+
+    def load_lazy(self, index: dict, loader: Callable[[Hashable], Awaitable], keep: int, fields: tuple) -> None:
+        # index: ключ -> колонки из БД (fields); loader(ключ) возвращает полную заявку или None
+        self._loader = loader
+        self._keep = max(1, int(keep))
+        self._fields = tuple(fields)
+        self.clear()
+        # холодные записи — обычные маленькие dict без перевода в record; индексы строятся одним проходом
+        expiry = self._expiry
+        for key, stub in index.items():
+            super().__setitem__(key, stub)
+            uid = _user_id(stub, self.user_key)
+            if uid is not None:
+                self._by_user.setdefault(uid, set()).add(key)
+            created = _created_at(stub)
+            self._created[key] = created
+            self._heap.append((created, next(self._seq), key))
+            if expiry is not None:
+                expiry[0].schedule(expiry[1], key, _deadline(created, expiry[2]))
+        heapq.heapify(self._heap)
+        self._cold = set(index)
+
+    # У холодной записи только колонки индекса: get/[] её не отдают, чтобы заглушку нельзя было
+    # принять за заявку и сохранить поверх полной строки в БД. Полная — через await hydrate(key).
+    def get(self, key, default=None):
+        if key in self._cold:
+            return default
+        return super().get(key, default)
+
+    def __getitem__(self, key):
+        if key in self._cold:
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+    def is_cold(self, key) -> bool:
+        return key in self._cold
+
+    async def hydrate(self, key):
+        if key not in self._cold:
+            if key in self._hydrated:
+                self._hydrated.move_to_end(key)
+            return self.get(key)
+        data = await self._loader(key)
+        if key not in self._cold:
+            # пока читали БД, запись обновили или удалили — она свежее прочитанной
+            return self.get(key)
+        if data is None:
+            self.pop(key, None)
+            return None
+        self[key] = data
+        self.hydrations += 1
+        self._hydrated[key] = None
+        while len(self._hydrated) > self._keep:
+            old, _ = self._hydrated.popitem(last=False)
+            self._demote(old)
+        return super().__getitem__(key)
+
+    def _demote(self, key) -> None:
+        data = super().__getitem__(key)
+        stub = {field: data.get(field) for field in self._fields if data.get(field) is not None}
+        # user_id и created_at те же — индексы и сроки не меняются
+        super().__setitem__(key, stub)
+        self._cold.add(key)
+        self.demotions += 1
+
+    def lazy_stats(self) -> dict:
+        return {
+            "cold": len(self._cold),
+            "hot": len(self._hydrated),
+            "hydrations": self.hydrations,
+            "demotions": self.demotions,
+        }
+
+    def has_user(self, user_id: int) -> bool:
+        return int(user_id) in self._by_user
+
+    def for_user(self, user_id: int) -> set:
+        return set(self._by_user.get(int(user_id), ()))
+
+    def expired(self, cutoff: datetime) -> list:
+        # ключи с created_at < cutoff, от самых старых; снятые с кучи записи возвращаются обратно
+        popped = []
+        while self._heap and self._heap[0][0] < cutoff:
+            popped.append(heapq.heappop(self._heap))
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return list(dict.fromkeys(key for created, _, key in popped if self._created.get(key) == created))
+
+    def pop_expired(self, cutoff: datetime) -> list:
+        removed = []
+        while self._heap and self._heap[0][0] < cutoff:
+            created, _, key = heapq.heappop(self._heap)
+            if key in self and self._created.get(key) == created:
+                self.pop(key)
+                removed.append(key)
+        return removed
@@ -0,0 +1,238 @@
+import asyncio
+import functools
+import heapq
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Lane(IntEnum):
+    INTERACTION = 0  # запросы, которых ждёт сотрудник, нажавший кнопку
+    MEMBER = 1  # роли и ники
+    POST = 2  # сообщения в каналах, ветках, ЛС
+    BACKGROUND = 3  # позиции сообщений, восстановление, проверка осиротевших записей
+
+
+LANE_TITLES = {
+    Lane.INTERACTION: "взаимодействия",
+    Lane.MEMBER: "участники",
+    Lane.POST: "сообщения",
+    Lane.BACKGROUND: "фон",
+}
+
+MAX_TRACKED_BUCKETS = 256
+
+_lane: ContextVar[Optional[Lane]] = ContextVar("rest_lane", default=None)
+
+
+# Все запросы к API внутри блока (и в задачах, созданных из него) идут в указанной полосе.
+@contextmanager
+def rest_lane(lane: Lane):
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane() -> Optional[Lane]:
+    return _lane.get()
+
+
+# Полоса по маршруту, если вызывающий код её не указал.
+def lane_for_route(method: str, path: str) -> Lane:
+    if path.startswith(("/interactions/", "/webhooks/{webhook_id}/{webhook_token}")):
+        return Lane.INTERACTION
+    if path.startswith("/guilds/{guild_id}/members/{user_id}") and method in ("PATCH", "PUT", "DELETE"):
+        return Lane.MEMBER
+    return Lane.POST
+
+
+class _LaneStats:
+    __slots__ = ("in_flight", "requests", "wait_max", "wait_total", "waiting")
+
+    def __init__(self):
+        self.requests = 0
+        self.waiting = 0
+        self.in_flight = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class _BucketStats:
+    __slots__ = ("errors", "in_flight", "last_at", "requests")
+
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.errors = 0
+        self.last_at = 0.0
+
+
+# Очередь исходящих запросов поверх HTTPClient discord.py: не больше max_concurrency одновременно,
+# свободный слот получает самая приоритетная полоса, фону — не больше background_concurrency слотов.
+# Один маршрут (bucket Discord) держит не больше bucket_concurrency слотов: запросы, которые discord.py
+# придерживает на лимите маршрута или в ожидании retry_after после 429, не занимают все слоты.
+# Лимиты Discord по-прежнему соблюдает discord.py; здесь — порядок и статистика по маршрутам.
+# Ответы на взаимодействия (interaction.response / followup) discord.py шлёт мимо HTTPClient,
+# их очередь не задерживает.
+class RestScheduler:
+    def __init__(self, max_concurrency: int = 8, background_concurrency: int = 2, bucket_concurrency: int = 2):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.background_concurrency = max(1, min(int(background_concurrency), self.max_concurrency))
+        self.bucket_concurrency = max(1, min(int(bucket_concurrency), self.max_concurrency))
+        self._in_flight = 0
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._lanes = {lane: _LaneStats() for lane in Lane}
+        self._buckets: OrderedDict[str, _BucketStats] = OrderedDict()
+
+    def _can_start(self, lane: Lane, bucket: Optional[_BucketStats] = None) -> bool:
+        if self._in_flight >= self.max_concurrency:
+            return False
+        if lane == Lane.BACKGROUND and self._lanes[Lane.BACKGROUND].in_flight >= self.background_concurrency:
+            return False
+        return bucket is None or bucket.in_flight < self.bucket_concurrency
+
+    def _wake(self) -> None:
+        # разбираем ожидающих по приоритету; тех, кому не хватает слотов фона или своего маршрута, пропускаем
+        skipped = []
+        while self._waiters and self._in_flight < self.max_concurrency:
+            lane, seq, fut, bucket = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            if not self._can_start(lane, bucket):
+                skipped.append((lane, seq, fut, bucket))
+                continue
+            self._start(lane, bucket)
+            fut.set_result(None)
+        for entry in skipped:
+            heapq.heappush(self._waiters, entry)
+
+    def _start(self, lane: Lane, bucket: Optional[_BucketStats] = None) -> None:
+        self._in_flight += 1
+        self._lanes[lane].in_flight += 1
+        if bucket is not None:
+            bucket.in_flight += 1
+
+    async def acquire(self, lane: Lane, bucket: Optional[_BucketStats] = None) -> float:
+        stats = self._lanes[lane]
+        stats.requests += 1
+        started = time.monotonic()
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (lane, next(self._seq), fut, bucket))
+        self._wake()
+        if fut.done():
+            return 0.0
+
+        stats.waiting += 1
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # слот успели выдать, а задачу отменили — вернуть его
+            if fut.done() and not fut.cancelled():
+                self.release(lane, bucket)
+            raise
+        finally:
+            stats.waiting -= 1
+        waited = time.monotonic() - started
+        stats.wait_total += waited
+        stats.wait_max = max(stats.wait_max, waited)
+        return waited
+
+    def release(self, lane: Lane, bucket: Optional[_BucketStats] = None) -> None:
+        self._in_flight -= 1
+        self._lanes[lane].in_flight -= 1
+        if bucket is not None:
+            bucket.in_flight -= 1
+        self._wake()
+
+    def _bucket(self, key: str) -> _BucketStats:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _BucketStats()
+            if len(self._buckets) > MAX_TRACKED_BUCKETS:
+                # маршрут с запросами в работе не забываем: по нему считается его лимит слотов
+                idle = next((k for k, b in self._buckets.items() if not b.in_flight and k != key), None)
+                if idle is not None:
+                    del self._buckets[idle]
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def install(self, http) -> None:
+        if getattr(http, "_rest_scheduler", None) is self:
+            return
+        original = http.request
+
+        async def request(route, **kwargs):
+            lane = current_lane()
+            if lane is None:
+                lane = lane_for_route(route.method, route.path)
+            bucket = self._bucket(f"{route.key}:{route.major_parameters}")
+            await self.acquire(lane, bucket)
+            bucket.requests += 1
+            bucket.last_at = time.time()
+            try:
+                return await original(route, **kwargs)
+            except Exception:
+                bucket.errors += 1
+                raise
+            finally:
+                self.release(lane, bucket)
+
+        http.request = request
+        http._rest_scheduler = self
+
+    def stats(self) -> dict:
+        lanes = {}
+        for lane, s in self._lanes.items():
+            lanes[lane.name.lower()] = {
+                "requests": s.requests,
+                "waiting": s.waiting,
+                "in_flight": s.in_flight,
+                "avg_wait_ms": round(s.wait_total * 1000 / s.requests, 1) if s.requests else 0.0,
+                "max_wait_ms": round(s.wait_max * 1000, 1),
+            }
+        busiest = sorted(self._buckets.items(), key=lambda kv: kv[1].requests, reverse=True)[:5]
+        return {
+            "in_flight": self._in_flight,
+            "waiting": sum(s.waiting for s in self._lanes.values()),
+            "lanes": lanes,
+            "buckets": [(key, b.requests, b.errors) for key, b in busiest],
+        }
+
+
+scheduler: Optional[RestScheduler] = None
+
+
+def get_rest_scheduler() -> Optional[RestScheduler]:
+    return scheduler
+
+
+def init_rest_scheduler(
+    bot, max_concurrency: int = 8, background_concurrency: int = 2, bucket_concurrency: int = 2
+) -> RestScheduler:
+    global scheduler
+    if scheduler is None:
+        scheduler = RestScheduler(max_concurrency, background_concurrency, bucket_concurrency)
+    scheduler.install(bot.http)
+    return scheduler
+
+
+# То же, что rest_lane, для целой корутины.
+def in_lane(lane: Lane):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with rest_lane(lane):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,140 @@
+import logging
+from typing import Awaitable, Callable, Optional
+
+import discord
+from discord.ui import View, Button
+
+import state
+from enums import RequestType
+from utils.rest_scheduler import Lane, rest_lane
+
+logger = logging.getLogger(__name__)
+
+ViewFactory = Callable[[discord.Interaction, int], Awaitable[Optional[View]]]
+
+
+# Остановленный View рисует кнопки, но discord.py не привязывает его к сообщению:
+# нажатия обслуживает общий ComponentRouter по custom_id, память не растёт с числом заявок.
+def render_only(view: View) -> View:
+    view.stop()
+    return view
+
+
+# Один постоянный View на тип заявки. Ключ заявки — interaction.message.id, тип задаёт custom_id,
+# поэтому уже отправленные сообщения со старыми custom_id обслуживаются без изменений.
+class ComponentRouter(View):
+    def __init__(self, kind: str, custom_ids: tuple[str, ...], factory: ViewFactory, item_name: str = "Заявка"):
+        super().__init__(timeout=None)
+        self.kind = kind
+        self.item_name = item_name
+        self._factory = factory
+        self.dispatched = 0
+        self.missing = 0
+        for custom_id in custom_ids:
+            button = Button(label=custom_id, custom_id=custom_id)
+            button.callback = self._dispatch
+            self.add_item(button)
+
+    async def _dispatch(self, interaction: discord.Interaction):
+        custom_id = (interaction.data or {}).get("custom_id")
+        message = interaction.message
+        view = None
+        if message is not None:
+            try:
+                view = await self._factory(interaction, int(message.id))
+            except Exception as e:
+                logger.warning("Маршрутизация %s: не удалось собрать View для msg_id=%s: %s", self.kind, message.id, e, exc_info=True)
+
+        if view is None:
+            self.missing += 1
+            await interaction.response.send_message(f"❌ {self.item_name} не найдена или уже обработана.", ephemeral=True)
+            return
+
+        item = next((c for c in view.children if getattr(c, "custom_id", None) == custom_id), None)
+        if item is None or getattr(item, "disabled", False):
+            await interaction.response.send_message("⚠️ Это действие уже недоступно.", ephemeral=True)
+            return
+
+        if not await view.interaction_check(interaction):
+            return
+        self.dispatched += 1
+        with rest_lane(Lane.INTERACTION):
+            await item.callback(interaction)
+
+
+async def _data(storage_name: str, message_id: int) -> dict:
+    store = getattr(state, storage_name, None)
+    if store is None:
+        return {}
+    # при ленивой загрузке полная заявка читается из БД здесь, до того как View её увидит
+    if hasattr(store, "hydrate"):
+        return await store.hydrate(message_id) or {}
+    return store.get(message_id) or {}
+
+
+async def _request_view(interaction: discord.Interaction, message_id: int) -> Optional[View]:
+    data = await _data("active_requests", message_id)
+    user_id = int(data.get("user_id") or 0)
+    if not user_id:
+        return None
+    from views.request_view import RequestView
+    request_type = RequestType(str(data.get("request_type") or "").strip().lower())
+    return RequestView(user_id=user_id, validated_data=data, request_type=request_type)
+
+
+async def _firing_view(interaction: discord.Interaction, message_id: int) -> Optional[View]:
+    user_id = int((await _data("active_firing_requests", message_id)).get("discord_id") or 0)
+    if not user_id:
+        return None
+    from views.firing_view import FiringView
+    return FiringView(user_id=user_id)
+
+
+async def _promotion_view(interaction: discord.Interaction, message_id: int) -> Optional[View]:
+    data = await _data("active_promotion_requests", message_id)
+    user_id = int(data.get("discord_id") or 0)
+    if not user_id:
+        return None
+    from views.promotion_view import PromotionView
+    return PromotionView(
+        user_id=user_id,
+        new_rank=str(data.get("new_rank") or "").strip(),
+        full_name=str(data.get("full_name") or "сотрудник").strip() or "сотрудник",
+        message_id=message_id,
+    )
+
+
+async def _warehouse_view(interaction: discord.Interaction, message_id: int) -> Optional[View]:
+    user_id = int((await _data("warehouse_requests", message_id)).get("user_id") or 0)
+    if not user_id:
+        return None
+    from views.warehouse_request_buttons import WarehouseRequestView
+    return WarehouseRequestView(author_id=user_id, message_id=message_id)
+
+
+async def _department_view(interaction: discord.Interaction, message_id: int) -> Optional[View]:
+    data = await _data("active_department_transfers", message_id)
+    if not data:
+        return None
+    from views.department_approval_view import DepartmentApprovalView
+    return DepartmentApprovalView(
+        message_id=message_id,
+        user_id=int(data.get("user_id", 0)),
+        target_dept=str(data.get("target_dept", "")),
+        source_dept=str(data.get("source_dept", "")),
+        from_academy=bool(data.get("from_academy")),
+        form_data=dict(data.get("data") or {}),
+        approved_source=int(data.get("approved_source") or 0),
+        approved_target=int(data.get("approved_target") or 0),
+        channel_id=int(data.get("channel_id") or getattr(interaction.channel, "id", 0) or 0),
+    )
+
+
+def build_routers() -> list[ComponentRouter]:
+    return [
+        ComponentRouter("requests", ("accept", "reject", "edit"), _request_view),
+        ComponentRouter("firing", ("fire_accept", "fire_reject"), _firing_view),
+        ComponentRouter("promotion", ("promotion_accept", "promotion_reject"), _promotion_view, item_name="Рапорт"),
+        ComponentRouter("warehouse", ("warehouse_accept", "warehouse_reject", "warehouse_edit"), _warehouse_view),
+        ComponentRouter("department", ("approve_source", "reject_source", "approve_target", "reject_target"), _department_view),
+    ]
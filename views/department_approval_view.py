@@ -14,7 +14,8 @@ from database import (
 from state import active_department_transfers
 import state
 from views.message_texts import ErrorMessages
-from utils.rate_limiter import apply_role_changes, safe_discord_call
+from views.component_router import render_only
+from utils.rate_limiter import MemberMutation
 from services.department_roles import (
     get_chief_deputy_role_ids,
     get_dept_and_rank_roles,
@@ -25,6 +26,7 @@ from services.department_roles import (
 )
 from services.department_nickname import get_transfer_nickname
 from services.action_locks import action_lock
+from services.member_resolver import resolve_member, wait_for_roles
 from services.promotion_draft_cleanup import clear_promotion_draft_for_department
 from services.department_transfer_fsm import (
     get_state,
@@ -47,8 +49,7 @@ def _has_any_role(member: discord.Member, role_ids: list[int]) -> bool:
     for rid in role_ids:
         r = None
         if role_cache is not None:
-
-            r = guild.get_role(rid)
+            r = role_cache.get_role(guild.id, rid)
         else:
             r = guild.get_role(rid)
         if r and r in member.roles:
@@ -214,8 +215,9 @@ class DepartmentApprovalView(View):
                     "data": self.form_data,
                     "approved_source": self.approved_source,
                     "approved_target": self.approved_target,
+                    "channel_id": self.channel_id,
                 }
-                new_view = DepartmentApprovalView(
+                new_view = render_only(DepartmentApprovalView(
                     self.message_id,
                     self.user_id,
                     self.target_dept,
@@ -225,7 +227,7 @@ class DepartmentApprovalView(View):
                     approved_source=self.approved_source,
                     approved_target=self.approved_target,
                     channel_id=self.channel_id,
-                )
+                ))
                 try:
                     msg = await interaction.channel.fetch_message(self.message_id)
                     embed = msg.embeds[0] if msg.embeds else None
@@ -273,7 +275,7 @@ class DepartmentApprovalView(View):
         try:
             async with action_lock(self.message_id, "одобрение заявки перевод"):
                 guild = interaction.guild
-                member = guild.get_member(self.user_id) or await guild.fetch_member(self.user_id)
+                member = await resolve_member(guild, self.user_id)
                 if not member:
                     await interaction.followup.send(ErrorMessages.NOT_FOUND.format(item="пользователь"), ephemeral=True)
                     return
@@ -307,18 +309,24 @@ class DepartmentApprovalView(View):
                     )
                     return
 
-                await apply_role_changes(member, remove=to_remove, add=to_add)
+                new_nick = get_transfer_nickname(self.target_dept, self.form_data)
+                mutation = MemberMutation(member).remove(*to_remove).add(*to_add)
+                if new_nick:
+                    mutation.set_nick(new_nick)
+                await mutation.apply()
 
                 clear_promotion_draft_for_department(self.user_id, self.source_dept)
 
                 verify_failed_msg = None
+                verified = None
                 try:
-                    member = await guild.fetch_member(self.user_id)
+                    verified = await wait_for_roles(guild, self.user_id, present=to_add, absent=to_remove)
                 except Exception as e:
                     logger.warning("Не удалось обновить данные участника после смены ролей: %s", e)
+                if verified is None:
+                    logger.warning("Проверка после перевода пропущена: участник %s не получен", self.user_id)
                 else:
-
-
+                    member = verified
                     target_roles_set = set(to_add)
                     still_has_old = [r for r in to_remove if r in member.roles and r not in target_roles_set]
                     missing_new = [r for r in to_add if r not in member.roles]
@@ -343,14 +351,6 @@ class DepartmentApprovalView(View):
                         verify_failed_msg = "; ".join(msg_parts)
 
 
-                new_nick = get_transfer_nickname(self.target_dept, self.form_data)
-                if new_nick:
-                    try:
-                        await safe_discord_call(member.edit, nick=new_nick)
-                    except Exception as e:
-                        logger.warning("Не удалось сменить ник при переводе: %s", e)
-
-
                 try:
                     label = get_approval_label_target(self.target_dept)
                     await member.send(
@@ -8,10 +8,11 @@ from config import Config
 from views.theme import RED
 from views.message_texts import ErrorMessages
 from state import active_firing_requests
-from utils.rate_limiter import apply_role_changes, safe_discord_call
+from utils.rate_limiter import MemberMutation
 from utils.embed_utils import copy_embed, add_officer_field
 from services.audit import send_to_audit
 from services.action_locks import action_lock
+from services.member_resolver import resolve_member
 from database import delete_request
 from constants import StatusValues, FieldNames, WebhookPatterns
 from services.firing_fsm import can_approve
@@ -45,7 +46,7 @@ class FiringView(View):
         except Exception:
             cache = None
         if cache is not None:
-            staff_role = await cache.get_role(interaction.guild.id, Config.FIRING_STAFF_ROLE_ID)
+            staff_role = cache.get_role(interaction.guild.id, Config.FIRING_STAFF_ROLE_ID)
         else:
             staff_role = interaction.guild.get_role(Config.FIRING_STAFF_ROLE_ID)
         if not staff_role or staff_role not in interaction.user.roles:
@@ -114,7 +115,7 @@ class FiringView(View):
                     await interaction.followup.send("❌ У рапорта отсутствует embed.", ephemeral=True)
                     return
 
-                request_data = active_firing_requests.get(interaction.message.id)
+                request_data = await active_firing_requests.hydrate(interaction.message.id)
 
 
                 if not request_data:
@@ -146,9 +147,7 @@ class FiringView(View):
                     pass
 
                 try:
-                    member = interaction.guild.get_member(int(request_data.get("discord_id", 0)))
-                    if not member:
-                        member = await interaction.guild.fetch_member(int(request_data.get("discord_id", 0)))
+                    member = await resolve_member(interaction.guild, int(request_data.get("discord_id", 0)))
                 except (TypeError, ValueError, discord.NotFound):
                     member = None
 
@@ -213,18 +212,6 @@ class FiringView(View):
                     if role.id not in roles_to_keep_ids:
                         roles_to_remove.append(role)
 
-                if roles_to_remove:
-                    try:
-                        await apply_role_changes(member, remove=roles_to_remove)
-                    except discord.Forbidden:
-                        await interaction.followup.send("❌ У бота нет прав снять роли.", ephemeral=True)
-                        return
-                    except discord.HTTPException as e:
-                        logger.warning("HTTP ошибка при снятии ролей (firing): %s", e, exc_info=True)
-                        await interaction.followup.send("❌ Ошибка Discord API при снятии ролей.", ephemeral=True)
-                        return
-
-
                 fired_role = None
                 try:
                     import state as _state_for_roles  # локальный импорт, чтобы избежать циклов
@@ -232,19 +219,9 @@ class FiringView(View):
                 except Exception:
                     cache = None
                 if cache is not None:
-                    fired_role = await cache.get_role(interaction.guild.id, Config.FIRED_ROLE_ID)
+                    fired_role = cache.get_role(interaction.guild.id, Config.FIRED_ROLE_ID)
                 else:
                     fired_role = interaction.guild.get_role(Config.FIRED_ROLE_ID)
-                if fired_role:
-                    try:
-                        await apply_role_changes(member, add=[fired_role])
-                    except discord.Forbidden:
-                        await interaction.followup.send("❌ У бота нет прав выдать роль уволенного.", ephemeral=True)
-                        return
-                    except discord.HTTPException as e:
-                        logger.warning("HTTP ошибка при выдаче роли уволенного: %s", e, exc_info=True)
-                        await interaction.followup.send("❌ Ошибка Discord API при выдаче роли.", ephemeral=True)
-                        return
 
 
                 name_for_nick = (full_name or "").strip()
@@ -253,21 +230,24 @@ class FiringView(View):
                 if not name_for_nick:
                     name_for_nick = full_name or "Сотрудник"
                 prefix = (Config.FIRING_NICKNAME_PREFIX or "Уволен |").strip()
+                parts = name_for_nick.split(None, 1)
+                if len(parts) >= 2:
+                    new_nick = f"{prefix} {parts[0]} {parts[1]}"
+                else:
+                    new_nick = f"{prefix} {name_for_nick}"
+
+                # снятие ролей, роль уволенного и ник — одним запросом
+                mutation = MemberMutation(member).remove(*roles_to_remove).add(fired_role).set_nick(new_nick)
                 try:
-                    parts = name_for_nick.split(None, 1)
-                    if len(parts) >= 2:
-                        new_nick = f"{prefix} {parts[0]} {parts[1]}"
-                    else:
-                        new_nick = f"{prefix} {name_for_nick}"
-                    await safe_discord_call(member.edit, nick=new_nick)
+                    await mutation.apply()
                 except discord.Forbidden:
-                    logger.warning("Нет прав на смену ника пользователя %s", member.id)
-                    new_nick = f"{prefix} {name_for_nick}"
+                    await interaction.followup.send("❌ У бота нет прав изменить роли.", ephemeral=True)
+                    return
                 except discord.HTTPException as e:
-                    logger.warning("HTTP ошибка при смене ника пользователя %s: %s", member.id, e, exc_info=True)
-                    new_nick = f"{prefix} {name_for_nick}"
-                except Exception as e:
-                    logger.error("Ошибка при смене ника: %s", e, exc_info=True)
+                    logger.warning("HTTP ошибка при изменении ролей (firing): %s", e, exc_info=True)
+                    await interaction.followup.send("❌ Ошибка Discord API при изменении ролей.", ephemeral=True)
+                    return
+                if mutation.nick_error is not None:
                     new_nick = f"{prefix} {name_for_nick}"
 
                 try:
@@ -10,7 +10,7 @@ from constants import FieldNames, StatusValues, EmbedTitles
 from models import PromotionRequest
 import state
 from state import active_promotion_requests, grom_draft_reports, grom_last_user_data
-from database import save_request, save_grom_draft, load_grom_draft, delete_grom_draft
+from database import save_request, save_promotion_draft, load_promotion_draft, delete_promotion_draft
 from services.worker_queue import get_worker
 from services.department_roles import get_dept_role_id
 from services.ranks import is_promotion_key_allowed_for_member, get_member_rank_display
@@ -261,7 +261,7 @@ class GromLinksModal(discord.ui.Modal, title="Ссылки (ГРОМ)"):
                 return
             draft = grom_draft_reports.get(self.user_id)
             if not draft:
-                draft = await get_worker().submit(load_grom_draft, self.user_id)
+                draft = await get_worker().submit(load_promotion_draft, "grom", self.user_id)
                 if draft:
                     grom_draft_reports[self.user_id] = draft
             if not draft:
@@ -293,7 +293,7 @@ class GromLinksModal(discord.ui.Modal, title="Ссылки (ГРОМ)"):
             msg_id = draft.get("message_id")
             ephemeral_msg = draft.get("_ephemeral_msg")
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_grom_draft, self.user_id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "grom", self.user_id, snapshot)
             if not ephemeral_msg and ch_id and msg_id and interaction.guild:
                 ch = None
                 cache = getattr(state, "channel_cache", None)
@@ -344,7 +344,7 @@ class GromThanksModal(discord.ui.Modal, title="Благодарности и п
                 return
             draft = grom_draft_reports.get(self.user_id)
             if not draft:
-                draft = await get_worker().submit(load_grom_draft, self.user_id)
+                draft = await get_worker().submit(load_promotion_draft, "grom", self.user_id)
                 if draft:
                     grom_draft_reports[self.user_id] = draft
             if not draft:
@@ -356,7 +356,7 @@ class GromThanksModal(discord.ui.Modal, title="Благодарности и п
             else:
                 draft["thanks_links"] = []
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_grom_draft, self.user_id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "grom", self.user_id, snapshot)
             embed = _build_collector_embed(draft)
             view = GromCollectorView(draft.get("promotion_key", ""), self.user_id)
             await interaction.response.defer(ephemeral=True)
@@ -414,16 +414,13 @@ async def _do_submit_report(draft: dict, interaction: discord.Interaction) -> No
     embed.add_field(name=FieldNames.STATUS, value=StatusValues.PENDING, inline=True)
     embed.set_footer(text=interaction.user.display_name if interaction.user else "", icon_url=getattr(interaction.user.display_avatar, "url", None) if interaction.user else None)
     from views.promotion_view import PromotionView
-    view = PromotionView(user_id=user_id_int, new_rank=promotion_key, full_name=full_name, message_id=0)
+    from views.component_router import render_only
+    view = render_only(PromotionView(user_id=user_id_int, new_rank=promotion_key, full_name=full_name, message_id=0))
     message = await ch.send(embed=embed, view=view)
-    promo_request = PromotionRequest(discord_id=user_id_int, full_name=full_name, new_rank=promotion_key, message_link=message.jump_url)
-    active_promotion_requests[message.id] = promo_request.to_dict()
-    get_worker().submit_fire(save_request, "promotion_requests", message.id, promo_request.to_dict())
-    view.message_id = message.id
-    try:
-        await message.edit(view=view)
-    except Exception as e:
-        logger.warning("Не обновить view рапорта ГРОМ: %s", e)
+    promo_request = PromotionRequest(discord_id=user_id_int, full_name=full_name, new_rank=promotion_key, message_link=message.jump_url, channel_id=message.channel.id)
+    record = promo_request.to_record()
+    active_promotion_requests[message.id] = record
+    get_worker().submit_fire(save_request, "promotion_requests", message.id, record.to_dict())
     cid, mid = draft.get("channel_id"), draft.get("message_id")
     if cid and mid and interaction.guild:
         try:
@@ -502,11 +499,11 @@ class GromConfirmSubmitView(View):
             return
         draft = grom_draft_reports.pop(self.user_id, None)
         if not draft:
-            draft = await get_worker().submit(load_grom_draft, self.user_id)
+            draft = await get_worker().submit(load_promotion_draft, "grom", self.user_id)
         if not draft:
             await interaction.response.send_message("Сессия истекла. Начните рапорт заново.", ephemeral=True)
             return
-        get_worker().submit_fire(delete_grom_draft, self.user_id)
+        get_worker().submit_fire(delete_promotion_draft, "grom", self.user_id)
         await interaction.response.defer(ephemeral=True)
         await _do_submit_report(draft, interaction)
 
@@ -572,7 +569,7 @@ class GromRemoveLinkView(View):
         value = vals[0]
         draft = grom_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_grom_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "grom", owner_id)
             if draft:
                 grom_draft_reports[owner_id] = draft
         if not draft:
@@ -618,7 +615,7 @@ class GromRemoveLinkView(View):
         cid, mid = draft.get("channel_id"), draft.get("message_id")
         ephemeral_msg = draft.get("_ephemeral_msg")
         snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-        get_worker().submit_fire(save_grom_draft, owner_id, snapshot)
+        get_worker().submit_fire(save_promotion_draft, "grom", owner_id, snapshot)
         if not ephemeral_msg and cid and mid and interaction.guild:
             try:
                 ch = None
@@ -685,7 +682,7 @@ class GromCollectorView(View):
         owner_id = interaction.user.id
         draft = grom_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_grom_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "grom", owner_id)
             if draft:
                 grom_draft_reports[owner_id] = draft
         if not draft:
@@ -708,7 +705,7 @@ class GromCollectorView(View):
         owner_id = interaction.user.id
         draft = grom_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_grom_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "grom", owner_id)
             if draft:
                 grom_draft_reports[owner_id] = draft
         if not draft:
@@ -728,7 +725,7 @@ class GromCollectorView(View):
         owner_id = interaction.user.id
         draft = grom_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_grom_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "grom", owner_id)
             if draft:
                 grom_draft_reports[owner_id] = draft
         if not draft:
@@ -754,7 +751,7 @@ class GromCollectorView(View):
             return
         draft = grom_draft_reports.get(self.owner_id)
         if not draft:
-            draft = await get_worker().submit(load_grom_draft, self.owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "grom", self.owner_id)
             if draft:
                 grom_draft_reports[self.owner_id] = draft
         if not draft:
@@ -771,7 +768,7 @@ class GromCollectorView(View):
         owner_id = interaction.user.id
         draft = grom_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_grom_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "grom", owner_id)
             if draft:
                 grom_draft_reports[owner_id] = draft
         if not draft:
@@ -797,7 +794,7 @@ class GromCollectorView(View):
             return
         draft = grom_draft_reports.get(uid)
         if not draft:
-            draft = await get_worker().submit(load_grom_draft, uid)
+            draft = await get_worker().submit(load_promotion_draft, "grom", uid)
             if draft:
                 grom_draft_reports[uid] = draft
         if not draft:
@@ -820,7 +817,7 @@ class GromCollectorView(View):
         points_ok = total_bonus >= points_required
         if req_ok and points_ok:
             grom_draft_reports.pop(uid, None)
-            get_worker().submit_fire(delete_grom_draft, uid)
+            get_worker().submit_fire(delete_promotion_draft, "grom", uid)
             await _do_submit_report(draft, interaction)
         else:
             missing = []
@@ -871,7 +868,7 @@ class GromPromotionModal(discord.ui.Modal, title="Рапорт на повыше
                 role = None
                 role_cache = getattr(state, "role_cache", None)
                 if role_cache and dept_role_id:
-                    role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                    role = role_cache.get_role(interaction.guild.id, dept_role_id)
                 if role is None and dept_role_id:
                     role = interaction.guild.get_role(dept_role_id) if interaction.guild else None
                 if role and role not in interaction.user.roles:
@@ -913,7 +910,7 @@ class GromPromotionModal(discord.ui.Modal, title="Рапорт на повыше
             draft["channel_id"] = interaction.channel.id
             grom_draft_reports[interaction.user.id] = draft
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_grom_draft, interaction.user.id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "grom", interaction.user.id, snapshot)
             grom_last_user_data[interaction.user.id] = {
                 "full_name": draft["full_name"],
                 "discord_id": draft["discord_id"],
@@ -937,7 +934,7 @@ class GromPromotionSelect(Select):
                 role = None
                 role_cache = getattr(state, "role_cache", None)
                 if role_cache and dept_role_id:
-                    role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                    role = role_cache.get_role(interaction.guild.id, dept_role_id)
                 if role is None and dept_role_id:
                     role = interaction.guild.get_role(dept_role_id) if interaction.guild else None
                 if role and role not in interaction.user.roles:
@@ -982,7 +979,7 @@ class GromPromotionApplyView(View):
             role = None
             role_cache = getattr(state, "role_cache", None)
             if role_cache and dept_role_id:
-                role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                role = role_cache.get_role(interaction.guild.id, dept_role_id)
             if role is None and dept_role_id:
                 role = interaction.guild.get_role(dept_role_id)
             if role and role not in interaction.user.roles:
@@ -994,7 +991,7 @@ class GromPromotionApplyView(View):
         uid = interaction.user.id
         draft = grom_draft_reports.get(uid)
         if not draft:
-            draft = await get_worker().submit(load_grom_draft, uid)
+            draft = await get_worker().submit(load_promotion_draft, "grom", uid)
         if not draft:
             await interaction.response.send_message("У вас нет черновика рапорта ГРОМ. Выберите повышение выше, чтобы начать новый рапорт.", ephemeral=True)
             return
@@ -9,7 +9,7 @@ from constants import FieldNames, StatusValues, EmbedTitles
 from models import PromotionRequest
 import state
 from state import active_promotion_requests, orls_draft_reports, orls_last_user_data
-from database import save_request, save_orls_draft, load_orls_draft, delete_orls_draft
+from database import save_request, save_promotion_draft, load_promotion_draft, delete_promotion_draft
 from services.worker_queue import get_worker
 from services.department_roles import get_dept_role_id
 from services.ranks import is_promotion_key_allowed_for_member, get_member_rank_display
@@ -305,7 +305,7 @@ class OrlsLinksModal(discord.ui.Modal, title="Ссылки"):
                 return
             draft = orls_draft_reports.get(self.user_id)
             if not draft:
-                draft = await get_worker().submit(load_orls_draft, self.user_id)
+                draft = await get_worker().submit(load_promotion_draft, "orls", self.user_id)
                 if draft:
                     orls_draft_reports[self.user_id] = draft
             if not draft:
@@ -337,7 +337,7 @@ class OrlsLinksModal(discord.ui.Modal, title="Ссылки"):
             msg_id = draft.get("message_id")
             ephemeral_msg = draft.get("_ephemeral_msg")
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_orls_draft, self.user_id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "orls", self.user_id, snapshot)
             if not ephemeral_msg and ch_id and msg_id and interaction.guild:
                 ch = None
                 cache = getattr(state, "channel_cache", None)
@@ -388,7 +388,7 @@ class OrlsThanksModal(discord.ui.Modal, title="Благодарности и п
                 return
             draft = orls_draft_reports.get(self.user_id)
             if not draft:
-                draft = await get_worker().submit(load_orls_draft, self.user_id)
+                draft = await get_worker().submit(load_promotion_draft, "orls", self.user_id)
                 if draft:
                     orls_draft_reports[self.user_id] = draft
             if not draft:
@@ -400,7 +400,7 @@ class OrlsThanksModal(discord.ui.Modal, title="Благодарности и п
             else:
                 draft["thanks_links"] = []
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_orls_draft, self.user_id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "orls", self.user_id, snapshot)
             embed = _build_collector_embed(draft)
             view = OrlsCollectorView(draft.get("promotion_key", ""), self.user_id)
             await interaction.response.defer(ephemeral=True)
@@ -453,16 +453,13 @@ async def _do_submit_report(draft: dict, interaction: discord.Interaction) -> No
     embed.add_field(name=FieldNames.STATUS, value=StatusValues.PENDING, inline=True)
     embed.set_footer(text=interaction.user.display_name if interaction.user else "", icon_url=getattr(interaction.user.display_avatar, "url", None) if interaction.user else None)
     from views.promotion_view import PromotionView
-    view = PromotionView(user_id=user_id_int, new_rank=promotion_key, full_name=full_name, message_id=0)
+    from views.component_router import render_only
+    view = render_only(PromotionView(user_id=user_id_int, new_rank=promotion_key, full_name=full_name, message_id=0))
     message = await ch.send(embed=embed, view=view)
-    promo_request = PromotionRequest(discord_id=user_id_int, full_name=full_name, new_rank=promotion_key, message_link=message.jump_url)
-    active_promotion_requests[message.id] = promo_request.to_dict()
-    get_worker().submit_fire(save_request, "promotion_requests", message.id, promo_request.to_dict())
-    view.message_id = message.id
-    try:
-        await message.edit(view=view)
-    except Exception as e:
-        logger.warning("Не обновить view рапорта: %s", e)
+    promo_request = PromotionRequest(discord_id=user_id_int, full_name=full_name, new_rank=promotion_key, message_link=message.jump_url, channel_id=message.channel.id)
+    record = promo_request.to_record()
+    active_promotion_requests[message.id] = record
+    get_worker().submit_fire(save_request, "promotion_requests", message.id, record.to_dict())
     cid, mid = draft.get("channel_id"), draft.get("message_id")
     if cid and mid and interaction.guild:
         try:
@@ -600,11 +597,11 @@ class OrlsConfirmSubmitView(View):
             return
         draft = orls_draft_reports.pop(self.user_id, None)
         if not draft:
-            draft = await get_worker().submit(load_orls_draft, self.user_id)
+            draft = await get_worker().submit(load_promotion_draft, "orls", self.user_id)
         if not draft:
             await interaction.response.send_message("Сессия истекла. Начните рапорт заново.", ephemeral=True)
             return
-        get_worker().submit_fire(delete_orls_draft, self.user_id)
+        get_worker().submit_fire(delete_promotion_draft, "orls", self.user_id)
         await interaction.response.defer(ephemeral=True)
         await _do_submit_report(draft, interaction)
 
@@ -671,7 +668,7 @@ class OrlsRemoveLinkView(View):
         value = vals[0]
         draft = orls_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_orls_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "orls", owner_id)
             if draft:
                 orls_draft_reports[owner_id] = draft
         if not draft:
@@ -717,7 +714,7 @@ class OrlsRemoveLinkView(View):
         cid, mid = draft.get("channel_id"), draft.get("message_id")
         ephemeral_msg = draft.get("_ephemeral_msg")
         snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-        get_worker().submit_fire(save_orls_draft, owner_id, snapshot)
+        get_worker().submit_fire(save_promotion_draft, "orls", owner_id, snapshot)
         if not ephemeral_msg and cid and mid and interaction.guild:
             try:
                 ch = None
@@ -784,7 +781,7 @@ class OrlsCollectorView(View):
         owner_id = interaction.user.id
         draft = orls_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_orls_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "orls", owner_id)
             if draft:
                 orls_draft_reports[owner_id] = draft
         if not draft:
@@ -807,7 +804,7 @@ class OrlsCollectorView(View):
         owner_id = interaction.user.id
         draft = orls_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_orls_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "orls", owner_id)
             if draft:
                 orls_draft_reports[owner_id] = draft
         if not draft:
@@ -827,7 +824,7 @@ class OrlsCollectorView(View):
         owner_id = interaction.user.id
         draft = orls_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_orls_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "orls", owner_id)
             if draft:
                 orls_draft_reports[owner_id] = draft
         if not draft:
@@ -853,7 +850,7 @@ class OrlsCollectorView(View):
             return
         draft = orls_draft_reports.get(self.owner_id)
         if not draft:
-            draft = await get_worker().submit(load_orls_draft, self.owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "orls", self.owner_id)
             if draft:
                 orls_draft_reports[self.owner_id] = draft
         if not draft:
@@ -870,7 +867,7 @@ class OrlsCollectorView(View):
         owner_id = interaction.user.id
         draft = orls_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_orls_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "orls", owner_id)
             if draft:
                 orls_draft_reports[owner_id] = draft
         if not draft:
@@ -896,7 +893,7 @@ class OrlsCollectorView(View):
             return
         draft = orls_draft_reports.get(uid)
         if not draft:
-            draft = await get_worker().submit(load_orls_draft, uid)
+            draft = await get_worker().submit(load_promotion_draft, "orls", uid)
             if draft:
                 orls_draft_reports[uid] = draft
         if not draft:
@@ -919,7 +916,7 @@ class OrlsCollectorView(View):
         points_ok = total_bonus >= points_required
         if req_ok and points_ok:
             orls_draft_reports.pop(uid, None)
-            get_worker().submit_fire(delete_orls_draft, uid)
+            get_worker().submit_fire(delete_promotion_draft, "orls", uid)
             await _do_submit_report(draft, interaction)
         else:
             missing = []
@@ -971,7 +968,7 @@ class OrlsPromotionModal(discord.ui.Modal, title="Рапорт на повыше
                 role = None
                 role_cache = getattr(state, "role_cache", None)
                 if role_cache and dept_role_id:
-                    role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                    role = role_cache.get_role(interaction.guild.id, dept_role_id)
                 if role is None and dept_role_id:
                     role = interaction.guild.get_role(dept_role_id) if interaction.guild else None
                 if role and role not in interaction.user.roles:
@@ -1013,7 +1010,7 @@ class OrlsPromotionModal(discord.ui.Modal, title="Рапорт на повыше
             draft["channel_id"] = interaction.channel.id
             orls_draft_reports[interaction.user.id] = draft
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_orls_draft, interaction.user.id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "orls", interaction.user.id, snapshot)
             orls_last_user_data[interaction.user.id] = {
                 "full_name": draft["full_name"],
                 "discord_id": draft["discord_id"],
@@ -1037,7 +1034,7 @@ class OrlsPromotionSelect(Select):
                 role = None
                 role_cache = getattr(state, "role_cache", None)
                 if role_cache and dept_role_id:
-                    role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                    role = role_cache.get_role(interaction.guild.id, dept_role_id)
                 if role is None and dept_role_id:
                     role = interaction.guild.get_role(dept_role_id) if interaction.guild else None
                 if role and role not in interaction.user.roles:
@@ -1082,7 +1079,7 @@ class OrlsPromotionApplyView(View):
             role = None
             role_cache = getattr(state, "role_cache", None)
             if role_cache and dept_role_id:
-                role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                role = role_cache.get_role(interaction.guild.id, dept_role_id)
             if role is None and dept_role_id:
                 role = interaction.guild.get_role(dept_role_id)
             if role and role not in interaction.user.roles:
@@ -1094,7 +1091,7 @@ class OrlsPromotionApplyView(View):
         uid = interaction.user.id
         draft = orls_draft_reports.get(uid)
         if not draft:
-            draft = await get_worker().submit(load_orls_draft, uid)
+            draft = await get_worker().submit(load_promotion_draft, "orls", uid)
         if not draft:
             await interaction.response.send_message("У вас нет черновика рапорта. Выберите повышение выше, чтобы начать новый рапорт.", ephemeral=True)
             return
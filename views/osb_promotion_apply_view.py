@@ -10,7 +10,7 @@ from constants import FieldNames, StatusValues, EmbedTitles
 from models import PromotionRequest
 import state
 from state import active_promotion_requests, osb_draft_reports, osb_last_user_data
-from database import save_request, save_osb_draft, load_osb_draft, delete_osb_draft
+from database import save_request, save_promotion_draft, load_promotion_draft, delete_promotion_draft
 from services.worker_queue import get_worker
 from services.department_roles import get_dept_role_id
 from services.ranks import is_promotion_key_allowed_for_member, get_member_rank_display
@@ -258,7 +258,7 @@ class OsbLinksModal(discord.ui.Modal, title="Ссылки (ОСБ)"):
                 return
             draft = osb_draft_reports.get(self.user_id)
             if not draft:
-                draft = await get_worker().submit(load_osb_draft, self.user_id)
+                draft = await get_worker().submit(load_promotion_draft, "osb", self.user_id)
                 if draft:
                     osb_draft_reports[self.user_id] = draft
             if not draft:
@@ -290,7 +290,7 @@ class OsbLinksModal(discord.ui.Modal, title="Ссылки (ОСБ)"):
             msg_id = draft.get("message_id")
             ephemeral_msg = draft.get("_ephemeral_msg")
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_osb_draft, self.user_id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "osb", self.user_id, snapshot)
             if not ephemeral_msg and ch_id and msg_id and interaction.guild:
                 ch = None
                 cache = getattr(state, "channel_cache", None)
@@ -341,7 +341,7 @@ class OsbThanksModal(discord.ui.Modal, title="Благодарности и по
                 return
             draft = osb_draft_reports.get(self.user_id)
             if not draft:
-                draft = await get_worker().submit(load_osb_draft, self.user_id)
+                draft = await get_worker().submit(load_promotion_draft, "osb", self.user_id)
                 if draft:
                     osb_draft_reports[self.user_id] = draft
             if not draft:
@@ -353,7 +353,7 @@ class OsbThanksModal(discord.ui.Modal, title="Благодарности и по
             else:
                 draft["thanks_links"] = []
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_osb_draft, self.user_id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "osb", self.user_id, snapshot)
             embed = _build_collector_embed(draft)
             view = OsbCollectorView(draft.get("promotion_key", ""), self.user_id)
             await interaction.response.defer(ephemeral=True)
@@ -411,16 +411,13 @@ async def _do_submit_report(draft: dict, interaction: discord.Interaction) -> No
     embed.add_field(name=FieldNames.STATUS, value=StatusValues.PENDING, inline=True)
     embed.set_footer(text=interaction.user.display_name if interaction.user else "", icon_url=getattr(interaction.user.display_avatar, "url", None) if interaction.user else None)
     from views.promotion_view import PromotionView
-    view = PromotionView(user_id=user_id_int, new_rank=promotion_key, full_name=full_name, message_id=0)
+    from views.component_router import render_only
+    view = render_only(PromotionView(user_id=user_id_int, new_rank=promotion_key, full_name=full_name, message_id=0))
     message = await ch.send(embed=embed, view=view)
-    promo_request = PromotionRequest(discord_id=user_id_int, full_name=full_name, new_rank=promotion_key, message_link=message.jump_url)
-    active_promotion_requests[message.id] = promo_request.to_dict()
-    get_worker().submit_fire(save_request, "promotion_requests", message.id, promo_request.to_dict())
-    view.message_id = message.id
-    try:
-        await message.edit(view=view)
-    except Exception as e:
-        logger.warning("Не обновить view рапорта ОСБ: %s", e)
+    promo_request = PromotionRequest(discord_id=user_id_int, full_name=full_name, new_rank=promotion_key, message_link=message.jump_url, channel_id=message.channel.id)
+    record = promo_request.to_record()
+    active_promotion_requests[message.id] = record
+    get_worker().submit_fire(save_request, "promotion_requests", message.id, record.to_dict())
     cid, mid = draft.get("channel_id"), draft.get("message_id")
     if cid and mid and interaction.guild:
         try:
@@ -499,11 +496,11 @@ class OsbConfirmSubmitView(View):
             return
         draft = osb_draft_reports.pop(self.user_id, None)
         if not draft:
-            draft = await get_worker().submit(load_osb_draft, self.user_id)
+            draft = await get_worker().submit(load_promotion_draft, "osb", self.user_id)
         if not draft:
             await interaction.response.send_message("Сессия истекла. Начните рапорт заново.", ephemeral=True)
             return
-        get_worker().submit_fire(delete_osb_draft, self.user_id)
+        get_worker().submit_fire(delete_promotion_draft, "osb", self.user_id)
         await interaction.response.defer(ephemeral=True)
         await _do_submit_report(draft, interaction)
 
@@ -569,7 +566,7 @@ class OsbRemoveLinkView(View):
         value = vals[0]
         draft = osb_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_osb_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "osb", owner_id)
             if draft:
                 osb_draft_reports[owner_id] = draft
         if not draft:
@@ -615,7 +612,7 @@ class OsbRemoveLinkView(View):
         cid, mid = draft.get("channel_id"), draft.get("message_id")
         ephemeral_msg = draft.get("_ephemeral_msg")
         snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-        get_worker().submit_fire(save_osb_draft, owner_id, snapshot)
+        get_worker().submit_fire(save_promotion_draft, "osb", owner_id, snapshot)
         if not ephemeral_msg and cid and mid and interaction.guild:
             try:
                 ch = None
@@ -682,7 +679,7 @@ class OsbCollectorView(View):
         owner_id = interaction.user.id
         draft = osb_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_osb_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "osb", owner_id)
             if draft:
                 osb_draft_reports[owner_id] = draft
         if not draft:
@@ -705,7 +702,7 @@ class OsbCollectorView(View):
         owner_id = interaction.user.id
         draft = osb_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_osb_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "osb", owner_id)
             if draft:
                 osb_draft_reports[owner_id] = draft
         if not draft:
@@ -725,7 +722,7 @@ class OsbCollectorView(View):
         owner_id = interaction.user.id
         draft = osb_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_osb_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "osb", owner_id)
             if draft:
                 osb_draft_reports[owner_id] = draft
         if not draft:
@@ -751,7 +748,7 @@ class OsbCollectorView(View):
             return
         draft = osb_draft_reports.get(self.owner_id)
         if not draft:
-            draft = await get_worker().submit(load_osb_draft, self.owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "osb", self.owner_id)
             if draft:
                 osb_draft_reports[self.owner_id] = draft
         if not draft:
@@ -768,7 +765,7 @@ class OsbCollectorView(View):
         owner_id = interaction.user.id
         draft = osb_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_osb_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "osb", owner_id)
             if draft:
                 osb_draft_reports[owner_id] = draft
         if not draft:
@@ -794,7 +791,7 @@ class OsbCollectorView(View):
             return
         draft = osb_draft_reports.get(uid)
         if not draft:
-            draft = await get_worker().submit(load_osb_draft, uid)
+            draft = await get_worker().submit(load_promotion_draft, "osb", uid)
             if draft:
                 osb_draft_reports[uid] = draft
         if not draft:
@@ -817,7 +814,7 @@ class OsbCollectorView(View):
         points_ok = total_bonus >= points_required
         if req_ok and points_ok:
             osb_draft_reports.pop(uid, None)
-            get_worker().submit_fire(delete_osb_draft, uid)
+            get_worker().submit_fire(delete_promotion_draft, "osb", uid)
             await _do_submit_report(draft, interaction)
         else:
             missing = []
@@ -868,7 +865,7 @@ class OsbPromotionModal(discord.ui.Modal, title="Рапорт на повыше
                 role = None
                 role_cache = getattr(state, "role_cache", None)
                 if role_cache and dept_role_id:
-                    role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                    role = role_cache.get_role(interaction.guild.id, dept_role_id)
                 if role is None and dept_role_id:
                     role = interaction.guild.get_role(dept_role_id) if interaction.guild else None
                 if role and role not in interaction.user.roles:
@@ -910,7 +907,7 @@ class OsbPromotionModal(discord.ui.Modal, title="Рапорт на повыше
             draft["channel_id"] = interaction.channel.id
             osb_draft_reports[interaction.user.id] = draft
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_osb_draft, interaction.user.id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "osb", interaction.user.id, snapshot)
             osb_last_user_data[interaction.user.id] = {
                 "full_name": draft["full_name"],
                 "discord_id": draft["discord_id"],
@@ -934,7 +931,7 @@ class OsbPromotionSelect(Select):
                 role = None
                 role_cache = getattr(state, "role_cache", None)
                 if role_cache and dept_role_id:
-                    role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                    role = role_cache.get_role(interaction.guild.id, dept_role_id)
                 if role is None and dept_role_id:
                     role = interaction.guild.get_role(dept_role_id) if interaction.guild else None
                 if role and role not in interaction.user.roles:
@@ -979,7 +976,7 @@ class OsbPromotionApplyView(View):
             role = None
             role_cache = getattr(state, "role_cache", None)
             if role_cache and dept_role_id:
-                role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                role = role_cache.get_role(interaction.guild.id, dept_role_id)
             if role is None and dept_role_id:
                 role = interaction.guild.get_role(dept_role_id)
             if role and role not in interaction.user.roles:
@@ -991,7 +988,7 @@ class OsbPromotionApplyView(View):
         uid = interaction.user.id
         draft = osb_draft_reports.get(uid)
         if not draft:
-            draft = await get_worker().submit(load_osb_draft, uid)
+            draft = await get_worker().submit(load_promotion_draft, "osb", uid)
         if not draft:
             await interaction.response.send_message("У вас нет черновика рапорта ОСБ. Выберите повышение выше, чтобы начать новый рапорт.", ephemeral=True)
             return
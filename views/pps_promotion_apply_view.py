@@ -10,7 +10,7 @@ from constants import FieldNames, StatusValues, EmbedTitles
 from models import PromotionRequest
 import state
 from state import active_promotion_requests, pps_draft_reports, pps_last_user_data
-from database import save_request, save_pps_draft, load_pps_draft, delete_pps_draft
+from database import save_request, save_promotion_draft, load_promotion_draft, delete_promotion_draft
 from services.worker_queue import get_worker
 from services.department_roles import get_dept_role_id
 from services.ranks import is_promotion_key_allowed_for_member, get_member_rank_display
@@ -266,7 +266,7 @@ class PpsLinksModal(discord.ui.Modal, title="Ссылки (ППС)"):
                 return
             draft = pps_draft_reports.get(self.user_id)
             if not draft:
-                draft = await get_worker().submit(load_pps_draft, self.user_id)
+                draft = await get_worker().submit(load_promotion_draft, "pps", self.user_id)
                 if draft:
                     pps_draft_reports[self.user_id] = draft
             if not draft:
@@ -298,7 +298,7 @@ class PpsLinksModal(discord.ui.Modal, title="Ссылки (ППС)"):
             msg_id = draft.get("message_id")
             ephemeral_msg = draft.get("_ephemeral_msg")
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_pps_draft, self.user_id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "pps", self.user_id, snapshot)
             if not ephemeral_msg and ch_id and msg_id and interaction.guild:
                 ch = None
                 cache = getattr(state, "channel_cache", None)
@@ -349,7 +349,7 @@ class PpsThanksModal(discord.ui.Modal, title="Благодарности и по
                 return
             draft = pps_draft_reports.get(self.user_id)
             if not draft:
-                draft = await get_worker().submit(load_pps_draft, self.user_id)
+                draft = await get_worker().submit(load_promotion_draft, "pps", self.user_id)
                 if draft:
                     pps_draft_reports[self.user_id] = draft
             if not draft:
@@ -361,7 +361,7 @@ class PpsThanksModal(discord.ui.Modal, title="Благодарности и по
             else:
                 draft["thanks_links"] = []
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_pps_draft, self.user_id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "pps", self.user_id, snapshot)
             embed = _build_collector_embed(draft)
             view = PpsCollectorView(draft.get("promotion_key", ""), self.user_id)
             await interaction.response.defer(ephemeral=True)
@@ -419,16 +419,13 @@ async def _do_submit_report(draft: dict, interaction: discord.Interaction) -> No
     embed.add_field(name=FieldNames.STATUS, value=StatusValues.PENDING, inline=True)
     embed.set_footer(text=interaction.user.display_name if interaction.user else "", icon_url=getattr(interaction.user.display_avatar, "url", None) if interaction.user else None)
     from views.promotion_view import PromotionView
-    view = PromotionView(user_id=user_id_int, new_rank=promotion_key, full_name=full_name, message_id=0)
+    from views.component_router import render_only
+    view = render_only(PromotionView(user_id=user_id_int, new_rank=promotion_key, full_name=full_name, message_id=0))
     message = await ch.send(embed=embed, view=view)
-    promo_request = PromotionRequest(discord_id=user_id_int, full_name=full_name, new_rank=promotion_key, message_link=message.jump_url)
-    active_promotion_requests[message.id] = promo_request.to_dict()
-    get_worker().submit_fire(save_request, "promotion_requests", message.id, promo_request.to_dict())
-    view.message_id = message.id
-    try:
-        await message.edit(view=view)
-    except Exception as e:
-        logger.warning("Не обновить view рапорта ППС: %s", e)
+    promo_request = PromotionRequest(discord_id=user_id_int, full_name=full_name, new_rank=promotion_key, message_link=message.jump_url, channel_id=message.channel.id)
+    record = promo_request.to_record()
+    active_promotion_requests[message.id] = record
+    get_worker().submit_fire(save_request, "promotion_requests", message.id, record.to_dict())
     cid, mid = draft.get("channel_id"), draft.get("message_id")
     if cid and mid and interaction.guild:
         try:
@@ -507,11 +504,11 @@ class PpsConfirmSubmitView(View):
             return
         draft = pps_draft_reports.pop(self.user_id, None)
         if not draft:
-            draft = await get_worker().submit(load_pps_draft, self.user_id)
+            draft = await get_worker().submit(load_promotion_draft, "pps", self.user_id)
         if not draft:
             await interaction.response.send_message("Сессия истекла. Начните рапорт заново.", ephemeral=True)
             return
-        get_worker().submit_fire(delete_pps_draft, self.user_id)
+        get_worker().submit_fire(delete_promotion_draft, "pps", self.user_id)
         await interaction.response.defer(ephemeral=True)
         await _do_submit_report(draft, interaction)
 
@@ -577,7 +574,7 @@ class PpsRemoveLinkView(View):
         value = vals[0]
         draft = pps_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_pps_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "pps", owner_id)
             if draft:
                 pps_draft_reports[owner_id] = draft
         if not draft:
@@ -623,7 +620,7 @@ class PpsRemoveLinkView(View):
         cid, mid = draft.get("channel_id"), draft.get("message_id")
         ephemeral_msg = draft.get("_ephemeral_msg")
         snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-        get_worker().submit_fire(save_pps_draft, owner_id, snapshot)
+        get_worker().submit_fire(save_promotion_draft, "pps", owner_id, snapshot)
         if not ephemeral_msg and cid and mid and interaction.guild:
             try:
                 ch = None
@@ -690,7 +687,7 @@ class PpsCollectorView(View):
         owner_id = interaction.user.id
         draft = pps_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_pps_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "pps", owner_id)
             if draft:
                 pps_draft_reports[owner_id] = draft
         if not draft:
@@ -713,7 +710,7 @@ class PpsCollectorView(View):
         owner_id = interaction.user.id
         draft = pps_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_pps_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "pps", owner_id)
             if draft:
                 pps_draft_reports[owner_id] = draft
         if not draft:
@@ -733,7 +730,7 @@ class PpsCollectorView(View):
         owner_id = interaction.user.id
         draft = pps_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_pps_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "pps", owner_id)
             if draft:
                 pps_draft_reports[owner_id] = draft
         if not draft:
@@ -759,7 +756,7 @@ class PpsCollectorView(View):
             return
         draft = pps_draft_reports.get(self.owner_id)
         if not draft:
-            draft = await get_worker().submit(load_pps_draft, self.owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "pps", self.owner_id)
             if draft:
                 pps_draft_reports[self.owner_id] = draft
         if not draft:
@@ -776,7 +773,7 @@ class PpsCollectorView(View):
         owner_id = interaction.user.id
         draft = pps_draft_reports.get(owner_id)
         if not draft:
-            draft = await get_worker().submit(load_pps_draft, owner_id)
+            draft = await get_worker().submit(load_promotion_draft, "pps", owner_id)
             if draft:
                 pps_draft_reports[owner_id] = draft
         if not draft:
@@ -802,7 +799,7 @@ class PpsCollectorView(View):
             return
         draft = pps_draft_reports.get(uid)
         if not draft:
-            draft = await get_worker().submit(load_pps_draft, uid)
+            draft = await get_worker().submit(load_promotion_draft, "pps", uid)
             if draft:
                 pps_draft_reports[uid] = draft
         if not draft:
@@ -825,7 +822,7 @@ class PpsCollectorView(View):
         points_ok = total_bonus >= points_required
         if req_ok and points_ok:
             pps_draft_reports.pop(uid, None)
-            get_worker().submit_fire(delete_pps_draft, uid)
+            get_worker().submit_fire(delete_promotion_draft, "pps", uid)
             await _do_submit_report(draft, interaction)
         else:
             missing = []
@@ -876,7 +873,7 @@ class PpsPromotionModal(discord.ui.Modal, title="Рапорт на повыше
                 role = None
                 role_cache = getattr(state, "role_cache", None)
                 if role_cache and dept_role_id:
-                    role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                    role = role_cache.get_role(interaction.guild.id, dept_role_id)
                 if role is None and dept_role_id:
                     role = interaction.guild.get_role(dept_role_id) if interaction.guild else None
                 if role and role not in interaction.user.roles:
@@ -918,7 +915,7 @@ class PpsPromotionModal(discord.ui.Modal, title="Рапорт на повыше
             draft["channel_id"] = interaction.channel.id
             pps_draft_reports[interaction.user.id] = draft
             snapshot = {k: v for k, v in draft.items() if k != "_ephemeral_msg"}
-            get_worker().submit_fire(save_pps_draft, interaction.user.id, snapshot)
+            get_worker().submit_fire(save_promotion_draft, "pps", interaction.user.id, snapshot)
             pps_last_user_data[interaction.user.id] = {
                 "full_name": draft["full_name"],
                 "discord_id": draft["discord_id"],
@@ -942,7 +939,7 @@ class PpsPromotionSelect(Select):
                 role = None
                 role_cache = getattr(state, "role_cache", None)
                 if role_cache and dept_role_id:
-                    role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                    role = role_cache.get_role(interaction.guild.id, dept_role_id)
                 if role is None and dept_role_id:
                     role = interaction.guild.get_role(dept_role_id) if interaction.guild else None
                 if role and role not in interaction.user.roles:
@@ -987,7 +984,7 @@ class PpsPromotionApplyView(View):
             role = None
             role_cache = getattr(state, "role_cache", None)
             if role_cache and dept_role_id:
-                role = await role_cache.get_role(interaction.guild.id, dept_role_id)
+                role = role_cache.get_role(interaction.guild.id, dept_role_id)
             if role is None and dept_role_id:
                 role = interaction.guild.get_role(dept_role_id)
             if role and role not in interaction.user.roles:
@@ -999,7 +996,7 @@ class PpsPromotionApplyView(View):
         uid = interaction.user.id
         draft = pps_draft_reports.get(uid)
         if not draft:
-            draft = await get_worker().submit(load_pps_draft, uid)
+            draft = await get_worker().submit(load_promotion_draft, "pps", uid)
         if not draft:
             await interaction.response.send_message("У вас нет черновика рапорта ППС. Выберите повышение выше, чтобы начать новый рапорт.", ephemeral=True)
             return
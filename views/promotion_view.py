@@ -9,14 +9,14 @@ from views.theme import GREEN
 from views.message_texts import ErrorMessages
 import state
 from state import active_promotion_requests
-from utils.rate_limiter import apply_role_changes
+from utils.rate_limiter import MemberMutation
 from utils.embed_utils import copy_embed, add_officer_field, update_embed_status
 from services.audit import send_to_audit
 from services.action_locks import action_lock
+from services.member_resolver import resolve_member, wait_for_roles
 from services.ranks import (
     find_role_id_for_transition,
-    get_all_rank_role_ids_from_mapping,
-    get_all_rank_names_from_mapping,
+    get_rank_index,
     parse_transition_to_new_rank,
 )
 from database import delete_request
@@ -88,7 +88,7 @@ class PromotionView(View):
             staff_role = None
             role_cache = getattr(state, "role_cache", None)
             if role_cache:
-                staff_role = await role_cache.get_role(interaction.guild.id, main_role_id)
+                staff_role = role_cache.get_role(interaction.guild.id, main_role_id)
             if staff_role is None:
                 staff_role = interaction.guild.get_role(main_role_id)
             if not staff_role or staff_role not in member_roles:
@@ -102,7 +102,7 @@ class PromotionView(View):
         role_cache = getattr(state, "role_cache", None)
         role_ids_to_fetch = [main_role_id, *extra_role_ids]
         if role_cache:
-            allowed_roles = [r for r in await role_cache.get_many_roles(interaction.guild.id, role_ids_to_fetch) if r]
+            allowed_roles = [r for r in role_cache.get_many_roles(interaction.guild.id, role_ids_to_fetch) if r]
         else:
             for rid in role_ids_to_fetch:
                 role = interaction.guild.get_role(int(rid))
@@ -186,7 +186,7 @@ class PromotionView(View):
                     return
 
 
-                request_data = active_promotion_requests.get(self.message_id)
+                request_data = await active_promotion_requests.hydrate(self.message_id)
                 if not request_data:
                     request_data = self._rebuild_request_data_from_embed(message)
                     if request_data:
@@ -226,19 +226,15 @@ class PromotionView(View):
                 except Exception:
                     pass
 
-                member = interaction.guild.get_member(self.user_id)
-                if not member:
-                    try:
-                        member = await interaction.guild.fetch_member(self.user_id)
-                    except discord.NotFound:
-                        member = None
-                    except discord.Forbidden:
-                        await interaction.followup.send("❌ У бота нет прав получить участника.", ephemeral=True)
-                        return
-                    except discord.HTTPException as e:
-                        logger.warning("Promotion: HTTP ошибка fetch_member %s: %s", self.user_id, e)
-                        await interaction.followup.send("❌ Ошибка Discord API при получении пользователя.", ephemeral=True)
-                        return
+                try:
+                    member = await resolve_member(interaction.guild, self.user_id)
+                except discord.Forbidden:
+                    await interaction.followup.send("❌ У бота нет прав получить участника.", ephemeral=True)
+                    return
+                except discord.HTTPException as e:
+                    logger.warning("Promotion: HTTP ошибка fetch_member %s: %s", self.user_id, e)
+                    await interaction.followup.send("❌ Ошибка Discord API при получении пользователя.", ephemeral=True)
+                    return
 
                 if not member:
                     await interaction.followup.send(ErrorMessages.NOT_FOUND.format(item="пользователь"), ephemeral=True)
@@ -271,7 +267,7 @@ class PromotionView(View):
                 new_role = None
                 role_cache = getattr(state, "role_cache", None)
                 if role_cache:
-                    new_role = await role_cache.get_role(interaction.guild.id, int(new_role_id))
+                    new_role = role_cache.get_role(interaction.guild.id, int(new_role_id))
                 if new_role is None:
                     new_role = interaction.guild.get_role(int(new_role_id))
                 if not new_role:
@@ -281,9 +277,9 @@ class PromotionView(View):
                     )
                     return
 
-                rank_role_ids = set(getattr(Config, "ALL_RANK_ROLE_IDS", []) or [])
-                rank_role_ids |= set(get_all_rank_role_ids_from_mapping())
-                rank_names = get_all_rank_names_from_mapping()
+                rank_index = get_rank_index()
+                rank_role_ids = rank_index.display_role_ids
+                rank_names = rank_index.names
 
                 roles_to_remove = []
                 for role in member.roles:
@@ -305,10 +301,37 @@ class PromotionView(View):
                 )
 
 
+                role_passed = None
+                role_passed_academy_id = getattr(Config, "ROLE_PASSED_ACADEMY", 0) or 0
+                if not role_passed_academy_id:
+                    logger.debug("ROLE_PASSED_ACADEMY не задан в .env — роль «прошедший академию» не выдаётся")
+                if role_passed_academy_id:
+                    transition_str = rank_transition or self.new_rank or ""
+                    new_rank_canon = (parse_transition_to_new_rank(transition_str) or "").strip().lower()
+                    new_rank_norm = _norm_text(self.new_rank)
+
+                    is_sergeant = (
+                        new_rank_canon in ("сержант", "сержант полиции")
+                        or new_rank_norm in ("сержант", "сержант полиции")
+                    )
+                    if is_sergeant:
+                        if role_cache:
+                            role_passed = role_cache.get_role(interaction.guild.id, int(role_passed_academy_id))
+                        if role_passed is None:
+                            role_passed = interaction.guild.get_role(int(role_passed_academy_id))
+                        if role_passed and role_passed in member.roles:
+                            logger.info("Повышение до сержанта: роль «прошедший академию» уже есть user_id=%s", member.id)
+                            role_passed = None
+                        elif not role_passed:
+                            logger.warning("ROLE_PASSED_ACADEMY=%s не найден на сервере", role_passed_academy_id)
+                    else:
+                        logger.debug(
+                            "Повышение не до сержанта (роль прошедший академию не выдаём): new_rank=%r transition=%r canon=%r norm=%r",
+                            self.new_rank, rank_transition, new_rank_canon, new_rank_norm,
+                        )
+
                 try:
-                    if roles_to_remove:
-                        await apply_role_changes(member, remove=roles_to_remove)
-                    await apply_role_changes(member, add=[new_role])
+                    await MemberMutation(member).remove(*roles_to_remove).add(new_role).apply()
                 except discord.Forbidden:
                     await interaction.followup.send("❌ У бота нет прав изменить роли пользователя.", ephemeral=True)
                     return
@@ -317,9 +340,17 @@ class PromotionView(View):
                     await interaction.followup.send("❌ Ошибка Discord API при изменении ролей.", ephemeral=True)
                     return
 
+                # роль «прошедший академию» — отдельно от ранга: если бот не может её выдать
+                # (роль выше роли бота), повышение всё равно доводится до конца
+                if role_passed:
+                    try:
+                        await MemberMutation(member).add(role_passed).apply()
+                        logger.info("Повышение до сержанта: выдана роль «прошедший академию» user_id=%s", member.id)
+                    except (discord.Forbidden, discord.HTTPException) as e:
+                        logger.warning("Не удалось выдать ROLE_PASSED_ACADEMY user=%s: %s", member.id, e)
 
                 try:
-                    member = await interaction.guild.fetch_member(self.user_id)
+                    member = await wait_for_roles(interaction.guild, self.user_id, present=[new_role], absent=roles_to_remove) or member
                 except Exception:
                     pass
 
@@ -340,43 +371,6 @@ class PromotionView(View):
                     logger.warning("Promotion audit: ошибка user=%s: %s", member.id, e, exc_info=True)
 
 
-                role_passed_academy_id = getattr(Config, "ROLE_PASSED_ACADEMY", 0) or 0
-                if not role_passed_academy_id:
-                    logger.debug("ROLE_PASSED_ACADEMY не задан в .env — роль «прошедший академию» не выдаётся")
-                if role_passed_academy_id:
-                    rank_transition = (request_data or {}).get("rank_transition") or ""
-
-                    transition_str = rank_transition or self.new_rank or ""
-                    new_rank_canon = (parse_transition_to_new_rank(transition_str) or "").strip().lower()
-                    new_rank_norm = _norm_text(self.new_rank)
-
-                    is_sergeant = (
-                        new_rank_canon in ("сержант", "сержант полиции")
-                        or new_rank_norm in ("сержант", "сержант полиции")
-                    )
-                    if is_sergeant:
-                        role_passed = None
-                        role_cache = getattr(state, "role_cache", None)
-                        if role_cache:
-                            role_passed = await role_cache.get_role(interaction.guild.id, int(role_passed_academy_id))
-                        if role_passed is None:
-                            role_passed = interaction.guild.get_role(int(role_passed_academy_id))
-                        if role_passed and role_passed not in member.roles:
-                            try:
-                                await apply_role_changes(member, add=[role_passed])
-                                logger.info("Повышение до сержанта: выдана роль «прошедший академию» user_id=%s", member.id)
-                            except (discord.Forbidden, discord.HTTPException) as e:
-                                logger.warning("Не удалось выдать ROLE_PASSED_ACADEMY user=%s: %s", member.id, e)
-                        elif role_passed and role_passed in member.roles:
-                            logger.info("Повышение до сержанта: роль «прошедший академию» уже есть user_id=%s", member.id)
-                        elif not role_passed:
-                            logger.warning("ROLE_PASSED_ACADEMY=%s не найден на сервере", role_passed_academy_id)
-                    else:
-                        logger.debug(
-                            "Повышение не до сержанта (роль прошедший академию не выдаём): new_rank=%r transition=%r canon=%r norm=%r",
-                            self.new_rank, rank_transition, new_rank_canon, new_rank_norm,
-                        )
-
 
                 dm_warning = None
                 try:
@@ -7,7 +7,7 @@ from config import Config
 from enums import RequestType
 from state import active_requests, bot
 import state
-from utils.rate_limiter import apply_role_changes
+from utils.rate_limiter import MemberMutation
 from utils.embed_utils import update_embed_status, add_officer_field, copy_embed
 from services.audit import send_to_audit
 from services.action_locks import action_lock
@@ -60,7 +60,7 @@ class RequestView(View):
                 await interaction.response.send_message("❌ заявка уже обработана и не может быть отредактирована!", ephemeral=True)
                 return
 
-        request_data = active_requests.get(interaction.message.id, {})
+        request_data = await active_requests.hydrate(interaction.message.id) or {}
         modal = EditRequestModal(
             user_id=self.user_id,
             request_type=self.request_type,
@@ -87,17 +87,16 @@ class RequestView(View):
                 except Exception:
                     role_cache = None
                 if role_cache is not None:
-                    roles = [r for r in await role_cache.get_many_roles(interaction.guild.id, roles_to_give) if r]
+                    roles = [r for r in role_cache.get_many_roles(interaction.guild.id, roles_to_give) if r]
                 else:
                     roles = [interaction.guild.get_role(rid) for rid in roles_to_give if interaction.guild.get_role(rid)]
-                await apply_role_changes(member, add=roles)
-
+                mutation = MemberMutation(member).add(*roles)
                 try:
                     prefix = self.request_type.get_nickname_prefix()
-                    new_nick = f"{prefix} {self.validated_data['name']} {self.validated_data['surname']}"
-                    await member.edit(nick=new_nick)
+                    mutation.set_nick(f"{prefix} {self.validated_data['name']} {self.validated_data['surname']}")
                 except Exception as e:
                     logger.error(f"ошибка при смене ника: {e}")
+                await mutation.apply()
 
                 message_link = f"https://discord.com/channels/{interaction.guild.id}/{interaction.channel.id}/{interaction.message.id}"
 
@@ -10,6 +10,7 @@ from views.warehouse_embeds import build_cart_embed
 from services.warehouse_session import WarehouseSession
 from services import warehouse_cooldown
 from services.warehouse_audit import WarehouseAudit
+from services.member_resolver import resolve_member
 from views.warehouse_selectors import CategorySelect, _embed_add_step1
 from modals.warehouse_edit import WarehouseEditModal
 
@@ -441,12 +442,10 @@ class WarehouseActionView(View):
 
         requester_member = None
         if interaction.guild:
-            requester_member = interaction.guild.get_member(requester_id)
-            if requester_member is None:
-                try:
-                    requester_member = await interaction.guild.fetch_member(requester_id)
-                except Exception:
-                    requester_member = None
+            try:
+                requester_member = await resolve_member(interaction.guild, requester_id)
+            except discord.HTTPException:
+                requester_member = None
 
         author_name = requester_member.display_name if requester_member else f"ID {requester_id}"
         author_avatar = requester_member.avatar.url if (requester_member and requester_member.avatar) else None
@@ -533,7 +532,7 @@ class WarehouseActionView(View):
             except Exception:
                 role_cache = None
             if role_cache is not None:
-                staff_role = await role_cache.get_role(interaction.guild.id, Config.WAREHOUSE_STAFF_ROLE_ID)
+                staff_role = role_cache.get_role(interaction.guild.id, Config.WAREHOUSE_STAFF_ROLE_ID)
             else:
                 staff_role = interaction.guild.get_role(Config.WAREHOUSE_STAFF_ROLE_ID)
         is_staff = bool(staff_role and staff_role in (interaction.user.roles or []))
@@ -653,7 +652,8 @@ class WarehouseActionView(View):
             return
 
         from views.warehouse_request_buttons import WarehouseRequestView
-        view = WarehouseRequestView(requester_id, 0)
+        from views.component_router import render_only
+        view = render_only(WarehouseRequestView(requester_id, 0))
 
         staff_role_mention = f"<@&{Config.WAREHOUSE_STAFF_ROLE_ID}>"
         if editor_id != requester_id:
@@ -672,6 +672,7 @@ class WarehouseActionView(View):
             'user_id': requester_id,
             'items': [dict(item) for item in items],
             'message_id': sent_message.id,
+            'channel_id': sent_message.channel.id,
             'created_at': datetime.now().isoformat(),
         }
         if self.editing_request_message_id:
@@ -680,9 +681,6 @@ class WarehouseActionView(View):
 
         await save_warehouse_request(sent_message.id, request_data)
 
-        view.message_id = sent_message.id
-        await sent_message.edit(view=view)
-
         if self.editing_request_message_id:
             old_message_id = self.editing_request_message_id
             try: